@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Chunking benchmark - sentence splitter vs. code-aware splitter
+Compares chunk counts, chunk sizes, embedding time and retrieval quality on the
+Axiom codebase. Queries are generated from declared symbols (screens, widgets,
+providers, routes, models, ...); a query is a hit when a chunk of the file that
+declares the symbol is among the top-k results.
+
+Usage: python benchmark-chunking.py [--queries 100] [--top-k 5]
+"""
+
+import argparse
+import re
+import sys
+import os
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+# Import the agent packages from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llama_index.core import VectorStoreIndex, Document
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+from agent.config import settings
+from agent.memory.code_splitter import CodeSplitter, TOP_LEVEL_PATTERNS
+from agent.memory.manifest import scan_files
+
+QUERY_SYMBOL_TYPES = {"screen", "widget", "provider", "route", "schema", "model", "class", "function"}
+
+def read_documents() -> List[Document]:
+    files = scan_files(
+        settings.get_project_paths(),
+        extensions=set(TOP_LEVEL_PATTERNS),
+        ignored_dirs=settings.IGNORED_PATTERNS,
+        ignored_files=settings.IGNORED_FILE_PATTERNS,
+        excluded_paths=[settings.AGENT_DATA_DIR]
+    )
+    return [
+        Document(
+            id_=str(path),
+            text=path.read_text(encoding="utf-8", errors="ignore"),
+            metadata={"project": project, "file_path": str(path), "file_name": path.name, "file_type": path.suffix}
+        )
+        for project, path in files
+    ]
+
+def symbol_to_query(symbol: str, symbol_type: str) -> str:
+    """Turn 'ApiProvider' / 'POST /generate-api' / 'load_codebase' into plain words"""
+    words = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", symbol)
+    words = re.sub(r"[^A-Za-z0-9]+", " ", words).strip().lower()
+    return f"{words} {symbol_type.replace('_', ' ')}"
+
+def build_queries(nodes, limit: int) -> List[Tuple[str, str]]:
+    queries = {}
+    for node in nodes:
+        if node.metadata.get("symbol_type") not in QUERY_SYMBOL_TYPES:
+            continue
+        for symbol in node.metadata["symbols"].split(", "):
+            if "." in symbol or symbol == "<module>":
+                continue
+            query = symbol_to_query(symbol, node.metadata["symbol_type"])
+            queries.setdefault(query, node.metadata["file_path"])
+
+    queries = sorted(queries.items())
+    step = max(1, len(queries) // limit) if limit else 1
+    return queries[::step][:limit]
+
+def evaluate(name: str, parser, documents: List[Document], embed_model, queries, top_k: int) -> Dict[str, Any]:
+    started = time.perf_counter()
+    nodes = parser.get_nodes_from_documents(documents)
+    chunk_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    index = VectorStoreIndex(nodes=nodes, embed_model=embed_model)
+    embed_seconds = time.perf_counter() - started
+
+    retriever = index.as_retriever(similarity_top_k=top_k)
+    hits, reciprocal_ranks, context_chars = 0, 0.0, 0
+    for query, expected_path in queries:
+        results = retriever.retrieve(query)
+        context_chars += sum(len(result.node.get_content()) for result in results)
+        paths = [result.node.metadata.get("file_path") for result in results]
+        if expected_path in paths:
+            hits += 1
+            reciprocal_ranks += 1.0 / (paths.index(expected_path) + 1)
+
+    sizes = [len(node.get_content()) for node in nodes]
+    return {
+        "splitter": name,
+        "chunks": len(nodes),
+        "avg_chars": round(sum(sizes) / len(sizes)) if sizes else 0,
+        "max_chars": max(sizes) if sizes else 0,
+        "chunk_s": round(chunk_seconds, 2),
+        "embed_s": round(embed_seconds, 2),
+        f"hit@{top_k}": round(hits / len(queries), 3) if queries else 0.0,
+        "mrr": round(reciprocal_ranks / len(queries), 3) if queries else 0.0,
+        "prompt_chars": round(context_chars / len(queries)) if queries else 0
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=100, help="number of symbol queries to evaluate")
+    parser.add_argument("--top-k", type=int, default=5, help="retrieved chunks per query")
+    args = parser.parse_args()
+
+    documents = read_documents()
+    print(f"📖 {len(documents)} source files (.dart, .js, .py)")
+
+    sentence_splitter = SentenceSplitter(chunk_size=settings.CHUNK_SIZE, chunk_overlap=settings.CHUNK_OVERLAP)
+    code_splitter = CodeSplitter(
+        max_chars=settings.CODE_CHUNK_MAX_CHARS,
+        min_chars=settings.CODE_CHUNK_MIN_CHARS,
+        fallback=sentence_splitter
+    )
+
+    # Queries come from the code splitter's symbols but are scored by file, so both splitters compete fairly
+    queries = build_queries(code_splitter.get_nodes_from_documents(documents), args.queries)
+    print(f"🔎 {len(queries)} symbol queries, top {args.top_k}")
+
+    embed_model = HuggingFaceEmbedding(model_name=settings.EMBEDDING_MODEL)
+    rows = [
+        evaluate("sentence", sentence_splitter, documents, embed_model, queries, args.top_k),
+        evaluate("code", code_splitter, documents, embed_model, queries, args.top_k)
+    ]
+
+    columns = list(rows[0])
+    print()
+    print("  ".join(f"{column:>12}" for column in columns))
+    for row in rows:
+        print("  ".join(f"{str(row[column]):>12}" for column in columns))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Embedding benchmark - full precision vs. int8 quantized backend
+Embeds a sample of codebase chunks and queries with both backends and reports
+indexing throughput, query latency, vector agreement (cosine between the two
+embeddings of the same chunk) and retrieval agreement (overlap of top-k chunks).
+
+Usage: python benchmark-embedding.py [--chunks 500] [--queries 50] [--top-k 5]
+                                     [--batch-size 32] [--threads N]
+"""
+
+import argparse
+import statistics
+import sys
+import os
+import time
+from typing import Dict, Any, List
+
+import numpy as np
+
+# Import the agent packages from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llama_index.core import Document
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.schema import MetadataMode
+from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+from agent.config import settings
+from agent.memory.code_splitter import CodeSplitter
+from agent.memory.manifest import scan_files
+from agent.memory.quantized_embedding import QuantizedEmbedding
+
+def sample_chunks(limit: int) -> List[str]:
+    files = scan_files(
+        settings.get_project_paths(),
+        extensions=settings.INDEXED_EXTENSIONS,
+        ignored_dirs=settings.IGNORED_PATTERNS,
+        ignored_files=settings.IGNORED_FILE_PATTERNS,
+        excluded_paths=[settings.AGENT_DATA_DIR]
+    )
+    documents = [
+        Document(
+            text=path.read_text(encoding="utf-8", errors="ignore"),
+            metadata={"project": project, "file_path": str(path), "file_name": path.name, "file_type": path.suffix}
+        )
+        for project, path in files
+    ]
+    splitter = CodeSplitter(
+        max_chars=settings.CODE_CHUNK_MAX_CHARS,
+        min_chars=settings.CODE_CHUNK_MIN_CHARS,
+        fallback=SentenceSplitter(chunk_size=settings.CHUNK_SIZE, chunk_overlap=settings.CHUNK_OVERLAP)
+    )
+    nodes = splitter.get_nodes_from_documents(documents)
+    step = max(1, len(nodes) // limit)
+    return [node.get_content(metadata_mode=MetadataMode.EMBED) for node in nodes[::step][:limit]]
+
+def sample_queries(chunks: List[str], limit: int) -> List[str]:
+    # The first non-empty code line of a chunk is a realistic short query
+    queries = []
+    for chunk in chunks:
+        lines = [line.strip() for line in chunk.splitlines() if line.strip() and ":" not in line[:20]]
+        if lines:
+            queries.append(lines[0][:80])
+    step = max(1, len(queries) // limit)
+    return queries[::step][:limit]
+
+def measure(embed_model, chunks: List[str], queries: List[str]) -> Dict[str, Any]:
+    embed_model.get_query_embedding("warm up")
+
+    started = time.perf_counter()
+    chunk_vectors = np.asarray(embed_model.get_text_embedding_batch(chunks), dtype=np.float32)
+    index_seconds = time.perf_counter() - started
+
+    latencies, query_vectors = [], []
+    for query in queries:
+        started = time.perf_counter()
+        query_vectors.append(embed_model.get_query_embedding(query))
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "chunk_vectors": chunk_vectors,
+        "query_vectors": np.asarray(query_vectors, dtype=np.float32),
+        "chunks_per_second": round(len(chunks) / index_seconds, 1) if index_seconds else 0.0,
+        "query_p50_ms": round(statistics.median(latencies), 2) if latencies else 0.0,
+        "query_p95_ms": round(sorted(latencies)[int(0.95 * (len(latencies) - 1))], 2) if latencies else 0.0
+    }
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=500, help="number of codebase chunks to embed")
+    parser.add_argument("--queries", type=int, default=50, help="number of queries to time")
+    parser.add_argument("--top-k", type=int, default=5, help="retrieved chunks compared per query")
+    parser.add_argument("--batch-size", type=int, default=settings.EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--threads", type=int, default=settings.EMBEDDING_THREADS)
+    args = parser.parse_args()
+
+    chunks = sample_chunks(args.chunks)
+    queries = sample_queries(chunks, args.queries)
+    print(f"📖 {len(chunks)} chunks, {len(queries)} queries, batch size {args.batch_size}, {args.threads} threads")
+
+    backends = {
+        "fp32": HuggingFaceEmbedding(model_name=settings.EMBEDDING_MODEL, embed_batch_size=args.batch_size),
+        "int8": QuantizedEmbedding(
+            model_name=settings.EMBEDDING_MODEL,
+            embed_batch_size=args.batch_size,
+            num_threads=args.threads
+        )
+    }
+    results = {name: measure(model, chunks, queries) for name, model in backends.items()}
+
+    columns = ["chunks_per_second", "query_p50_ms", "query_p95_ms"]
+    print()
+    print(f"{'backend':>10}  " + "  ".join(f"{column:>18}" for column in columns))
+    for name, result in results.items():
+        print(f"{name:>10}  " + "  ".join(f"{str(result[column]):>18}" for column in columns))
+
+    # Accuracy of int8 relative to full precision
+    reference, quantized = results["fp32"], results["int8"]
+    cosine = np.sum(normalize(reference["chunk_vectors"]) * normalize(quantized["chunk_vectors"]), axis=1)
+
+    overlaps = []
+    for reference_query, quantized_query in zip(reference["query_vectors"], quantized["query_vectors"]):
+        expected = set(np.argsort(-(reference["chunk_vectors"] @ reference_query))[:args.top_k])
+        actual = set(np.argsort(-(quantized["chunk_vectors"] @ quantized_query))[:args.top_k])
+        overlaps.append(len(expected & actual) / args.top_k)
+
+    speedup = quantized["chunks_per_second"] / reference["chunks_per_second"] if reference["chunks_per_second"] else 0.0
+    print()
+    print(f"🎯 cosine(fp32, int8): mean {cosine.mean():.4f}, min {cosine.min():.4f}")
+    print(f"🎯 top-{args.top_k} overlap: {statistics.mean(overlaps) if overlaps else 0.0:.3f}")
+    print(f"⚡ int8 indexing speedup: {speedup:.2f}x")
+
+if __name__ == "__main__":
+    main()
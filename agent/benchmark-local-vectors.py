@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Local vector store benchmark - exact vs. inverted-list search in LocalVectorMemory
+Fills temporary collections of increasing size with clustered synthetic vectors
+and reports query latency and recall against brute-force search, with and
+without the approximate index, for several nprobe values.
+
+Usage: python benchmark-local-vectors.py [--sizes 2000,20000,100000] [--queries 100]
+                                         [--top-k 10] [--nprobe 4,16,64] [--mmap]
+"""
+
+import argparse
+import statistics
+import sys
+import os
+import tempfile
+import time
+from typing import Dict, Any, List
+
+import numpy as np
+
+# Import the agent packages from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.memory.local_vector_store import LocalVectorMemory
+
+def synthetic_vectors(points: int, dim: int, clusters: int = 256) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(clusters, dim))
+    vectors = centers[rng.integers(0, clusters, points)] + rng.normal(scale=0.6, size=(points, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+def measure(memory: LocalVectorMemory, queries: np.ndarray, exact: List[set], top_k: int,
+            nprobe: int = None) -> Dict[str, Any]:
+    recalls, latencies = [], []
+    for query, expected in zip(queries, exact):
+        started = time.perf_counter()
+        result = memory.search(query.tolist(), limit=top_k, score_threshold=-1.0, ef=nprobe)
+        latencies.append((time.perf_counter() - started) * 1000)
+        found = {int(hit["payload"]["text"]) for hit in result["results"]}
+        recalls.append(len(found & expected) / top_k)
+
+    return {
+        f"recall@{top_k}": round(statistics.mean(recalls), 4),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(sorted(latencies)[int(0.95 * (len(latencies) - 1))], 3)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="2000,20000,100000", help="comma-separated collection sizes")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--nprobe", default="4,16,64", help="comma-separated inverted lists probed per query")
+    parser.add_argument("--mmap", action="store_true", help="memory-map the vector matrix")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        for size in [int(size) for size in args.sizes.split(",")]:
+            vectors = synthetic_vectors(size, args.dim)
+            rng = np.random.default_rng(1)
+            queries = vectors[rng.integers(0, size, args.queries)] + rng.normal(scale=0.05, size=(args.queries, args.dim))
+            exact = [set(np.argsort(-(vectors @ query))[:args.top_k].tolist()) for query in queries]
+
+            # An unreachable threshold keeps the collection on exact search
+            memory = LocalVectorMemory(data_dir, f"bench_{size}", args.dim, mmap=args.mmap, approximate_threshold=size + 1)
+            memory.setup()
+            memory.add_embeddings([{"text": str(i), "embedding": vector} for i, vector in enumerate(vectors)])
+            rows.append({"points": size, "search": "exact", "nprobe": "-", **measure(memory, queries, exact, args.top_k)})
+
+            memory.approximate_threshold = 0
+            memory._update_approximate_index()
+            for nprobe in [int(nprobe) for nprobe in args.nprobe.split(",")]:
+                rows.append({
+                    "points": size,
+                    "search": f"ivf/{len(memory._centroids)}",
+                    "nprobe": nprobe,
+                    **measure(memory, queries, exact, args.top_k, nprobe)
+                })
+            memory.delete_collection()
+
+    columns = list(rows[0])
+    print()
+    print("  ".join(f"{column:>12}" for column in columns))
+    for row in rows:
+        print("  ".join(f"{str(row[column]):>12}" for column in columns))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Qdrant profile benchmark - recall, latency and RAM of the collection profiles
+Copies vectors from the codebase collection (topped up with synthetic vectors)
+into a temporary collection per profile, then compares approximate search
+against exact search for several per-query ef values, and sequential searches
+against one search_batch. Temporary collections are deleted afterwards.
+
+Usage: python benchmark-qdrant.py [--points 20000] [--queries 100] [--top-k 10]
+                                  [--ef 32,64,128,256]
+"""
+
+import argparse
+import statistics
+import sys
+import os
+import time
+from typing import Dict, Any, List
+
+import numpy as np
+
+# Import the agent packages from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qdrant_client.models import SearchParams
+from agent.config import settings
+from agent.memory.qdrant_client import QdrantMemory
+
+def load_vectors(points: int, dim: int) -> np.ndarray:
+    """Real vectors from the codebase collection, padded with noise around them"""
+    source = QdrantMemory(url=settings.QDRANT_URL, collection_name=settings.QDRANT_COLLECTION_NAME)
+    vectors = []
+    try:
+        for item in source.scroll(page_size=512, with_vectors=True):
+            vector = item["vector"]
+            if isinstance(vector, dict):
+                vector = next(iter(vector.values()))
+            vectors.append(vector)
+            if len(vectors) >= points:
+                break
+    except Exception as e:
+        print(f"⚠️  Could not read {settings.QDRANT_COLLECTION_NAME}, using synthetic vectors: {e}")
+
+    rng = np.random.default_rng(0)
+    real = np.asarray(vectors, dtype=np.float32).reshape(-1, dim)
+    missing = points - len(real)
+    if missing > 0:
+        centers = real if len(real) else rng.normal(size=(64, dim)).astype(np.float32)
+        synthetic = centers[rng.integers(0, len(centers), missing)] + rng.normal(scale=0.3, size=(missing, dim))
+        real = np.vstack([real, synthetic.astype(np.float32)])
+    return real / np.linalg.norm(real, axis=1, keepdims=True)
+
+def wait_until_indexed(memory: QdrantMemory, timeout: float = 600.0):
+    started = time.time()
+    while time.time() - started < timeout:
+        info = memory.client.get_collection(memory.collection_name)
+        if info.status == "green" and (info.indexed_vectors_count or 0) >= (info.points_count or 0):
+            return
+        time.sleep(1)
+    print(f"⚠️  {memory.collection_name} still optimizing after {timeout:.0f}s; results may use a partial index")
+
+def run_profile(name: str, profile: Dict[str, Any], vectors: np.ndarray, queries: np.ndarray,
+                top_k: int, ef_values: List[int]) -> List[Dict[str, Any]]:
+    memory = QdrantMemory(
+        url=settings.QDRANT_URL,
+        collection_name=f"{settings.QDRANT_COLLECTION_NAME}_bench_{name}",
+        vector_size=vectors.shape[1],
+        batch_size=settings.QDRANT_UPSERT_BATCH_SIZE,
+        parallel=settings.QDRANT_UPSERT_PARALLEL,
+        profile=profile
+    )
+    memory.delete_collection()
+    memory.setup()
+
+    try:
+        memory.add_embeddings([
+            {"text": str(i), "embedding": vector.tolist(), "file_path": "benchmark"}
+            for i, vector in enumerate(vectors)
+        ])
+        wait_until_indexed(memory)
+
+        exact = [
+            {hit.id for hit in memory.client.query_points(
+                collection_name=memory.collection_name, query=query.tolist(), limit=top_k,
+                search_params=SearchParams(exact=True)
+            ).points}
+            for query in queries
+        ]
+
+        rows = []
+        ram = memory.get_collection_info().get("estimated_ram_bytes", 0)
+        for ef in ef_values:
+            recalls, latencies = [], []
+            for query, expected in zip(queries, exact):
+                started = time.perf_counter()
+                result = memory.search(query.tolist(), limit=top_k, score_threshold=-1.0, ef=ef)
+                latencies.append((time.perf_counter() - started) * 1000)
+                found = {hit["id"] for hit in result.get("results", [])}
+                recalls.append(len(found & expected) / top_k)
+
+            rows.append({
+                "profile": name,
+                "ef": ef,
+                f"recall@{top_k}": round(statistics.mean(recalls), 4),
+                "p50_ms": round(statistics.median(latencies), 2),
+                "p95_ms": round(sorted(latencies)[int(0.95 * (len(latencies) - 1))], 2),
+                "est_ram_mb": round(ram / (1024 * 1024), 1)
+            })
+        
+        # One round trip for every query, returning ids and scores only
+        started = time.perf_counter()
+        for query in queries:
+            memory.search(query.tolist(), limit=top_k, score_threshold=-1.0)
+        sequential = (time.perf_counter() - started) * 1000 / len(queries)
+        started = time.perf_counter()
+        memory.search_batch([query.tolist() for query in queries], limit=top_k, score_threshold=-1.0, with_payload=False)
+        batched = (time.perf_counter() - started) * 1000 / len(queries)
+        print(f"📦 {name}: {sequential:.2f} ms/query sequential with payloads, {batched:.2f} ms/query batched without")
+        return rows
+
+    finally:
+        memory.delete_collection()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=20000, help="vectors per collection (HNSW needs > 10k)")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--ef", default="32,64,128,256", help="comma-separated per-query ef values")
+    args = parser.parse_args()
+
+    vectors = load_vectors(args.points, args.dim)
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.integers(0, len(vectors), args.queries)] + rng.normal(scale=0.05, size=(args.queries, args.dim))
+    ef_values = [int(ef) for ef in args.ef.split(",")]
+    print(f"📦 {len(vectors)} vectors, {len(queries)} queries, profiles: {', '.join(settings.QDRANT_COLLECTION_PROFILES)}")
+
+    rows = []
+    for name, profile in settings.QDRANT_COLLECTION_PROFILES.items():
+        rows.extend(run_profile(name, profile, vectors, queries, args.top_k, ef_values))
+
+    columns = list(rows[0])
+    print()
+    print("  ".join(f"{column:>12}" for column in columns))
+    for row in rows:
+        print("  ".join(f"{str(row[column]):>12}" for column in columns))
+
+if __name__ == "__main__":
+    main()
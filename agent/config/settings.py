@@ -22,11 +22,138 @@ class Settings:
     # Memory configuration
     QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
     QDRANT_COLLECTION_NAME = "axiom_codebase"
+    # Vector store behind the codebase index: "qdrant" (shared across workers) or "local" (in-process, no server)
+    MEMORY_VECTOR_STORE = os.getenv("MEMORY_VECTOR_STORE", "qdrant")
+    QDRANT_UPSERT_BATCH_SIZE = int(os.getenv("QDRANT_UPSERT_BATCH_SIZE", 100))
+    QDRANT_UPSERT_PARALLEL = int(os.getenv("QDRANT_UPSERT_PARALLEL", 4))
+    # Collection layouts; "compact" keeps int8-quantized vectors in RAM and the originals on disk for rescoring
+    QDRANT_COLLECTION_PROFILE = os.getenv("QDRANT_COLLECTION_PROFILE", "default")
+    QDRANT_COLLECTION_PROFILES = {
+        "default": {
+            "on_disk": False,
+            "quantization": None,
+            "hnsw_m": 16,
+            "hnsw_ef_construct": 100,
+            "search_ef": None
+        },
+        "compact": {
+            "on_disk": True,
+            "quantization": "int8",
+            "always_ram": True,
+            "hnsw_m": 16,
+            "hnsw_ef_construct": 200,
+            "search_ef": 128,
+            "rescore": True,
+            "oversampling": 2.0
+        }
+    }
+    
+    # Local agent data (session checkpoints, caches)
+    AGENT_DATA_DIR = Path(os.getenv("AGENT_DATA_DIR", Path(__file__).parent.parent / "data"))
+    
+    # Embedded vector collections used instead of Qdrant when MEMORY_VECTOR_STORE is "local"
+    LOCAL_VECTOR_DIR = Path(os.getenv("LOCAL_VECTOR_DIR", AGENT_DATA_DIR / "vectors"))
+    LOCAL_VECTOR_MMAP = os.getenv("LOCAL_VECTOR_MMAP", "false").lower() == "true"
+    # Above this many points searches probe the closest inverted lists instead of scoring every vector
+    LOCAL_VECTOR_APPROXIMATE_THRESHOLD = int(os.getenv("LOCAL_VECTOR_APPROXIMATE_THRESHOLD", 20000))
+    LOCAL_VECTOR_NPROBE = int(os.getenv("LOCAL_VECTOR_NPROBE", 16))
+    
+    # Session checkpoint configuration
+    SESSION_DB_PATH = Path(os.getenv("SESSION_DB_PATH", AGENT_DATA_DIR / "sessions.db"))
+    SESSION_MAX_AGE_SECONDS = int(os.getenv("SESSION_MAX_AGE_SECONDS", 24 * 60 * 60))
+    SESSION_MAX_COUNT = int(os.getenv("SESSION_MAX_COUNT", 500))
+    SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", 50 * 1024 * 1024))
+    
+    # State size budget; larger tool payloads are kept in the artifact store
+    AGENT_STATE_MAX_BYTES = int(os.getenv("AGENT_STATE_MAX_BYTES", 256 * 1024))
+    ARTIFACT_INLINE_MAX_BYTES = int(os.getenv("ARTIFACT_INLINE_MAX_BYTES", 4096))
+    ARTIFACT_STORE_MAX_BYTES = int(os.getenv("ARTIFACT_STORE_MAX_BYTES", 64 * 1024 * 1024))
+    
+    # Tool execution
+    TOOL_MAX_WORKERS = int(os.getenv("TOOL_MAX_WORKERS", 4))
+    PROJECT_PREFETCH_ENABLED = os.getenv("PROJECT_PREFETCH_ENABLED", "true").lower() == "true"
+    PROJECT_PREFETCH_TIMEOUT = float(os.getenv("PROJECT_PREFETCH_TIMEOUT", 10))
+    PLAN_CACHE_MAX_ENTRIES = int(os.getenv("PLAN_CACHE_MAX_ENTRIES", 256))
+    
+    # Embedding and chunking configuration
+    EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+    EMBEDDING_CACHE_DIR = Path(os.getenv("EMBEDDING_CACHE_DIR", AGENT_DATA_DIR / "embeddings"))
+    # "huggingface" (full precision) or "int8" (dynamically quantized, CPU only)
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "huggingface")
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", 32))
+    EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", os.cpu_count() or 1))
+    CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", 1024))
+    CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", 20))
+    # .dart/.js/.py files are chunked on declaration boundaries instead
+    CODE_CHUNK_MAX_CHARS = int(os.getenv("CODE_CHUNK_MAX_CHARS", 3000))
+    CODE_CHUNK_MIN_CHARS = int(os.getenv("CODE_CHUNK_MIN_CHARS", 600))
+    INDEX_PERSIST_DIR = Path(os.getenv("INDEX_PERSIST_DIR", AGENT_DATA_DIR / "index"))
+    INDEX_MANIFEST_PATH = Path(os.getenv("INDEX_MANIFEST_PATH", AGENT_DATA_DIR / "index_manifest.json"))
+    
+    # Hybrid retrieval: BM25 over the same chunks, fused with dense hits by reciprocal rank
+    LEXICAL_INDEX_PATH = Path(os.getenv("LEXICAL_INDEX_PATH", AGENT_DATA_DIR / "lexical_index.json"))
+    HYBRID_RETRIEVAL_ENABLED = os.getenv("HYBRID_RETRIEVAL_ENABLED", "true").lower() == "true"
+    HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", 20))
+    HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", 60))
+    
+    # Structural symbol index (routes, models, services, providers, screens, widgets) answered without the LLM
+    SYMBOL_INDEX_PATH = Path(os.getenv("SYMBOL_INDEX_PATH", AGENT_DATA_DIR / "symbol_index.json"))
+    SYMBOL_INDEX_ENABLED = os.getenv("SYMBOL_INDEX_ENABLED", "true").lower() == "true"
+    
+    # Memory-mapped copy of the indexed file text, line offsets and summary counts (explain_code, project summary)
+    DOCUMENT_STORE_DIR = Path(os.getenv("DOCUMENT_STORE_DIR", AGENT_DATA_DIR / "documents"))
+    
+    # Retrieved chunks are reranked, deduplicated and trimmed into a token budget before query() calls the LLM
+    CONTEXT_PACKING_ENABLED = os.getenv("CONTEXT_PACKING_ENABLED", "true").lower() == "true"
+    CONTEXT_CANDIDATES = int(os.getenv("CONTEXT_CANDIDATES", 10))
+    CONTEXT_MAX_CHUNKS = int(os.getenv("CONTEXT_MAX_CHUNKS", 5))
+    CONTEXT_MAX_TOKENS = int(os.getenv("CONTEXT_MAX_TOKENS", 1500))
+    CONTEXT_SPAN_LINES = int(os.getenv("CONTEXT_SPAN_LINES", 6))
+    CONTEXT_DEDUP_THRESHOLD = float(os.getenv("CONTEXT_DEDUP_THRESHOLD", 0.8))
+    QUERY_METRICS_HISTORY = int(os.getenv("QUERY_METRICS_HISTORY", 200))
+    
+    # query() answers with the retrieved snippets, skipping the LLM, when the top similarity reaches this score
+    RETRIEVAL_ONLY_ENABLED = os.getenv("RETRIEVAL_ONLY_ENABLED", "true").lower() == "true"
+    RETRIEVAL_ONLY_SCORE_THRESHOLD = float(os.getenv("RETRIEVAL_ONLY_SCORE_THRESHOLD", 0.8))
+    RETRIEVAL_ONLY_MAX_SNIPPETS = int(os.getenv("RETRIEVAL_ONLY_MAX_SNIPPETS", 3))
+    
+    # explain_code sends the requested file or line range directly instead of retrieved chunks
+    EXPLAIN_MAX_FILES = int(os.getenv("EXPLAIN_MAX_FILES", 3))
+    EXPLAIN_CONTEXT_MAX_TOKENS = int(os.getenv("EXPLAIN_CONTEXT_MAX_TOKENS", 3000))
+    
+    # Streaming ingestion: parallel readers feed a bounded queue of chunked files to embedding workers
+    INGEST_READ_WORKERS = int(os.getenv("INGEST_READ_WORKERS", min(8, os.cpu_count() or 1)))
+    INGEST_EMBED_WORKERS = int(os.getenv("INGEST_EMBED_WORKERS", 2))
+    INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", 64))
+    INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", 16))
+    
+    # Ingestion policies: files and chunks kept out of the index (INGEST_DEDUP is minhash, hash or off)
+    INGEST_MAX_FILE_BYTES = int(os.getenv("INGEST_MAX_FILE_BYTES", 256 * 1024))
+    INGEST_SKIP_GENERATED = os.getenv("INGEST_SKIP_GENERATED", "true").lower() == "true"
+    INGEST_SKIP_MINIFIED = os.getenv("INGEST_SKIP_MINIFIED", "true").lower() == "true"
+    INGEST_MINIFIED_LINE_CHARS = int(os.getenv("INGEST_MINIFIED_LINE_CHARS", 500))
+    INGEST_RESPECT_GITIGNORE = os.getenv("INGEST_RESPECT_GITIGNORE", "true").lower() == "true"
+    INGEST_DEDUP = os.getenv("INGEST_DEDUP", "hash").lower()
+    INGEST_DEDUP_THRESHOLD = float(os.getenv("INGEST_DEDUP_THRESHOLD", 0.9))
+    INGEST_DEDUP_MIN_CHARS = int(os.getenv("INGEST_DEDUP_MIN_CHARS", 200))
+    DEDUP_INDEX_PATH = Path(os.getenv("DEDUP_INDEX_PATH", AGENT_DATA_DIR / "chunk_dedup.json"))
+    
+    # Live index updates while the agent runs
+    MEMORY_WATCH_ENABLED = os.getenv("MEMORY_WATCH_ENABLED", "false").lower() == "true"
+    MEMORY_WATCH_DEBOUNCE_SECONDS = float(os.getenv("MEMORY_WATCH_DEBOUNCE_SECONDS", 2.0))
+    MEMORY_WATCH_POLL_SECONDS = float(os.getenv("MEMORY_WATCH_POLL_SECONDS", 5.0))
     
     # LLM configuration
     LLM_MODEL = os.getenv("LLM_MODEL", "deepseek-coder")
     LLM_API_KEY = os.getenv("LLM_API_KEY", "")
     LLM_BASE_URL = os.getenv("LLM_BASE_URL", "")
+    LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", 120))
+    
+    # Ollama model residency: preload at startup, keep_alive hint on every request, release after idle (0 = never)
+    OLLAMA_WARMUP_ENABLED = os.getenv("OLLAMA_WARMUP_ENABLED", "true").lower() == "true"
+    OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    OLLAMA_IDLE_RELEASE_SECONDS = float(os.getenv("OLLAMA_IDLE_RELEASE_SECONDS", 900))
+    OLLAMA_IDLE_CHECK_SECONDS = float(os.getenv("OLLAMA_IDLE_CHECK_SECONDS", 30))
     
     # File processing
     SUPPORTED_CODE_EXTENSIONS = {
@@ -39,6 +166,15 @@ class Settings:
         "dist", "__pycache__", ".vscode", ".idea"
     }
     
+    # Files indexed into memory
+    INDEXED_EXTENSIONS = SUPPORTED_CODE_EXTENSIONS | {".json", ".yaml", ".yml", ".md"}
+    IGNORED_FILE_PATTERNS = {"*.lock", "*.log", "*.tmp"}
+    GENERATED_FILE_PATTERNS = {
+        "package-lock.json", "yarn.lock", "pubspec.lock", "*.min.js", "*.min.css", "*.bundle.js",
+        "*.g.dart", "*.freezed.dart", "*.gr.dart", "*.mocks.dart", "*.pb.dart", "*.pbenum.dart", "*.pbjson.dart",
+        "generated_plugin_registrant.*", "GeneratedPluginRegistrant.*"
+    }
+    
     @classmethod
     def get_project_paths(cls) -> Dict[str, Path]:
         return {
@@ -47,6 +183,10 @@ class Settings:
             "root": cls.ROOT_DIR
         }
     
+    @classmethod
+    def get_qdrant_profile(cls) -> Dict[str, Any]:
+        return cls.QDRANT_COLLECTION_PROFILES[cls.QDRANT_COLLECTION_PROFILE]
+    
     @classmethod
     def validate_paths(cls) -> bool:
         required_paths = [cls.AXIOM_BACKEND_DIR, cls.AXIOM_FLUTTER_DIR]
@@ -2,8 +2,12 @@ from typing import Dict, Any, List, Optional
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolExecutor
 from ..models import AgentState
-from ..tools import ProjectTools, ApiTools, WidgetTools
-from ..memory import LlamaIndexMemory, QdrantMemory
+from ..tools import ProjectTools, ApiTools, WidgetTools, ProjectPrefetcher
+from ..memory import LlamaIndexMemory, QdrantMemory, LocalVectorMemory, SessionStore, ArtifactStore
+from ..memory.artifact_store import payload_size
+from .planner import ToolPlanner, PlanExecutor
+from .plan_cache import PlanCache
+from ..config import settings
 import re
 
 class AxiomAgent:
@@ -13,8 +17,57 @@ class AxiomAgent:
         self.project_tools = ProjectTools()
         self.api_tools = ApiTools()
         self.widget_tools = WidgetTools()
-        self.memory = LlamaIndexMemory()
-        self.qdrant = QdrantMemory()
+        
+        # Project documents fetched speculatively at the start of a run
+        self.prefetcher = None
+        if settings.PROJECT_PREFETCH_ENABLED:
+            self.prefetcher = ProjectPrefetcher(timeout=settings.PROJECT_PREFETCH_TIMEOUT)
+            for tools in (self.project_tools, self.api_tools, self.widget_tools):
+                tools.prefetcher = self.prefetcher
+        
+        if settings.MEMORY_VECTOR_STORE == "local":
+            # Single-node and offline deployments run without a Qdrant server
+            self.qdrant = LocalVectorMemory(
+                data_dir=settings.LOCAL_VECTOR_DIR,
+                collection_name=settings.QDRANT_COLLECTION_NAME,
+                mmap=settings.LOCAL_VECTOR_MMAP,
+                approximate_threshold=settings.LOCAL_VECTOR_APPROXIMATE_THRESHOLD,
+                nprobe=settings.LOCAL_VECTOR_NPROBE
+            )
+        else:
+            self.qdrant = QdrantMemory(
+                url=settings.QDRANT_URL,
+                collection_name=settings.QDRANT_COLLECTION_NAME,
+                batch_size=settings.QDRANT_UPSERT_BATCH_SIZE,
+                parallel=settings.QDRANT_UPSERT_PARALLEL,
+                profile=settings.get_qdrant_profile()
+            )
+        self.memory = LlamaIndexMemory(qdrant=self.qdrant)
+        self.planner = ToolPlanner()
+        self.plan_cache = PlanCache(max_entries=settings.PLAN_CACHE_MAX_ENTRIES)
+        self.plan_executor = PlanExecutor(
+            tools={
+                "create_project": self.project_tools.create_project,
+                "add_screen": self.project_tools.add_screen,
+                "create_crud_api": self.api_tools.create_crud_api,
+                "add_widgets": self.widget_tools.add_widgets,
+                "create_form": self.widget_tools.create_form,
+                "bind_widget_to_api": self.widget_tools.bind_widget_to_api
+            },
+            max_workers=settings.TOOL_MAX_WORKERS
+        )
+        self.sessions = SessionStore(
+            db_path=settings.SESSION_DB_PATH,
+            max_age_seconds=settings.SESSION_MAX_AGE_SECONDS,
+            max_sessions=settings.SESSION_MAX_COUNT,
+            max_bytes=settings.SESSION_MAX_BYTES
+        )
+        self.artifacts = ArtifactStore(
+            max_inline_bytes=settings.ARTIFACT_INLINE_MAX_BYTES,
+            max_total_bytes=settings.ARTIFACT_STORE_MAX_BYTES
+        )
+        self.state_budget = settings.AGENT_STATE_MAX_BYTES
+        self.state_size_stats: Dict[str, Dict[str, Any]] = {}
         
         # Initialize components
         self.setup_components()
@@ -28,13 +81,17 @@ class AxiomAgent:
         
         # Setup memory systems
         memory_ready = self.memory.setup()
+        if memory_ready:
+            # The collection must match the embedding model the index writes with
+            self.qdrant.vector_size = self.memory.embed_dim
         qdrant_ready = self.qdrant.setup()
+        self.sessions.setup()
         
         if memory_ready:
             # Load codebase into memory
-            from ..config import settings
             paths = settings.get_project_paths()
-            self.memory.load_codebase(paths)
+            if self.memory.load_codebase(paths) and settings.MEMORY_WATCH_ENABLED:
+                self.memory.start_watcher()
         
         print("✅ Agent components ready")
     
@@ -43,16 +100,21 @@ class AxiomAgent:
         workflow = StateGraph(AgentState)
         
         # Add nodes
+        # Only the nodes that add memory results, project context or tool results are checked against the budget
         workflow.add_node("parse_intent", self.parse_intent)
-        workflow.add_node("search_memory", self.search_memory)
-        workflow.add_node("validate_operation", self.validate_operation)
-        workflow.add_node("execute_tools", self.execute_tools)
+        workflow.add_node("search_memory", self.bounded_node("search_memory", self.search_memory))
+        workflow.add_node("validate_operation", self.bounded_node("validate_operation", self.validate_operation))
+        workflow.add_node("execute_tools", self.bounded_node("execute_tools", self.execute_tools))
         workflow.add_node("verify_results", self.verify_results)
         workflow.add_node("respond_to_user", self.respond_to_user)
         
         # Add edges
         workflow.set_entry_point("parse_intent")
-        workflow.add_edge("parse_intent", "search_memory")
+        workflow.add_conditional_edges(
+            "parse_intent",
+            lambda state: state.next_step,
+            {"search_memory": "search_memory", "execute_tools": "execute_tools"}
+        )
         workflow.add_edge("search_memory", "validate_operation")
         workflow.add_edge("validate_operation", "execute_tools")
         workflow.add_edge("execute_tools", "verify_results")
@@ -61,8 +123,64 @@ class AxiomAgent:
         
         return workflow.compile()
     
+    def bounded_node(self, name: str, node):
+        """Wrap a graph node so the state it returns stays within the size budget"""
+        def run_node(state: AgentState) -> AgentState:
+            state = node(state)
+            size = self.enforce_state_budget(state)
+            
+            stats = self.state_size_stats.setdefault(name, {"calls": 0, "last_bytes": 0, "max_bytes": 0})
+            stats["calls"] += 1
+            stats["last_bytes"] = size
+            stats["max_bytes"] = max(stats["max_bytes"], size)
+            return state
+        
+        return run_node
+    
+    def enforce_state_budget(self, state: AgentState) -> int:
+        """Offload results and drop old memory results until the state fits the budget"""
+        size = len(state.model_dump_json())
+        if size <= self.state_budget:
+            return size
+        
+        # Past the one full serialisation, sizes are estimated from the fields that change
+        if state.run_id:
+            slimmed = [
+                self.artifacts.slim(state.run_id, result, max_inline_bytes=256)
+                for result in state.results
+            ]
+            size += payload_size(slimmed) - payload_size(state.results)
+            state.results = slimmed
+        
+        while size > self.state_budget and len(state.memory_results) > 1:
+            size -= payload_size(state.memory_results.pop(0))
+        
+        # A very large project is reloaded on demand instead of carried along
+        if size > self.state_budget and state.project_context is not None:
+            size -= payload_size(state.project_context)
+            state.project_context = None
+        
+        return size
+    
+    def get_state_size_stats(self) -> Dict[str, Any]:
+        """Get per-node state size metrics"""
+        return {
+            "success": True,
+            "budget_bytes": self.state_budget,
+            "nodes": self.state_size_stats,
+            "artifacts": self.artifacts.get_stats()
+        }
+    
+    def get_artifact(self, handle: str) -> Optional[Any]:
+        """Fetch a tool payload referenced from a run result"""
+        return self.artifacts.get(handle)
+    
     def parse_intent(self, state: AgentState) -> AgentState:
         """Parse user intent and extract operation type"""
+        # Requests matching an earlier successful plan go straight to execution
+        if self.apply_cached_plan(state):
+            return state
+        
         user_request = state.user_request.lower()
         
         # Define intent patterns
@@ -106,6 +224,20 @@ class AxiomAgent:
         
         return state
     
+    def apply_cached_plan(self, state: AgentState) -> bool:
+        """Take the operation from the plan cache; returns True on a hit"""
+        cached = self.plan_cache.lookup(state.user_request, has_project=bool(state.project_id))
+        if not cached:
+            return False
+        
+        # Entities come from this request, never from the one the plan was recorded for
+        state.operation_type = cached["operation_type"]
+        state.context.update(self.extract_entities(state.user_request))
+        state.context["plan_cache"] = "hit"
+        state.learned_patterns.append(cached["template"])
+        state.next_step = "execute_tools"
+        return True
+    
     def extract_entities(self, user_request: str) -> Dict[str, Any]:
         """Extract entities from user request"""
         entities = {}
@@ -163,7 +295,15 @@ class AxiomAgent:
             # Search for relevant codebase information
             query = f"How to {state.operation_type} in Axiom platform"
             
-            memory_result = self.memory.query(query)
+            # Structural questions are answered from the symbol index without retrieval or the LLM
+            structure = self.memory.query_structure(state.user_request)
+            if structure:
+                state.memory_results.append(structure)
+                state.next_step = "validate_operation"
+                return state
+            
+            # The results only ground later steps, so the retrieved snippets are enough
+            memory_result = self.memory.query(query, generate=False)
             state.memory_results.append(memory_result)
             
         except Exception as e:
@@ -194,6 +334,14 @@ class AxiomAgent:
             if state.context.get("project_id"):
                 state.project_id = state.context["project_id"]
             
+            # Load the project once per turn; the prefetcher has usually fetched it already
+            if state.project_id and (
+                state.project_context is None or state.project_context.project_id != state.project_id
+            ):
+                load_result = self.project_tools.load_project(state.project_id)
+                if load_result.get("success"):
+                    state.project_context = load_result["project_context"]
+            
         except Exception as e:
             state.errors.append(f"Validation failed: {str(e)}")
         
@@ -201,47 +349,35 @@ class AxiomAgent:
         return state
     
     def execute_tools(self, state: AgentState) -> AgentState:
-        """Execute appropriate tools based on operation"""
+        """Plan the tool calls for the operation and execute them"""
         try:
             if state.errors:
                 state.next_step = "respond_to_user"
                 return state
             
-            result = None
-            
-            if state.operation_type == "create_project":
-                result = self.project_tools.create_project(
-                    name=state.context.get("project_name", "New Project"),
-                    description=state.context.get("description", "")
-                )
-                state.tools_used.append("create_project")
-            
-            elif state.operation_type == "create_api":
-                if state.context.get("entity_name"):
-                    result = self.api_tools.create_crud_api(
-                        project_id=state.project_id,
-                        entity_name=state.context["entity_name"],
-                        fields=state.context.get("fields", [])
-                    )
-                    state.tools_used.append("create_crud_api")
+            if state.current_screen:
+                state.context.setdefault("screen_id", state.current_screen)
             
-            elif state.operation_type == "add_widget":
-                widget_types = state.context.get("widget_types", [])
-                for widget_type in widget_types:
-                    result = self.widget_tools.add_widget(
-                        project_id=state.project_id,
-                        screen_id=state.context.get("screen_id", "screen_1"),
-                        widget_type=widget_type
-                    )
-                    state.tools_used.append(f"add_{widget_type}")
+            steps = self.planner.plan(state.operation_type, state.context, state.project_id)
+            state.context["plan"] = [
+                {"id": step.id, "tool": step.tool, "depends_on": step.depends_on}
+                for step in steps
+            ]
             
-            if result:
-                state.results.append(result)
+            for step, result in zip(steps, self.plan_executor.execute(steps)):
+                state.tools_used.append(step.tool)
+                state.results.append(self.artifacts.slim(state.run_id, result))
+                
                 if result.get("success"):
+                    # The project changed, so the cached context is stale
+                    state.project_context = None
+                    
                     # Update context with result data
                     if "project_id" in result:
                         state.project_id = result["project_id"]
                         state.context["project_id"] = result["project_id"]
+                    if "screen_id" in result:
+                        state.current_screen = result["screen_id"]
         
         except Exception as e:
             state.errors.append(f"Tool execution failed: {str(e)}")
@@ -273,24 +409,44 @@ class AxiomAgent:
         state.next_step = None
         return state
     
-    def run(self, user_request: str, project_id: str = None) -> Dict[str, Any]:
+    def run(self, user_request: str, project_id: str = None,
+            conversation_id: str = None) -> Dict[str, Any]:
         """Run the agent with a user request"""
-        initial_state = AgentState(
-            user_request=user_request,
-            project_id=project_id
-        )
+        initial_state = self.sessions.resume(user_request, project_id, conversation_id)
+        initial_state.run_id = self.artifacts.new_run()
+        # Overlap the project fetch with intent parsing and memory search
+        if self.prefetcher:
+            self.prefetcher.start(initial_state.project_id, initial_state.run_id)
         
         try:
             # Run the graph
             final_state = self.graph.invoke(initial_state)
             
+            if final_state.completed and final_state.results and final_state.context.get("plan_cache") != "hit":
+                template = self.plan_cache.record(
+                    user_request,
+                    final_state.operation_type,
+                    self.extract_entities(user_request),
+                    requires_project="create_project" not in final_state.tools_used
+                )
+                if template:
+                    final_state.learned_patterns.append(template)
+            
+            if conversation_id:
+                # Artifacts live in this process only, so the checkpoint carries the payloads themselves
+                self.sessions.save(final_state.model_copy(update={
+                    "results": [self.artifacts.resolve(result) for result in final_state.results]
+                }))
+            
             return {
                 "success": final_state.completed,
                 "results": final_state.results,
                 "errors": final_state.errors,
                 "tools_used": final_state.tools_used,
                 "context": final_state.context,
-                "project_id": final_state.project_id
+                "project_id": final_state.project_id,
+                "conversation_id": conversation_id,
+                "run_id": final_state.run_id
             }
             
         except Exception as e:
@@ -300,3 +456,18 @@ class AxiomAgent:
                 "results": [],
                 "errors": [str(e)]
             }
+        
+        finally:
+            # Prefetched copies are only trusted within a single run
+            if self.prefetcher:
+                self.prefetcher.discard(initial_state.run_id)
+    
+    def get_plan_cache_stats(self) -> Dict[str, Any]:
+        """Get plan cache hit rate and evictions"""
+        return self.plan_cache.get_stats()
+    
+    def get_prefetch_stats(self) -> Dict[str, Any]:
+        """Get project prefetch hit rate and wasted prefetch count"""
+        if not self.prefetcher:
+            return {"success": False, "error": "Project prefetch is disabled"}
+        return self.prefetcher.get_stats()
@@ -0,0 +1,130 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+FIELDS_PATTERN = re.compile(r'fields?[:\s]+([^.]*)', re.IGNORECASE)
+
+def normalize_request(user_request: str) -> str:
+    """Collapse whitespace and trailing punctuation so equivalent requests share a key"""
+    return re.sub(r"\s+", " ", user_request).strip().rstrip(".!?").strip()
+
+class PlanCache:
+    """LRU cache from normalized requests with entity slots to previously successful plans
+
+    A hit only supplies the operation type; entities are always parsed from the
+    incoming request, so a hit behaves exactly like a fresh parse.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "stored": 0}
+
+    def _template(self, text: str, entities: Dict[str, Any]) -> Optional[Tuple[str, str, Dict[str, str]]]:
+        """Replace entity values in the request with named slots"""
+        spans = []
+        lowered = text.lower()
+
+        for name, value in entities.items():
+            if isinstance(value, str) and normalize_request(value):
+                value = normalize_request(value)
+                start = lowered.find(value.lower())
+                if start >= 0:
+                    spans.append((start, start + len(value), name, "text"))
+
+        if entities.get("fields"):
+            match = FIELDS_PATTERN.search(text)
+            if match and match.group(1).strip():
+                spans.append((match.start(1), match.end(1), "fields", "fields"))
+
+        spans.sort()
+        for previous, current in zip(spans, spans[1:]):
+            if current[0] < previous[1]:
+                # Overlapping entities cannot be turned into an unambiguous template
+                return None
+
+        pattern = "^"
+        display = ""
+        position = 0
+        slots = {}
+        for start, end, name, kind in spans:
+            pattern += re.escape(text[position:start]) + f"(?P<{name}>.+?)"
+            display += text[position:start] + "{" + name + "}"
+            position = end
+            slots[name] = kind
+        pattern += re.escape(text[position:]) + "$"
+        display += text[position:]
+
+        return pattern, display.lower(), slots
+
+    def lookup(self, user_request: str, has_project: bool = False) -> Optional[Dict[str, Any]]:
+        """Find a cached plan for a request; returns the entry with its slot values filled in"""
+        text = normalize_request(user_request)
+
+        with self._lock:
+            for key, entry in reversed(self._entries.items()):
+                if entry["requires_project"] and not has_project:
+                    continue
+
+                match = entry["regex"].match(text)
+                if not match:
+                    continue
+
+                self._entries.move_to_end(key)
+                entry["hits"] += 1
+                self.stats["hits"] += 1
+                return {
+                    "template": key,
+                    "operation_type": entry["operation_type"],
+                    "slot_values": match.groupdict(),
+                    "slots": dict(entry["slots"])
+                }
+
+            self.stats["misses"] += 1
+            return None
+
+    def record(self, user_request: str, operation_type: str, entities: Dict[str, Any],
+               requires_project: bool) -> Optional[str]:
+        """Store the plan of a successful run; returns the template key"""
+        text = normalize_request(user_request)
+        template = self._template(text, entities)
+        if template is None:
+            return None
+
+        pattern, key, slots = template
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return key
+
+            self._entries[key] = {
+                "regex": re.compile(pattern, re.IGNORECASE),
+                "operation_type": operation_type,
+                "slots": slots,
+                "requires_project": requires_project,
+                "hits": 0,
+                "created_at": time.time()
+            }
+            self.stats["stored"] += 1
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+        return key
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit rate, evictions and cache size"""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "success": True,
+                **self.stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0
+            }
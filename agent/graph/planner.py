@@ -0,0 +1,221 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextvars import copy_context
+from typing import Dict, Any, List, Callable, Optional
+from ..models import ToolStep, step_output
+
+class ToolPlanner:
+    """Turns a parsed intent and its entities into a DAG of tool calls"""
+
+    def plan(self, operation_type: Optional[str], context: Dict[str, Any],
+             project_id: Optional[str] = None) -> List[ToolStep]:
+        """Build the tool steps for an operation"""
+        steps: List[ToolStep] = []
+        project_ref: Any = project_id
+        project_deps: List[str] = []
+
+        entity_name = context.get("entity_name")
+        fields = context.get("fields", [])
+        widget_types = list(context.get("widget_types", []))
+
+        if operation_type == "create_project":
+            steps.append(ToolStep(
+                id="create_project",
+                tool="create_project",
+                params={
+                    "name": context.get("project_name", "New Project"),
+                    "description": context.get("description", "")
+                }
+            ))
+            project_ref = step_output("create_project", "project_id")
+            project_deps = ["create_project"]
+
+        # create project → create CRUD API
+        api_step = None
+        if entity_name and operation_type in ("create_project", "create_api", "bind_data"):
+            api_step = ToolStep(
+                id="create_crud_api",
+                tool="create_crud_api",
+                params={"project_id": project_ref, "entity_name": entity_name, "fields": fields},
+                depends_on=list(project_deps)
+            )
+            steps.append(api_step)
+
+        if not widget_types or operation_type not in ("create_project", "add_widget"):
+            return steps
+
+        # create project → add screen
+        screen_ref: Any = context.get("screen_id", "screen_1")
+        screen_deps = list(project_deps)
+        if operation_type == "create_project":
+            steps.append(ToolStep(
+                id="add_screen",
+                tool="add_screen",
+                params={"project_id": project_ref, "screen_name": context.get("screen_name", "Home")},
+                depends_on=list(project_deps)
+            ))
+            screen_ref = step_output("add_screen", "screen_id")
+            screen_deps = ["add_screen"]
+
+        # add screen → build form → bind submit to API
+        if "form" in widget_types and fields:
+            widget_types.remove("form")
+            steps.append(ToolStep(
+                id="create_form",
+                tool="create_form",
+                params={"project_id": project_ref, "screen_id": screen_ref, "fields": fields},
+                depends_on=list(screen_deps)
+            ))
+
+            if api_step:
+                steps.append(ToolStep(
+                    id="bind_submit",
+                    tool="bind_widget_to_api",
+                    params={
+                        "project_id": project_ref,
+                        "screen_id": screen_ref,
+                        "widget_id": step_output("create_form", "submit_widget_id"),
+                        "api_endpoint_id": f"Create {entity_name}"
+                    },
+                    depends_on=["create_form", api_step.id]
+                ))
+
+        # Remaining widgets on the same screen share one load/update of the project
+        if widget_types:
+            steps.append(ToolStep(
+                id="add_widgets",
+                tool="add_widgets",
+                params={
+                    "project_id": project_ref,
+                    "screen_id": screen_ref,
+                    "widgets": [{"type": widget_type} for widget_type in widget_types]
+                },
+                depends_on=list(screen_deps)
+            ))
+
+        return steps
+
+class PlanExecutor:
+    """Executes a tool DAG
+
+    Every project tool loads and saves the whole project document, so steps on
+    the same project run one after another; ready steps on different projects
+    (or on none) run concurrently. A step is only handed to a worker once its
+    project is free, and a lone ready step runs on the calling thread.
+    """
+
+    def __init__(self, tools: Dict[str, Callable[..., Dict[str, Any]]], max_workers: int = 4):
+        self.tools = tools
+        self.max_workers = max_workers
+        self._project_locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _project_lock(self, project_id: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._project_locks.setdefault(project_id, threading.Lock())
+
+    def _resolve(self, value: Any, results: Dict[str, Dict[str, Any]]) -> Any:
+        if isinstance(value, dict) and "$step" in value:
+            return results[value["$step"]].get(value["key"])
+        return value
+
+    def _run_step(self, step: ToolStep, results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        queued = time.perf_counter()
+        started = queued
+        try:
+            tool = self.tools.get(step.tool)
+            if not tool:
+                result = {"success": False, "error": f"Unknown tool: {step.tool}"}
+            else:
+                params = {key: self._resolve(value, results) for key, value in step.params.items()}
+
+                # Other runs sharing this executor may be writing the same project
+                project_id = params.get("project_id")
+                if project_id:
+                    with self._project_lock(str(project_id)):
+                        started = time.perf_counter()
+                        result = tool(**params)
+                else:
+                    started = time.perf_counter()
+                    result = tool(**params)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+
+        return {
+            **result,
+            "step_id": step.id,
+            "tool": step.tool,
+            "depends_on": step.depends_on,
+            "wait_ms": round((started - queued) * 1000, 2),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
+    def _skip(self, step: ToolStep, error: str) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "error": error,
+            "step_id": step.id,
+            "tool": step.tool,
+            "depends_on": step.depends_on,
+            "wait_ms": 0.0,
+            "duration_ms": 0.0
+        }
+
+    def execute(self, steps: List[ToolStep]) -> List[Dict[str, Any]]:
+        """Run all steps once their dependencies succeed; returns one result per step, in plan order"""
+        results: Dict[str, Dict[str, Any]] = {}
+        pending = {step.id: step for step in steps}
+        running = {}
+        busy_projects = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                ready, skipped = [], False
+                for step in list(pending.values()):
+                    if not all(dep in results for dep in step.depends_on):
+                        continue
+
+                    failed = [dep for dep in step.depends_on if not results[dep].get("success")]
+                    if failed:
+                        del pending[step.id]
+                        results[step.id] = self._skip(step, f"Skipped: dependency {', '.join(failed)} failed")
+                        skipped = True
+                        continue
+
+                    # A step waits here, not on a worker, while its project is in use
+                    project_id = self._resolve(step.params.get("project_id"), results)
+                    project = str(project_id) if project_id else None
+                    if project and (project in busy_projects or project in (key for _, key in ready)):
+                        continue
+                    del pending[step.id]
+                    ready.append((step, project))
+
+                if not ready and not running:
+                    if skipped:
+                        continue
+                    # Dependencies that are not part of the plan can never be met
+                    for step in pending.values():
+                        results[step.id] = self._skip(step, f"Unresolved dependencies: {', '.join(step.depends_on)}")
+                    break
+
+                if len(ready) == 1 and not running:
+                    step, _ = ready[0]
+                    results[step.id] = self._run_step(step, dict(results))
+                    continue
+
+                for step, project in ready:
+                    if project:
+                        busy_projects.add(project)
+                    # Workers run in the caller's context, so tools see the run's prefetched projects
+                    running[pool.submit(copy_context().run, self._run_step, step, dict(results))] = (step, project)
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step, project = running.pop(future)
+                    busy_projects.discard(project)
+                    results[step.id] = future.result()
+
+        return [results[step.id] for step in steps]
@@ -13,6 +13,7 @@ from urllib.request import urlopen
 from typing import Dict, Any, Optional
 import sys
 import os
+import uuid
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -22,6 +23,7 @@ try:
     from tools.project_tools import ProjectTools
     from tools.api_tools import ApiTools
     from tools.widget_tools import WidgetTools
+    from tools.prefetch import ProjectPrefetcher
     from config import settings
     print("✅ All tools imported successfully")
     TOOLS_AVAILABLE = True
@@ -55,6 +57,16 @@ except ImportError as e:
     
     TOOLS_AVAILABLE = False
 
+# Conversation checkpoints need the agent packages; without them every request stands alone
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from agent.config import settings as agent_settings
+    from agent.memory.session_store import SessionStore
+    SESSIONS_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️  Session store not available, conversations will not be resumed: {e}")
+    SESSIONS_AVAILABLE = False
+
 class MinimalAgent:
     """Minimal agent using only standard library"""
     
@@ -87,6 +99,21 @@ class MinimalAgent:
             self.project_tools = ProjectTools()
             self.api_tools = ApiTools()
             self.widget_tools = WidgetTools()
+            
+            # Share a background project fetch between the tools of a request
+            self.prefetcher = ProjectPrefetcher()
+            for tools in (self.project_tools, self.api_tools, self.widget_tools):
+                tools.prefetcher = self.prefetcher
+        
+        self.sessions = None
+        if SESSIONS_AVAILABLE:
+            self.sessions = SessionStore(
+                agent_settings.SESSION_DB_PATH,
+                max_age_seconds=agent_settings.SESSION_MAX_AGE_SECONDS,
+                max_sessions=agent_settings.SESSION_MAX_COUNT,
+                max_bytes=agent_settings.SESSION_MAX_BYTES
+            )
+            self.sessions.setup()
     
     def parse_intent(self, message: str) -> str:
         """Parse user intent using simple patterns"""
@@ -115,8 +142,33 @@ class MinimalAgent:
         
         return entities
     
-    def process_request(self, message: str, project_id: str = None) -> Dict[str, Any]:
+    def process_request(self, message: str, project_id: str = None,
+                        conversation_id: str = None) -> Dict[str, Any]:
+        """Process user request, resuming the conversation's project when none is given"""
+        if not (self.sessions and conversation_id):
+            return self._process(message, project_id)
+        
+        state = self.sessions.resume(message, project_id, conversation_id)
+        state.operation_type = self.parse_intent(message)
+        result = self._process(message, state.project_id)
+        
+        # Checkpoint the state this turn ran with, updated by its outcome
+        state.project_id = result.get("project_id") or state.project_id
+        if state.project_id:
+            state.context["project_id"] = state.project_id
+        state.results.append(result)
+        if result.get("error"):
+            state.errors.append(result["error"])
+        state.completed = bool(result.get("success"))
+        self.sessions.save(state)
+        return result
+    
+    def _process(self, message: str, project_id: str = None) -> Dict[str, Any]:
         """Process user request"""
+        run_id = uuid.uuid4().hex
+        if TOOLS_AVAILABLE:
+            self.prefetcher.start(project_id, run_id)
+        
         intent = self.parse_intent(message)
         entities = self.extract_entities(message)
         
@@ -228,13 +280,15 @@ class MinimalAgent:
                 "success": False,
                 "error": f"Error processing request: {str(e)}"
             }
+        
+        finally:
+            self.prefetcher.discard(run_id)
 
 class AgentHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     """HTTP request handler for the agent"""
     
-    def __init__(self, *args, **kwargs):
-        self.agent = MinimalAgent()
-        super().__init__(*args, **kwargs)
+    # One agent, and so one session store, per server process; set by run_server
+    agent = None
     
     def do_GET(self):
         """Handle GET requests"""
@@ -283,11 +337,13 @@ class AgentHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
                 
                 message = data.get('message', '')
                 project_id = data.get('project_id')
+                conversation_id = data.get('conversation_id')
                 
-                result = self.agent.process_request(message, project_id)
+                result = self.agent.process_request(message, project_id, conversation_id)
                 
                 response = {
                     "success": result.get("success", False),
+                    "conversation_id": conversation_id,
                     "message": "Operation completed successfully" if result.get("success") else "Operation failed",
                     "data": result if result.get("success") else None,
                     "error": result.get("error") if not result.get("success") else None
@@ -324,6 +380,8 @@ def run_server():
     print("✅ No external dependencies needed!")
     print("🔧 Tools available:", TOOLS_AVAILABLE)
     
+    AgentHTTPRequestHandler.agent = MinimalAgent()
+    
     with socketserver.TCPServer((HOST, PORT), AgentHTTPRequestHandler) as httpd:
         print(f"🎯 Server running at http://{HOST}:{PORT}")
         try:
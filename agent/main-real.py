@@ -14,6 +14,16 @@ from typing import Dict, Any, Optional
 import sys
 import os
 
+# Conversation checkpoints need the agent packages; without them every request stands alone
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from agent.config import settings
+    from agent.memory.session_store import SessionStore
+    SESSIONS_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️  Session store not available, conversations will not be resumed: {e}")
+    SESSIONS_AVAILABLE = False
+
 # Backend configuration
 BACKEND_URL = "http://localhost:5000"
 BACKEND_API_BASE = f"{BACKEND_URL}/api"
@@ -52,6 +62,16 @@ class RealAxiomAgent:
                 r"bind.*button.*api", r"link.*widget.*api"
             ]
         }
+        
+        self.sessions = None
+        if SESSIONS_AVAILABLE:
+            self.sessions = SessionStore(
+                settings.SESSION_DB_PATH,
+                max_age_seconds=settings.SESSION_MAX_AGE_SECONDS,
+                max_sessions=settings.SESSION_MAX_COUNT,
+                max_bytes=settings.SESSION_MAX_BYTES
+            )
+            self.sessions.setup()
     
     def parse_intent(self, message: str) -> str:
         """Parse user intent using simple patterns"""
@@ -271,7 +291,28 @@ class RealAxiomAgent:
                 "error": str(e)
             }
     
-    def process_request(self, message: str, project_id: str = None) -> Dict[str, Any]:
+    def process_request(self, message: str, project_id: str = None,
+                        conversation_id: str = None) -> Dict[str, Any]:
+        """Process user request, resuming the conversation's project when none is given"""
+        if not (self.sessions and conversation_id):
+            return self._process(message, project_id)
+        
+        state = self.sessions.resume(message, project_id, conversation_id)
+        state.operation_type = self.parse_intent(message)
+        result = self._process(message, state.project_id)
+        
+        # Checkpoint the state this turn ran with, updated by its outcome
+        state.project_id = result.get("project_id") or state.project_id
+        if state.project_id:
+            state.context["project_id"] = state.project_id
+        state.results.append(result)
+        if result.get("error"):
+            state.errors.append(result["error"])
+        state.completed = bool(result.get("success"))
+        self.sessions.save(state)
+        return result
+    
+    def _process(self, message: str, project_id: str = None) -> Dict[str, Any]:
         """Process user request with real database operations"""
         intent = self.parse_intent(message)
         entities = self.extract_entities(message)
@@ -366,9 +407,8 @@ class RealAxiomAgent:
 class RealAgentHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     """HTTP request handler for the real agent"""
     
-    def __init__(self, *args, **kwargs):
-        self.agent = RealAxiomAgent()
-        super().__init__(*args, **kwargs)
+    # One agent, and so one session store, per server process; set by run_server
+    agent = None
     
     def do_GET(self):
         """Handle GET requests"""
@@ -417,11 +457,13 @@ class RealAgentHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
                 
                 message = data.get('message', '')
                 project_id = data.get('project_id')
+                conversation_id = data.get('conversation_id')
                 
-                result = self.agent.process_request(message, project_id)
+                result = self.agent.process_request(message, project_id, conversation_id)
                 
                 response = {
                     "success": result.get("success", False),
+                    "conversation_id": conversation_id,
                     "message": result.get("message", "Operation completed"),
                     "data": result if result.get("success") else None,
                     "error": result.get("error") if not result.get("success") else None
@@ -458,6 +500,8 @@ def run_server():
     print("🔗 Backend:", BACKEND_URL)
     print("🌐 Frontend: Open your Flutter app")
     
+    RealAgentHTTPRequestHandler.agent = RealAxiomAgent()
+    
     with socketserver.TCPServer((HOST, PORT), RealAgentHTTPRequestHandler) as httpd:
         print(f"🎯 Server running at http://{HOST}:{PORT}")
         try:
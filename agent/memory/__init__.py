@@ -1,4 +1,23 @@
 from .llama_index import LlamaIndexMemory
 from .qdrant_client import QdrantMemory
+from .local_vector_store import LocalVectorMemory
+from .session_store import SessionStore
+from .artifact_store import ArtifactStore
+from .embedding_cache import EmbeddingCache, CachedEmbedding
+from .quantized_embedding import QuantizedEmbedding
+from .code_splitter import CodeSplitter
+from .ingest import IngestionPipeline
+from .ingest_filter import FileFilter, GitIgnore, ChunkDeduplicator
+from .lexical_index import LexicalIndex, HybridRetriever
+from .symbol_index import SymbolIndex
+from .document_index import DocumentIndex
+from .context_packer import ContextPacker
+from .llm_residency import ModelResidency
 
-__all__ = ["LlamaIndexMemory", "QdrantMemory"]
+__all__ = [
+    "LlamaIndexMemory", "QdrantMemory", "LocalVectorMemory", "SessionStore", "ArtifactStore",
+    "EmbeddingCache", "CachedEmbedding", "CodeSplitter",
+    "IngestionPipeline", "FileFilter", "GitIgnore", "ChunkDeduplicator",
+    "QuantizedEmbedding", "LexicalIndex", "HybridRetriever",
+    "SymbolIndex", "DocumentIndex", "ContextPacker", "ModelResidency"
+]
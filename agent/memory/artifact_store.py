@@ -0,0 +1,128 @@
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+from pydantic import BaseModel
+
+ARTIFACT_KEY = "$artifact"
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    return str(value)
+
+def payload_size(value: Any) -> int:
+    """Approximate serialized size of a payload in bytes"""
+    return len(json.dumps(value, default=_json_default))
+
+def is_artifact_ref(value: Any) -> bool:
+    return isinstance(value, dict) and ARTIFACT_KEY in value
+
+class ArtifactStore:
+    """Out-of-band storage for large tool payloads, referenced from AgentState by handle"""
+
+    def __init__(self, max_inline_bytes: int = 4096, max_total_bytes: int = 64 * 1024 * 1024,
+                 max_runs: int = 256):
+        self.max_inline_bytes = max_inline_bytes
+        self.max_total_bytes = max_total_bytes
+        self.max_runs = max_runs
+        self._artifacts: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._runs: Dict[str, List[str]] = {}
+        self._total_bytes = 0
+        self._evicted = 0
+        self._lock = threading.Lock()
+
+    def new_run(self) -> str:
+        """Start a new run namespace and return its ID, releasing the oldest runs beyond max_runs"""
+        run_id = uuid.uuid4().hex
+        with self._lock:
+            self._runs[run_id] = []
+            while len(self._runs) > self.max_runs:
+                self._release_locked(next(iter(self._runs)))
+        return run_id
+
+    def put(self, run_id: str, value: Any, size: int = None) -> Dict[str, Any]:
+        """Store a payload and return a reference to embed in the state"""
+        size = size if size is not None else payload_size(value)
+        handle = f"{run_id}/{uuid.uuid4().hex[:12]}"
+
+        with self._lock:
+            self._artifacts[handle] = (value, size)
+            self._runs.setdefault(run_id, []).append(handle)
+            self._total_bytes += size
+            self._evict_locked()
+
+        return {ARTIFACT_KEY: handle, "bytes": size}
+
+    def get(self, handle: str) -> Optional[Any]:
+        """Fetch a stored payload by handle"""
+        with self._lock:
+            entry = self._artifacts.get(handle)
+            if entry is None:
+                return None
+            self._artifacts.move_to_end(handle)
+            return entry[0]
+
+    def resolve(self, value: Any) -> Any:
+        """Replace artifact references in a (nested) payload with the stored values"""
+        if is_artifact_ref(value):
+            return self.get(value[ARTIFACT_KEY])
+        if isinstance(value, dict):
+            return {key: self.resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(item) for item in value]
+        return value
+
+    def slim(self, run_id: str, payload: Dict[str, Any], max_inline_bytes: int = None) -> Dict[str, Any]:
+        """Move large top-level values of a tool result out of band, keeping small fields inline"""
+        limit = self.max_inline_bytes if max_inline_bytes is None else max_inline_bytes
+        slimmed = {}
+
+        for key, value in payload.items():
+            if key in ("success", "error", "message") or is_artifact_ref(value):
+                slimmed[key] = value
+                continue
+
+            size = payload_size(value)
+            slimmed[key] = self.put(run_id, value, size) if size > limit else value
+
+        return slimmed
+
+    def release(self, run_id: str) -> int:
+        """Drop every artifact stored for a run"""
+        with self._lock:
+            return self._release_locked(run_id)
+
+    def _release_locked(self, run_id: str) -> int:
+        handles = self._runs.pop(run_id, [])
+        for handle in handles:
+            entry = self._artifacts.pop(handle, None)
+            if entry:
+                self._total_bytes -= entry[1]
+        return len(handles)
+
+    def _evict_locked(self):
+        while self._total_bytes > self.max_total_bytes and len(self._artifacts) > 1:
+            handle, (_, size) = self._artifacts.popitem(last=False)
+            self._total_bytes -= size
+            self._evicted += 1
+
+            run_id = handle.split("/", 1)[0]
+            handles = self._runs.get(run_id, [])
+            if handle in handles:
+                handles.remove(handle)
+            if not handles:
+                self._runs.pop(run_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get artifact counts and memory usage"""
+        with self._lock:
+            return {
+                "success": True,
+                "artifacts": len(self._artifacts),
+                "runs": len(self._runs),
+                "total_bytes": self._total_bytes,
+                "max_total_bytes": self.max_total_bytes,
+                "evicted": self._evicted
+            }
@@ -0,0 +1,198 @@
+import re
+from typing import Any, Dict, List, Sequence, Tuple
+from llama_index.core.bridge.pydantic import Field
+from llama_index.core.node_parser import NodeParser, SentenceSplitter
+from llama_index.core.node_parser.node_utils import build_nodes_from_splits
+from llama_index.core.schema import BaseNode
+
+# Top-level declarations that start a chunk, first match wins; "name" is the symbol
+# and route patterns also capture the HTTP method
+TOP_LEVEL_PATTERNS = {
+    ".py": [
+        (r"^class\s+(?P<name>\w+)", "class"),
+        (r"^(?:async\s+)?def\s+(?P<name>\w+)", "function"),
+    ],
+    ".dart": [
+        (r"^class\s+(?P<name>\w+(?:Screen|Page))\s+extends\s+State(?:less|ful)Widget\b", "screen"),
+        (r"^class\s+(?P<name>\w+)\s+extends\s+State(?:less|ful)Widget\b", "widget"),
+        (r"^class\s+(?P<name>\w+)\s+extends\s+State<", "widget_state"),
+        (r"^class\s+(?P<name>\w+)[^{]*\bChangeNotifier\b", "provider"),
+        (r"^(?:abstract\s+)?(?:class|mixin|extension|enum)\s+(?P<name>\w+)", "class"),
+        (r"^(?!import\b|export\b|part\b|library\b)(?=\w)[\w<>?,\[\] ]+\s+(?P<name>\w+)\s*\([^;]*$", "function"),
+    ],
+    ".js": [
+        (r"^(?:router|app)\.(?P<method>get|post|put|patch|delete|all|use)\(\s*['\"`](?P<name>[^'\"`]*)", "route"),
+        (r"^(?:export\s+)?(?:const|let|var)\s+(?P<name>\w+)\s*=\s*new\s+(?:mongoose\.)?Schema\b", "schema"),
+        (r"^(?:export\s+(?:default\s+)?)?(?:(?:const|let|var)\s+\w+\s*=\s*)?mongoose\.model\(\s*['\"](?P<name>\w+)", "model"),
+        (r"^(?:export\s+(?:default\s+)?)?class\s+(?P<name>\w+)", "class"),
+        (r"^(?:export\s+(?:default\s+)?)?(?:async\s+)?function\s*\*?\s*(?P<name>\w+)", "function"),
+        (r"^(?:export\s+)?(?:const|let|var)\s+(?P<name>\w+)\s*=\s*(?:async\s+)?(?:function\b|\([^)]*\)\s*=>|\w+\s*=>)", "function"),
+        (r"^(?:module\.)?exports\.(?P<name>\w+)\s*=", "function"),
+    ],
+}
+
+# Members used to split a declaration that exceeds the size cap
+MEMBER_PATTERNS = {
+    ".py": [
+        (r"^\s{4}(?:async\s+)?def\s+(?P<name>\w+)", "method"),
+    ],
+    ".dart": [
+        (r"^\s{2}(?=\w)(?!return\b|if\b|for\b|while\b|switch\b)(?:static\s+)?[\w<>?,\[\] ]+\s+(?P<name>\w+)\s*\([^;]*$", "method"),
+    ],
+    ".js": [
+        (r"^\s{2}(?!if\b|for\b|while\b|switch\b|catch\b|return\b)(?:static\s+)?(?:async\s+)?(?P<name>\w+)\s*\([^)]*\)\s*\{", "method"),
+        (r"^\s{2}(?P<name>\w+)\s*:\s*\{", "field"),
+    ],
+}
+
+# Lines directly above a declaration that belong to it (decorators, annotations, doc comments)
+ATTACHED_PREFIXES = {
+    ".py": ("@", "#"),
+    ".dart": ("@", "//", "/*", "*"),
+    ".js": ("//", "/*", "*"),
+}
+
+MODULE_SYMBOL = "<module>"
+
+class CodeSplitter(NodeParser):
+    """Splits source files on class, function, route and widget boundaries
+
+    Declarations larger than max_chars are split on their members, then on lines;
+    declarations smaller than min_chars are merged into a neighbour. Files in other
+    languages go to the fallback parser.
+    """
+
+    max_chars: int = Field(default=3000, description="Maximum characters per chunk.", gt=0)
+    min_chars: int = Field(default=600, description="Chunks below this size are merged with their neighbours.", ge=0)
+    fallback: NodeParser = Field(default_factory=SentenceSplitter, description="Parser for unsupported file types.")
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CodeSplitter"
+
+    def _parse_nodes(self, nodes: Sequence[BaseNode], show_progress: bool = False, **kwargs: Any) -> List[BaseNode]:
+        results = []
+        for node in nodes:
+            file_type = node.metadata.get("file_type", "")
+            if file_type in TOP_LEVEL_PATTERNS:
+                results.extend(self._split_node(node, file_type))
+            else:
+                results.extend(self.fallback._parse_nodes([node], show_progress=show_progress, **kwargs))
+        return results
+
+    def _split_node(self, node: BaseNode, file_type: str) -> List[BaseNode]:
+        lines = node.get_content().splitlines(keepends=True)
+        chunks, texts = [], []
+        for chunk in self.split_lines(lines, file_type):
+            text = "".join(lines[chunk["start"]:chunk["end"]])
+            if text.strip():
+                chunks.append(chunk)
+                texts.append(text)
+
+        split_nodes = build_nodes_from_splits(texts, node, id_func=self.id_func)
+        for split_node, chunk in zip(split_nodes, chunks):
+            split_node.metadata.update({
+                "symbols": ", ".join(chunk["symbols"]),
+                "symbol_type": chunk["type"],
+                "start_line": chunk["start"] + 1,
+                "end_line": chunk["end"]
+            })
+            split_node.excluded_embed_metadata_keys.extend(["start_line", "end_line"])
+        return split_nodes
+
+    def split_lines(self, lines: List[str], file_type: str) -> List[Dict[str, Any]]:
+        """Chunk boundaries as dicts with start/end line (end exclusive), symbols and type"""
+        prefixes = ATTACHED_PREFIXES[file_type]
+        blocks = _find_blocks(lines, 0, len(lines), TOP_LEVEL_PATTERNS[file_type], prefixes, MODULE_SYMBOL, "module")
+
+        pieces = []
+        for block in blocks:
+            if _size(lines, block) <= self.max_chars:
+                pieces.append(block)
+                continue
+
+            members = _find_blocks(
+                lines, block["start"], block["end"], MEMBER_PATTERNS[file_type], prefixes, block["name"], block["type"]
+            )
+            for member in members:
+                if member["name"] != block["name"]:
+                    member["name"] = f"{block['name']}.{member['name']}"
+                pieces.extend(self._split_by_lines(lines, member))
+
+        return self._merge(lines, pieces)
+
+    def _split_by_lines(self, lines: List[str], block: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Cut an oversized block at line boundaries, preferring blank lines in the second half"""
+        pieces = []
+        start = block["start"]
+        while start < block["end"]:
+            end, size, blank = start, 0, None
+            while end < block["end"] and (size + len(lines[end]) <= self.max_chars or end == start):
+                size += len(lines[end])
+                end += 1
+                if not lines[end - 1].strip() and size > self.max_chars // 2:
+                    blank = end
+            if end < block["end"] and blank:
+                end = blank
+            pieces.append({**block, "start": start, "end": end})
+            start = end
+        return pieces
+
+    def _merge(self, lines: List[str], pieces: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        chunks = []
+        for piece in pieces:
+            previous = chunks[-1] if chunks else None
+            if (
+                previous
+                and min(_size(lines, previous), _size(lines, piece)) < self.min_chars
+                and _size(lines, previous) + _size(lines, piece) <= self.max_chars
+            ):
+                previous["end"] = piece["end"]
+                if piece["name"] not in previous["symbols"]:
+                    previous["symbols"].append(piece["name"])
+                if previous["type"] == "module":
+                    previous["type"] = piece["type"]
+            else:
+                chunks.append({"start": piece["start"], "end": piece["end"], "symbols": [piece["name"]], "type": piece["type"]})
+
+        for chunk in chunks:
+            if len(chunk["symbols"]) > 1 and MODULE_SYMBOL in chunk["symbols"]:
+                chunk["symbols"].remove(MODULE_SYMBOL)
+        return chunks
+
+def _size(lines: List[str], block: Dict[str, Any]) -> int:
+    return sum(len(line) for line in lines[block["start"]:block["end"]])
+
+def _find_blocks(lines: List[str], start: int, end: int, patterns: List[Tuple[str, str]],
+                 prefixes: Tuple[str, ...], head_name: str, head_type: str) -> List[Dict[str, Any]]:
+    """Split lines[start:end] at declarations; the part before the first one keeps head_name/head_type"""
+    compiled = [(re.compile(pattern), kind) for pattern, kind in patterns]
+    starts = []
+    declarations = []
+
+    for i in range(start, end):
+        for pattern, kind in compiled:
+            match = pattern.match(lines[i])
+            if not match:
+                continue
+
+            name = match.group("name") or "/"
+            if match.groupdict().get("method"):
+                name = f"{match.group('method').upper()} {name}"
+
+            # Pull decorators and comments directly above into the declaration
+            first = i
+            floor = declarations[-1] + 1 if declarations else start
+            while first > floor and lines[first - 1].strip().startswith(prefixes):
+                first -= 1
+            starts.append((first, name, kind))
+            declarations.append(i)
+            break
+
+    blocks = []
+    if not starts or starts[0][0] > start:
+        blocks.append({"start": start, "end": starts[0][0] if starts else end, "name": head_name, "type": head_type})
+    for index, (first, name, kind) in enumerate(starts):
+        block_end = starts[index + 1][0] if index + 1 < len(starts) else end
+        blocks.append({"start": first, "end": block_end, "name": name, "type": kind})
+    return blocks
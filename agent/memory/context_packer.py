@@ -0,0 +1,134 @@
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+from llama_index.core.bridge.pydantic import Field, PrivateAttr
+from llama_index.core.postprocessor.types import BaseNodePostprocessor
+from llama_index.core.schema import MetadataMode, NodeWithScore, QueryBundle
+from llama_index.core.utils import get_tokenizer
+from .lexical_index import tokenize
+
+# Question words that say nothing about which chunk is relevant
+STOP_TERMS = {
+    "how", "what", "which", "where", "when", "why", "who", "does", "do", "is", "are", "the", "a", "an",
+    "to", "in", "of", "for", "and", "or", "on", "with", "it", "this", "that", "be", "can", "i", "me", "my"
+}
+
+class ContextPacker(BaseNodePostprocessor):
+    """Turns retrieved chunks into a compact LLM context
+
+    Candidates are reranked by query-term coverage (ties keep retrieval order),
+    duplicate and near-duplicate chunks are dropped, long chunks are trimmed to
+    the lines around query terms, and chunks are added until the token budget
+    is spent. Kept chunks keep their retrieval score. Statistics of the last
+    call are kept per thread in last_stats.
+    """
+
+    max_tokens: int = Field(default=1500, description="Token budget for the packed context")
+    max_chunks: int = Field(default=5, description="Maximum number of chunks kept")
+    span_lines: int = Field(default=6, description="Lines kept on each side of a line with a query term")
+    dedup_threshold: float = Field(default=0.8, description="Term-set Jaccard similarity treated as a duplicate")
+
+    _local: Any = PrivateAttr(default_factory=threading.local)
+    _tokenizer: Any = PrivateAttr(default=None)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "ContextPacker"
+
+    @property
+    def last_stats(self) -> Dict[str, Any]:
+        return getattr(self._local, "stats", {})
+
+    def count_tokens(self, text: str) -> int:
+        if self._tokenizer is None:
+            self._tokenizer = get_tokenizer()
+        return len(self._tokenizer(text))
+
+    @staticmethod
+    def query_terms(query: str) -> set:
+        return {term for term in tokenize(query) if term not in STOP_TERMS}
+
+    def snippet(self, text: str, query: str) -> str:
+        """The lines of text around the query terms"""
+        return self._trim(text, self.query_terms(query))
+
+    def _trim(self, text: str, terms: set) -> str:
+        """Keep the lines around query terms, marking the cuts with '...'"""
+        lines = text.split("\n")
+        if not terms or len(lines) <= 2 * self.span_lines + 1:
+            return text
+
+        hits = [i for i, line in enumerate(lines) if terms & set(tokenize(line))]
+        if not hits:
+            return text
+
+        spans = []
+        for hit in hits:
+            start, end = max(0, hit - self.span_lines), min(len(lines), hit + self.span_lines + 1)
+            if spans and start <= spans[-1][1]:
+                spans[-1][1] = max(spans[-1][1], end)
+            else:
+                spans.append([start, end])
+
+        parts = ["\n".join(lines[start:end]) for start, end in spans]
+        trimmed = "\n...\n".join(parts)
+        if spans[0][0] > 0:
+            trimmed = "...\n" + trimmed
+        if spans[-1][1] < len(lines):
+            trimmed += "\n..."
+        return trimmed
+
+    def _postprocess_nodes(self, nodes: List[NodeWithScore],
+                           query_bundle: Optional[QueryBundle] = None) -> List[NodeWithScore]:
+        terms = self.query_terms(query_bundle.query_str if query_bundle else "")
+
+        # Rerank: coverage of the query terms, with the retrieval rank as the tie-breaker
+        ranked = []
+        for rank, hit in enumerate(nodes):
+            node_terms = set(tokenize(hit.node.get_content()))
+            coverage = len(terms & node_terms) / len(terms) if terms else 0.0
+            ranked.append((coverage + 0.5 / (rank + 1), rank, hit, node_terms))
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+
+        kept, kept_terms, seen_hashes = [], [], set()
+        duplicates, context_tokens, trimmed_chunks = 0, 0, 0
+        for _, _, hit, node_terms in ranked:
+            if len(kept) == self.max_chunks:
+                break
+
+            digest = hashlib.sha1(hit.node.get_content().encode("utf-8")).hexdigest()
+            if digest in seen_hashes or any(
+                len(node_terms & other) / max(len(node_terms | other), 1) >= self.dedup_threshold
+                for other in kept_terms
+            ):
+                duplicates += 1
+                continue
+
+            text = self._trim(hit.node.get_content(), terms)
+            node = hit.node.model_copy(update={"text": text}) if text != hit.node.get_content() else hit.node
+            tokens = self.count_tokens(node.get_content(metadata_mode=MetadataMode.LLM))
+
+            remaining = self.max_tokens - context_tokens
+            if tokens > remaining:
+                # Only the top chunk is cut to fit; later ones are skipped rather than sent as fragments
+                if kept:
+                    continue
+                text = text[:int(len(text) * remaining / tokens)]
+                text = text[:text.rfind("\n") + 1] or text
+                node = hit.node.model_copy(update={"text": text})
+                tokens = self.count_tokens(node.get_content(metadata_mode=MetadataMode.LLM))
+
+            trimmed_chunks += node is not hit.node
+            seen_hashes.add(digest)
+            kept_terms.append(node_terms)
+            kept.append(NodeWithScore(node=node, score=hit.score))
+            context_tokens += tokens
+
+        self._local.stats = {
+            "candidates": len(nodes),
+            "kept": len(kept),
+            "duplicates_removed": duplicates,
+            "trimmed": trimmed_chunks,
+            "context_tokens": context_tokens
+        }
+        return kept
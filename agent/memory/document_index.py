@@ -0,0 +1,263 @@
+import json
+import mmap
+import os
+import re
+import threading
+from pathlib import Path, PurePath
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+LINE_RANGE_PATTERN = re.compile(r"L?(\d+)(?:\s*(?:-|:|\.\.|to)\s*L?(\d+))?", re.IGNORECASE)
+
+def parse_line_range(line_range: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """'10-20', '10:20', 'L10-L20' or '10' as (start, end); (None, None) for the whole file"""
+    match = LINE_RANGE_PATTERN.search(line_range or "")
+    if not match:
+        return None, None
+    start = int(match.group(1))
+    end = int(match.group(2)) if match.group(2) else start
+    return min(start, end), max(start, end)
+
+class DocumentIndex:
+    """On-disk store of the indexed file text, with line offsets and summary counts
+
+    The text of every indexed version is appended to text.bin and the offsets of
+    its lines to lines.bin; both are memory-mapped, so a line range is a slice and
+    resident memory does not grow with the codebase. catalog.json maps each path
+    to its spans and keeps the per-type/per-project counts up to date. Any
+    trailing part of a path (Project.js, models/Project.js, ...) resolves with one
+    dict read. Replaced text is reclaimed once it outweighs the live text.
+    """
+
+    def __init__(self, store_dir: Path):
+        self.store_dir = Path(store_dir)
+        self.text_path = self.store_dir / "text.bin"
+        self.lines_path = self.store_dir / "lines.bin"
+        self.catalog_path = self.store_dir / "catalog.json"
+
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.summary = self._empty_summary()
+        self._suffixes: Dict[str, List[str]] = {}
+        self._text_size, self._lines_count, self._garbage = 0, 0, 0
+        self._text_map: Optional[mmap.mmap] = None
+        self._lines_map: Optional[np.ndarray] = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _empty_summary() -> Dict[str, Any]:
+        return {"bytes": 0, "lines": 0, "file_types": {}, "projects": {}}
+
+    def _count(self, entry: Dict[str, Any], sign: int):
+        self.summary["bytes"] += sign * entry["size"]
+        self.summary["lines"] += sign * entry["lines"]
+        for group, key in (("file_types", entry["file_type"]), ("projects", entry["project"])):
+            counts = self.summary[group]
+            counts[key] = counts.get(key, 0) + sign
+            if not counts[key]:
+                del counts[key]
+
+    @staticmethod
+    def _path_suffixes(file_key: str) -> List[str]:
+        parts = PurePath(file_key).parts
+        return ["/".join(parts[i:]).lstrip("/") for i in range(len(parts))] + [file_key]
+
+    def _index_suffixes(self, file_key: str):
+        for suffix in self._path_suffixes(file_key):
+            paths = self._suffixes.setdefault(suffix, [])
+            if file_key not in paths:
+                paths.append(file_key)
+
+    def _unindex_suffixes(self, file_key: str):
+        for suffix in self._path_suffixes(file_key):
+            paths = self._suffixes.get(suffix, [])
+            if file_key in paths:
+                paths.remove(file_key)
+            if not paths:
+                self._suffixes.pop(suffix, None)
+
+    def _close_maps(self):
+        if self._text_map is not None:
+            self._text_map.close()
+        self._text_map, self._lines_map = None, None
+
+    def load(self) -> bool:
+        with self._lock:
+            self.reset(keep_files=True)
+            try:
+                if not self.catalog_path.exists():
+                    # Blobs without a catalog cannot be interpreted
+                    self.reset()
+                    return True
+                catalog = json.loads(self.catalog_path.read_text())
+                self.files, self.summary = catalog["files"], catalog["summary"]
+                self._text_size, self._lines_count = catalog["text_size"], catalog["lines_count"]
+                self._garbage = catalog["garbage"]
+                for file_key in self.files:
+                    self._index_suffixes(file_key)
+                return True
+            except Exception as e:
+                print(f"⚠️  Failed to read document store, rebuilding it: {e}")
+                self.reset()
+                return False
+
+    def save(self):
+        with self._lock:
+            if self._garbage > self._text_size - self._garbage:
+                self._compact()
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.catalog_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps({
+                "files": self.files,
+                "summary": self.summary,
+                "text_size": self._text_size,
+                "lines_count": self._lines_count,
+                "garbage": self._garbage
+            }))
+            os.replace(tmp_path, self.catalog_path)
+
+    def _compact(self):
+        """Rewrite both blobs with only the live file versions"""
+        text_tmp, lines_tmp = self.text_path.with_suffix(".tmp"), self.lines_path.with_suffix(".tmp")
+        text_size, lines_count = 0, 0
+        with open(text_tmp, "wb") as text_out, open(lines_tmp, "wb") as lines_out:
+            for entry in self.files.values():
+                text_out.write(self._slice(entry["offset"], entry["offset"] + entry["size"]))
+                lines_out.write(self._line_slice(entry).tobytes())
+                entry["offset"], entry["line_offset"] = text_size, lines_count
+                text_size += entry["size"]
+                lines_count += entry["lines"] + 1
+
+        self._close_maps()
+        os.replace(text_tmp, self.text_path)
+        os.replace(lines_tmp, self.lines_path)
+        self._text_size, self._lines_count, self._garbage = text_size, lines_count, 0
+
+    def _maps(self) -> Tuple[Optional[mmap.mmap], np.ndarray]:
+        # Maps are reopened once appends have grown the blobs past what was mapped
+        if self._text_map is None or len(self._text_map) < self._text_size:
+            self._close_maps()
+            if self._text_size:
+                with open(self.text_path, "rb") as handle:
+                    self._text_map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._lines_map is None or len(self._lines_map) < self._lines_count:
+            self._lines_map = np.memmap(self.lines_path, dtype=np.uint32, mode="r") if self._lines_count \
+                else np.zeros(0, dtype=np.uint32)
+        return self._text_map, self._lines_map
+
+    def _slice(self, start: int, end: int) -> bytes:
+        text_map, _ = self._maps()
+        return text_map[start:end] if text_map is not None and end > start else b""
+
+    def _line_slice(self, entry: Dict[str, Any]) -> np.ndarray:
+        _, lines_map = self._maps()
+        return np.asarray(lines_map[entry["line_offset"]:entry["line_offset"] + entry["lines"] + 1])
+
+    def reset(self, keep_files: bool = False):
+        """Drop every stored file (keep_files only clears what is held in memory)"""
+        with self._lock:
+            self._close_maps()
+            if not keep_files:
+                for path in (self.text_path, self.lines_path, self.catalog_path):
+                    path.unlink(missing_ok=True)
+            self.files, self._suffixes, self.summary = {}, {}, self._empty_summary()
+            self._text_size, self._lines_count, self._garbage = 0, 0, 0
+
+    def add_file(self, file_key: str, text: str, project: str = "unknown"):
+        """Store a file's text, replacing any previous version of the file"""
+        data = text.encode("utf-8")
+        newlines = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord("\n")) + 1
+        offsets = np.concatenate(([0], newlines)).astype(np.uint32)
+        if offsets[-1] != len(data):
+            offsets = np.append(offsets, np.uint32(len(data)))
+
+        with self._lock:
+            self.remove_file(file_key)
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            # Appends go to the real end of the blobs; anything an interrupted run left past the catalog is garbage
+            with open(self.text_path, "ab") as handle:
+                offset = handle.tell()
+                handle.write(data)
+            with open(self.lines_path, "ab") as handle:
+                handle.write(b"\0" * (-handle.tell() % 4))
+                line_offset = handle.tell() // 4
+                handle.write(offsets.tobytes())
+
+            entry = self.files[file_key] = {
+                "project": project,
+                "file_type": Path(file_key).suffix or "unknown",
+                "offset": offset,
+                "size": len(data),
+                "line_offset": line_offset,
+                "lines": len(offsets) - 1
+            }
+            self._count(entry, 1)
+            self._garbage += offset - self._text_size
+            self._text_size = offset + len(data)
+            self._lines_count = line_offset + len(offsets)
+            self._index_suffixes(file_key)
+
+    def remove_file(self, file_key: str):
+        with self._lock:
+            entry = self.files.pop(file_key, None)
+            if entry is None:
+                return
+            self._count(entry, -1)
+            self._garbage += entry["size"]
+            self._unindex_suffixes(file_key)
+
+    def resolve(self, file_path: str) -> List[str]:
+        """Stored files whose path ends with file_path, falling back to a substring match"""
+        query = file_path.replace("\\", "/").strip()
+        with self._lock:
+            paths = self._suffixes.get(query) or self._suffixes.get(query.lstrip("./"))
+            if paths:
+                return list(paths)
+            # Partial names such as "Project" or "models/Proj" still need a scan
+            return sorted(path for path in self.files if query in path)
+
+    def read(self, file_key: str, start_line: Optional[int] = None, end_line: Optional[int] = None) -> Dict[str, Any]:
+        """Stored text of a file or of an inclusive, 1-based line range (clamped to the file)"""
+        with self._lock:
+            entry = self.files.get(file_key)
+            if entry is None:
+                raise KeyError(f"Document not stored: {file_key}")
+
+            total_lines = entry["lines"]
+            start_line = min(max(start_line or 1, 1), max(total_lines, 1))
+            end_line = min(max(end_line or total_lines, start_line), total_lines)
+            data = b""
+            if total_lines:
+                offsets = self._line_slice(entry)
+                data = self._slice(entry["offset"] + int(offsets[start_line - 1]), entry["offset"] + int(offsets[end_line]))
+
+        return {
+            "file_path": file_key,
+            "text": data.decode("utf-8", errors="ignore"),
+            "start_line": start_line,
+            "end_line": end_line,
+            "total_lines": total_lines
+        }
+
+    def read_chars(self, file_key: str, start: Optional[int] = None, end: Optional[int] = None) -> Optional[str]:
+        """Stored text of a file between two character offsets, or None if the file is not stored"""
+        with self._lock:
+            entry = self.files.get(file_key)
+            if entry is None:
+                return None
+            text = self._slice(entry["offset"], entry["offset"] + entry["size"]).decode("utf-8", errors="ignore")
+        return text[start:end]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get file, byte and line counts by type and project"""
+        with self._lock:
+            return {
+                "success": True,
+                "files": len(self.files),
+                "bytes": self.summary["bytes"],
+                "lines": self.summary["lines"],
+                "file_types": dict(self.summary["file_types"]),
+                "projects": dict(self.summary["projects"]),
+                "store_bytes": self._text_size + 4 * self._lines_count,
+                "reclaimable_bytes": self._garbage
+            }
@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+import numpy as np
+from llama_index.core.embeddings import BaseEmbedding
+from llama_index.core.bridge.pydantic import PrivateAttr
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+class EmbeddingCache:
+    """Append-only on-disk embedding cache keyed by a hash of (namespace, chunk text)
+
+    Vectors live in a raw float32 file that is memory-mapped for reads; keys are
+    stored one per line in a sibling file, so row i of the matrix belongs to line i.
+    Appends hold a file lock, so several processes can share one cache; rows they
+    add are picked up from the keys file on the next lookup.
+    The namespace identifies the embedding model and chunker settings.
+    """
+
+    def __init__(self, cache_dir: Path, namespace: str):
+        self.cache_dir = Path(cache_dir)
+        self.namespace = namespace
+        name = hashlib.sha256(namespace.encode("utf-8")).hexdigest()[:16]
+        self.keys_path = self.cache_dir / f"{name}.keys"
+        self.vectors_path = self.cache_dir / f"{name}.f32"
+        self.meta_path = self.cache_dir / f"{name}.json"
+        self.lock_path = self.cache_dir / f"{name}.lock"
+
+        self.dim: Optional[int] = None
+        self._rows: Dict[str, int] = {}
+        self._count = 0
+        self._keys_bytes = 0
+        self._vectors: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def key(self, text: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(self.namespace.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def load(self) -> bool:
+        """Open the cache files, creating the directory if needed"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                self._rows, self._count, self._keys_bytes = {}, 0, 0
+                self._sync()
+
+            print(f"✅ Embedding cache loaded: {len(self._rows)} vectors")
+            return True
+
+        except Exception as e:
+            print(f"⚠️  Embedding cache unavailable, starting empty: {e}")
+            self._rows = {}
+            self._count = 0
+            self._keys_bytes = 0
+            self._vectors = None
+            return False
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock shared with other processes appending to the cache"""
+        if fcntl is None:
+            yield
+            return
+
+        with open(self.lock_path, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _sync(self):
+        """Pick up the rows appended since the last read, by this or another process"""
+        if self.dim is None and self.meta_path.exists():
+            self.dim = json.loads(self.meta_path.read_text())["dim"]
+        if not self.dim or not self.keys_path.exists():
+            return
+
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._keys_bytes)
+            data = f.read()
+        # Only whole lines backed by a whole vector row count; the rest is still being written or was interrupted
+        stored_rows = self.vectors_path.stat().st_size // (4 * self.dim) if self.vectors_path.exists() else 0
+        lines = data.split(b"\n")[:-1][:max(stored_rows - self._count, 0)]
+        if not lines:
+            return
+
+        for line in lines:
+            self._rows.setdefault(line.decode("ascii"), self._count)
+            self._count += 1
+            self._keys_bytes += len(line) + 1
+        self._remap(self._count)
+
+    def _remap(self, rows: int):
+        self._vectors = (
+            np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+            if rows else None
+        )
+
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Look up cached vectors; None marks a miss"""
+        results = []
+        with self._lock:
+            if self.keys_path.exists() and self.keys_path.stat().st_size > self._keys_bytes:
+                self._sync()
+            for text in texts:
+                row = self._rows.get(self.key(text))
+                if row is None or self._vectors is None:
+                    results.append(None)
+                    self.stats["misses"] += 1
+                else:
+                    results.append(self._vectors[row].tolist())
+                    self.stats["hits"] += 1
+        return results
+
+    def put_many(self, texts: List[str], vectors: List[List[float]]):
+        """Append new vectors to the cache files"""
+        if not texts:
+            return
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        with self._lock, self._file_lock():
+            self._sync()
+            if self.dim is None:
+                self.dim = int(matrix.shape[1])
+                self.meta_path.write_text(json.dumps({"namespace": self.namespace, "dim": self.dim}))
+
+            fresh = {}
+            for i, text in enumerate(texts):
+                key = self.key(text)
+                if key not in self._rows and key not in fresh:
+                    fresh[key] = i
+            if not fresh:
+                return
+
+            # Drop whatever an interrupted append left past the last complete row, then append from there
+            with open(self.vectors_path, "ab") as f:
+                f.truncate(self._count * 4 * self.dim)
+                start = os.fstat(f.fileno()).st_size // (4 * self.dim)
+                f.write(matrix[list(fresh.values())].tobytes())
+            with open(self.keys_path, "ab") as f:
+                f.truncate(self._keys_bytes)
+                f.write("".join(f"{key}\n" for key in fresh).encode("ascii"))
+
+            for row, key in enumerate(fresh, start):
+                self._rows[key] = row
+                self._keys_bytes += len(key) + 1
+            self._count = start + len(fresh)
+            self._remap(self._count)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit counts"""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "success": True,
+                "vectors": len(self._rows),
+                "dim": self.dim,
+                "bytes": len(self._rows) * 4 * (self.dim or 0),
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0
+            }
+
+class CachedEmbedding(BaseEmbedding):
+    """Embedding model wrapper that serves chunk embeddings from an EmbeddingCache"""
+
+    _inner: BaseEmbedding = PrivateAttr()
+    _cache: EmbeddingCache = PrivateAttr()
+
+    def __init__(self, inner: BaseEmbedding, cache: EmbeddingCache, **kwargs: Any):
+        super().__init__(model_name=inner.model_name, embed_batch_size=inner.embed_batch_size, **kwargs)
+        self._inner = inner
+        self._cache = cache
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedEmbedding"
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._inner.get_query_embedding(query)
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return await self._inner.aget_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._get_text_embeddings([text])[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        embeddings = self._cache.get_many(texts)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+
+        if missing:
+            fresh = self._inner.get_text_embedding_batch([texts[i] for i in missing])
+            self._cache.put_many([texts[i] for i in missing], fresh)
+            for i, embedding in zip(missing, fresh):
+                embeddings[i] = embedding
+
+        return embeddings
@@ -0,0 +1,154 @@
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Callable, Tuple
+from llama_index.core.schema import BaseNode, MetadataMode
+
+FileChunks = Tuple[str, Path, List[BaseNode]]
+
+_DONE = object()
+
+class IngestionPipeline:
+    """Streams files through parallel readers and batched embedding workers
+
+    Readers read and chunk files into a bounded queue; embedding workers take
+    whole files off the queue until a batch holds batch_size chunks, embed the
+    batch and hand it to insert. Memory in flight is bounded by the queue size
+    and batch size rather than by the number of files.
+    """
+
+    def __init__(self, read: Callable[[str, Path], List[BaseNode]],
+                 embed: Callable[[List[str]], List[List[float]]],
+                 insert: Callable[[List[FileChunks]], None],
+                 read_workers: int = 4, embed_workers: int = 2,
+                 batch_size: int = 64, queue_size: int = 16):
+        self.read = read
+        self.embed = embed
+        self.insert = insert
+        self.read_workers = max(1, read_workers)
+        self.embed_workers = max(1, embed_workers)
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+
+    def run(self, files: List[Tuple[str, Path]]) -> Dict[str, Any]:
+        """Ingest files; raises the first reader or embedding error after stopping the workers"""
+        started = time.perf_counter()
+        stats = {
+            "files": 0, "chunks": 0, "batches": 0, "peak_queued_files": 0,
+            "read_seconds": 0.0, "embed_seconds": 0.0, "insert_seconds": 0.0
+        }
+        if not files:
+            return {**stats, "elapsed_seconds": 0.0, "chunks_per_second": 0.0}
+
+        pending = queue.Queue()
+        for item in files:
+            pending.put(item)
+        chunked = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors = []
+        lock = threading.Lock()
+
+        def fail(error: Exception):
+            with lock:
+                errors.append(error)
+            stop.set()
+
+        def reader():
+            while not stop.is_set():
+                try:
+                    project, path = pending.get_nowait()
+                except queue.Empty:
+                    return
+
+                try:
+                    read_started = time.perf_counter()
+                    nodes = self.read(project, path)
+                    with lock:
+                        stats["read_seconds"] += time.perf_counter() - read_started
+                except Exception as e:
+                    fail(e)
+                    return
+
+                # Block while the embedders are behind, but give up once the run is stopping
+                while not stop.is_set():
+                    try:
+                        chunked.put((project, path, nodes), timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                with lock:
+                    stats["peak_queued_files"] = max(stats["peak_queued_files"], chunked.qsize())
+
+        def flush(batch: List[FileChunks]):
+            nodes = [node for _, _, file_nodes in batch for node in file_nodes]
+
+            embed_started = time.perf_counter()
+            if nodes:
+                embeddings = self.embed([node.get_content(metadata_mode=MetadataMode.EMBED) for node in nodes])
+                for node, embedding in zip(nodes, embeddings):
+                    node.embedding = embedding
+            embedded = time.perf_counter()
+
+            self.insert(batch)
+            with lock:
+                stats["embed_seconds"] += embedded - embed_started
+                stats["insert_seconds"] += time.perf_counter() - embedded
+                stats["files"] += len(batch)
+                stats["chunks"] += len(nodes)
+                stats["batches"] += 1
+
+        def embedder():
+            batch, size = [], 0
+            while True:
+                item = chunked.get()
+                if item is _DONE:
+                    break
+                if stop.is_set():
+                    # Keep draining so blocked readers can exit
+                    continue
+
+                batch.append(item)
+                size += len(item[2])
+                if size >= self.batch_size:
+                    try:
+                        flush(batch)
+                    except Exception as e:
+                        fail(e)
+                    batch, size = [], 0
+
+            if batch and not stop.is_set():
+                try:
+                    flush(batch)
+                except Exception as e:
+                    fail(e)
+
+        readers = [
+            threading.Thread(target=reader, name=f"ingest-read-{i}", daemon=True)
+            for i in range(min(self.read_workers, len(files)))
+        ]
+        embedders = [
+            threading.Thread(target=embedder, name=f"ingest-embed-{i}", daemon=True)
+            for i in range(self.embed_workers)
+        ]
+        for thread in readers + embedders:
+            thread.start()
+
+        for thread in readers:
+            thread.join()
+        for _ in embedders:
+            chunked.put(_DONE)
+        for thread in embedders:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+        elapsed = time.perf_counter() - started
+        for key in ("read_seconds", "embed_seconds", "insert_seconds"):
+            stats[key] = round(stats[key], 3)
+        return {
+            **stats,
+            "elapsed_seconds": round(elapsed, 3),
+            "chunks_per_second": round(stats["chunks"] / elapsed, 1) if elapsed else 0.0
+        }
@@ -0,0 +1,295 @@
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Any, List, Iterable, Optional, Tuple
+
+import numpy as np
+from llama_index.core.schema import BaseNode
+
+# Header comments that code generators put at the top of their output
+GENERATED_MARKER = re.compile(
+    rb"generated code|generated file|@generated|auto-?generated|do not (?:edit|modify)", re.IGNORECASE
+)
+GENERATED_HEADER_BYTES = 512
+SNIFF_BYTES = 8192
+
+WORD_PATTERN = re.compile(r"\w+")
+MINHASH_PRIME = (1 << 31) - 1
+
+class GitIgnore:
+    """Matches paths against the .gitignore files between a project root and the path
+
+    Rules are read lazily per directory. As in git, the last matching rule wins,
+    deeper .gitignore files override shallower ones and nothing inside an
+    ignored directory can be re-included.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._rules: Dict[Path, List[Tuple[re.Pattern, bool, bool]]] = {}
+        self._ignored_dirs: Dict[Tuple[str, ...], bool] = {}
+
+    @staticmethod
+    def _compile(pattern: str) -> Optional[Tuple[re.Pattern, bool, bool]]:
+        pattern = pattern.rstrip()
+        if not pattern or pattern.startswith("#"):
+            return None
+        negate = pattern.startswith("!")
+        pattern = pattern[1:] if negate else pattern.lstrip("\\")
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+
+        regex, i = "", 0
+        while i < len(pattern):
+            if pattern.startswith("**/", i):
+                regex, i = regex + "(?:.*/)?", i + 3
+            elif pattern.startswith("**", i):
+                regex, i = regex + ".*", i + 2
+            elif pattern[i] == "*":
+                regex, i = regex + "[^/]*", i + 1
+            elif pattern[i] == "?":
+                regex, i = regex + "[^/]", i + 1
+            elif pattern[i] == "[" and "]" in pattern[i + 1:]:
+                end = pattern.index("]", i + 1)
+                regex, i = regex + "[" + pattern[i + 1:end].replace("!", "^", 1) + "]", end + 1
+            else:
+                regex, i = regex + re.escape(pattern[i]), i + 1
+
+        prefix = "^" if anchored else "^(?:.*/)?"
+        return re.compile(prefix + regex + "$"), negate, dir_only
+
+    def _rules_for(self, directory: Path) -> List[Tuple[re.Pattern, bool, bool]]:
+        rules = self._rules.get(directory)
+        if rules is None:
+            rules = []
+            gitignore = directory / ".gitignore"
+            if gitignore.is_file():
+                for line in gitignore.read_text(encoding="utf-8", errors="ignore").splitlines():
+                    rule = self._compile(line)
+                    if rule:
+                        rules.append(rule)
+            self._rules[directory] = rules
+        return rules
+
+    def _matches(self, parts: Tuple[str, ...], is_dir: bool) -> bool:
+        ignored = False
+        for level in range(len(parts)):
+            relative = "/".join(parts[level:])
+            for regex, negate, dir_only in self._rules_for(self.root.joinpath(*parts[:level])):
+                if (is_dir or not dir_only) and regex.match(relative):
+                    ignored = not negate
+        return ignored
+
+    def ignored(self, path: Path) -> bool:
+        try:
+            parts = Path(path).relative_to(self.root).parts
+        except ValueError:
+            return False
+
+        for depth in range(1, len(parts)):
+            directory = parts[:depth]
+            if directory not in self._ignored_dirs:
+                self._ignored_dirs[directory] = self._matches(directory, is_dir=True)
+            if self._ignored_dirs[directory]:
+                return True
+        return self._matches(parts, is_dir=False)
+
+class FileFilter:
+    """Keeps oversized, generated, minified and git-ignored files out of the index"""
+
+    def __init__(self, roots: Iterable[Path], max_file_bytes: int = 256 * 1024, skip_generated: bool = True,
+                 generated_patterns: Iterable[str] = (), skip_minified: bool = True,
+                 minified_line_chars: int = 500, respect_gitignore: bool = True):
+        self.max_file_bytes = max_file_bytes
+        self.skip_generated = skip_generated
+        self.generated_patterns = set(generated_patterns)
+        self.skip_minified = skip_minified
+        self.minified_line_chars = minified_line_chars
+        self.gitignores = [GitIgnore(root) for root in roots] if respect_gitignore else []
+
+    def check(self, path: Path) -> Optional[str]:
+        """Why the file should be skipped, or None to index it"""
+        if self.max_file_bytes and path.stat().st_size > self.max_file_bytes:
+            return "too_large"
+        if any(gitignore.ignored(path) for gitignore in self.gitignores):
+            return "gitignored"
+        if self.skip_generated and any(fnmatch.fnmatch(path.name, pattern) for pattern in self.generated_patterns):
+            return "generated"
+        if not (self.skip_generated or self.skip_minified):
+            return None
+
+        with open(path, "rb") as handle:
+            head = handle.read(SNIFF_BYTES)
+        if self.skip_generated and GENERATED_MARKER.search(head[:GENERATED_HEADER_BYTES]):
+            return "generated"
+        # Minified output packs kilobytes into a handful of lines
+        if self.skip_minified and len(head) >= 2 * self.minified_line_chars \
+                and len(head) / (head.count(b"\n") + 1) > self.minified_line_chars:
+            return "minified"
+        return None
+
+    def filter(self, files: List[Tuple[str, Path]]) -> Tuple[List[Tuple[str, Path]], Dict[str, Any]]:
+        """Split scanned files into the ones to index and a report of the skipped ones"""
+        kept, reasons, examples = [], {}, {}
+        skipped_bytes = 0
+        for project, path in files:
+            try:
+                reason = self.check(path)
+            except OSError:
+                reason = "unreadable"
+            if reason is None:
+                kept.append((project, path))
+                continue
+            reasons[reason] = reasons.get(reason, 0) + 1
+            examples.setdefault(reason, [])
+            if len(examples[reason]) < 5:
+                examples[reason].append(str(path))
+            skipped_bytes += path.stat().st_size if path.exists() else 0
+
+        return kept, {
+            "files": sum(reasons.values()),
+            "bytes": skipped_bytes,
+            "reasons": reasons,
+            "examples": examples
+        }
+
+class ChunkDeduplicator:
+    """Finds chunks whose text is already in the index, exactly ("hash") or nearly ("minhash")
+
+    Exact duplicates are found by the hash of the whitespace-normalized text.
+    With MinHash, word-shingle signatures are bucketed by LSH bands and a
+    candidate counts as a duplicate when its estimated Jaccard similarity
+    reaches the threshold. Chunks shorter than min_chars are always kept.
+    """
+
+    def __init__(self, index_path: Path, mode: str = "hash", threshold: float = 0.9, min_chars: int = 200,
+                 num_perm: int = 64, bands: int = 16, shingle_words: int = 5):
+        self.index_path = Path(index_path)
+        self.mode = mode
+        self.threshold = threshold
+        self.min_chars = min_chars
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_words = shingle_words
+
+        rng = np.random.default_rng(0)
+        self._a = rng.integers(1, MINHASH_PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, MINHASH_PRIME, num_perm, dtype=np.uint64)
+
+        self.chunks: Dict[str, Dict[str, Any]] = {}
+        self._by_hash: Dict[str, str] = {}
+        self._by_file: Dict[str, List[str]] = {}
+        self._buckets: Dict[Tuple[int, bytes], set] = {}
+        self._lock = threading.Lock()
+        self.stats = {"checked": 0, "duplicates": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode in ("hash", "minhash")
+
+    def load(self) -> bool:
+        with self._lock:
+            self.chunks, self._by_hash, self._by_file, self._buckets = {}, {}, {}, {}
+            try:
+                if self.index_path.exists():
+                    self.chunks = json.loads(self.index_path.read_text())["chunks"]
+                for node_id, chunk in self.chunks.items():
+                    self._register(node_id, chunk)
+                return True
+            except Exception as e:
+                self.chunks, self._by_hash, self._by_file, self._buckets = {}, {}, {}, {}
+                print(f"⚠️  Failed to read chunk dedup index, rebuilding it: {e}")
+                return False
+
+    def save(self):
+        with self._lock:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps({"chunks": self.chunks}))
+            os.replace(tmp_path, self.index_path)
+
+    def _signature(self, text: str) -> np.ndarray:
+        words = WORD_PATTERN.findall(text.lower())
+        size = min(self.shingle_words, len(words)) or 1
+        shingles = {" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+        hashes = np.array([zlib.crc32(shingle.encode("utf-8")) % MINHASH_PRIME for shingle in shingles], dtype=np.uint64)
+        return ((np.outer(hashes, self._a) + self._b) % MINHASH_PRIME).min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def _register(self, node_id: str, chunk: Dict[str, Any]):
+        self._by_hash.setdefault(chunk["hash"], node_id)
+        self._by_file.setdefault(chunk["file"], []).append(node_id)
+        if chunk.get("minhash") is not None:
+            for key in self._band_keys(np.array(chunk["minhash"], dtype=np.uint64)):
+                self._buckets.setdefault(key, set()).add(node_id)
+
+    def _unregister(self, node_id: str, chunk: Dict[str, Any]):
+        if self._by_hash.get(chunk["hash"]) == node_id:
+            del self._by_hash[chunk["hash"]]
+        if chunk.get("minhash") is not None:
+            for key in self._band_keys(np.array(chunk["minhash"], dtype=np.uint64)):
+                bucket = self._buckets.get(key, set())
+                bucket.discard(node_id)
+                if not bucket:
+                    self._buckets.pop(key, None)
+
+    def reset(self):
+        with self._lock:
+            self.chunks, self._by_hash, self._by_file, self._buckets = {}, {}, {}, {}
+
+    def remove_file(self, file_key: str):
+        with self._lock:
+            for node_id in self._by_file.pop(file_key, []):
+                self._unregister(node_id, self.chunks.pop(node_id))
+
+    def deduplicate(self, file_key: str, nodes: List[BaseNode]) -> Tuple[List[BaseNode], List[str]]:
+        """Drop the file's chunks that duplicate indexed ones; returns (kept nodes, files holding the originals)"""
+        if not self.enabled:
+            return nodes, []
+
+        kept, originals = [], set()
+        with self._lock:
+            for node in nodes:
+                text = node.get_content()
+                if len(text) < self.min_chars:
+                    kept.append(node)
+                    continue
+
+                self.stats["checked"] += 1
+                digest = hashlib.sha1(" ".join(text.split()).encode("utf-8")).hexdigest()
+                original = self._by_hash.get(digest)
+                signature = None
+                if original is None and self.mode == "minhash":
+                    signature = self._signature(text)
+                    candidates = set()
+                    for key in self._band_keys(signature):
+                        candidates |= self._buckets.get(key, set())
+                    original = next((
+                        node_id for node_id in candidates
+                        if np.mean(signature == np.array(self.chunks[node_id]["minhash"], dtype=np.uint64)) >= self.threshold
+                    ), None)
+
+                if original is not None:
+                    self.stats["duplicates"] += 1
+                    if self.chunks[original]["file"] != file_key:
+                        originals.add(self.chunks[original]["file"])
+                    continue
+
+                chunk = self.chunks[node.node_id] = {
+                    "file": file_key,
+                    "hash": digest,
+                    "minhash": signature.tolist() if signature is not None else None
+                }
+                self._register(node.node_id, chunk)
+                kept.append(node)
+
+        return kept, sorted(originals)
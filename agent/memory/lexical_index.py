@@ -0,0 +1,243 @@
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
+from .document_index import DocumentIndex
+
+IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*|\d+")
+CAMEL_PATTERN = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+# A query without spaces such as createCrudApi, Project.js or dynamic/:collection
+IDENTIFIER_QUERY_PATTERN = re.compile(r"[\w$.:/-]+")
+# Extra idf-weighted score for query terms a chunk declares, so definitions outrank callers
+SYMBOL_BOOST = 2.0
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased identifiers plus their camelCase/snake_case parts
+
+    'createCrudApi' yields createcrudapi, create, crud, api so both the exact
+    identifier and its words match.
+    """
+    tokens = []
+    for identifier in IDENTIFIER_PATTERN.findall(text):
+        lowered = identifier.lower()
+        tokens.append(lowered)
+        parts = [part.lower() for chunk in identifier.split("_") for part in CAMEL_PATTERN.findall(chunk)]
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+def chunk_digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+class LexicalIndex:
+    """BM25 inverted index over indexed chunks, kept next to the vector index
+
+    Only postings, lengths and chunk locations are held; chunk text is read back
+    for the few hits that are returned, from the document store (the text as it
+    was indexed) or else from the source file. Either way it is checked against
+    the chunk's digest, so an edited file never yields shifted text.
+    """
+
+    def __init__(self, index_path: Path, documents: Optional[DocumentIndex] = None,
+                 k1: float = 1.5, b: float = 0.75):
+        self.index_path = Path(index_path)
+        self.documents = documents
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.chunks: Dict[str, Dict[str, Any]] = {}
+        self.files: Dict[str, List[str]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+        self.stats = {"searches": 0}
+
+    def load(self) -> bool:
+        with self._lock:
+            self.postings, self.chunks, self.files, self._total_length = {}, {}, {}, 0
+            try:
+                if self.index_path.exists():
+                    data = json.loads(self.index_path.read_text())
+                    self.postings = data["postings"]
+                    self.chunks = data["chunks"]
+                    self.files = data["files"]
+                    self._total_length = sum(chunk["length"] for chunk in self.chunks.values())
+                return True
+            except Exception as e:
+                print(f"⚠️  Failed to read lexical index, rebuilding it: {e}")
+                self.postings, self.chunks, self.files = {}, {}, {}
+                return False
+
+    def save(self):
+        with self._lock:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps({"postings": self.postings, "chunks": self.chunks, "files": self.files}))
+            os.replace(tmp_path, self.index_path)
+
+    def add_file(self, file_key: str, nodes: List[Any]):
+        """Index a file's chunks, replacing any previous version of the file"""
+        self.remove_file(file_key)
+        with self._lock:
+            node_ids = []
+            for node in nodes:
+                # Identifiers in the path and symbol names are searchable too
+                terms = Counter(tokenize(node.get_content()))
+                symbol_terms = sorted(set(tokenize(node.metadata.get("symbols", ""))))
+                terms.update(tokenize(node.metadata.get("file_name", "")))
+                terms.update(symbol_terms)
+
+                for term, count in terms.items():
+                    self.postings.setdefault(term, {})[node.node_id] = count
+                length = sum(terms.values())
+                self.chunks[node.node_id] = {
+                    "file_path": file_key,
+                    "start": node.start_char_idx,
+                    "end": node.end_char_idx,
+                    "digest": chunk_digest(node.get_content()),
+                    "length": length,
+                    "terms": list(terms),
+                    "symbol_terms": symbol_terms,
+                    "metadata": node.metadata
+                }
+                self._total_length += length
+                node_ids.append(node.node_id)
+            self.files[file_key] = node_ids
+
+    def remove_file(self, file_key: str):
+        with self._lock:
+            for node_id in self.files.pop(file_key, []):
+                chunk = self.chunks.pop(node_id, None)
+                if chunk is None:
+                    continue
+                self._total_length -= chunk["length"]
+                for term in chunk["terms"]:
+                    postings = self.postings.get(term, {})
+                    postings.pop(node_id, None)
+                    if not postings:
+                        self.postings.pop(term, None)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """BM25 scores of the best matching chunks as (node id, score)"""
+        with self._lock:
+            self.stats["searches"] += 1
+            total = len(self.chunks)
+            if not total:
+                return []
+
+            average_length = self._total_length / total
+            scores: Dict[str, float] = {}
+            for term in set(tokenize(query)):
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                for node_id, count in postings.items():
+                    chunk = self.chunks[node_id]
+                    norm = count + self.k1 * (1 - self.b + self.b * chunk["length"] / average_length)
+                    score = idf * count * (self.k1 + 1) / norm
+                    if term in chunk.get("symbol_terms", ()):
+                        score += idf * SYMBOL_BOOST
+                    scores[node_id] = scores.get(node_id, 0.0) + score
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def get_chunk(self, node_id: str) -> Optional[Dict[str, Any]]:
+        """Chunk location and metadata with its indexed text; None once the text can no longer be recovered"""
+        chunk = self.chunks.get(node_id)
+        if chunk is None:
+            return None
+
+        text = None
+        if self.documents is not None:
+            text = self.documents.read_chars(chunk["file_path"], chunk["start"], chunk["end"])
+        if text is None:
+            try:
+                text = Path(chunk["file_path"]).read_text(encoding="utf-8", errors="ignore")[chunk["start"]:chunk["end"]]
+            except OSError:
+                return None
+        # A file edited since it was indexed no longer holds the chunk at these offsets
+        if chunk_digest(text) != chunk.get("digest"):
+            return None
+        return {"node_id": node_id, "text": text, "metadata": chunk["metadata"]}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index size and search count"""
+        with self._lock:
+            return {
+                "success": True,
+                "chunks": len(self.chunks),
+                "files": len(self.files),
+                "terms": len(self.postings),
+                **self.stats
+            }
+
+class HybridRetriever(BaseRetriever):
+    """Fuses dense and BM25 hits with reciprocal-rank fusion
+
+    Single-identifier queries that the lexical index can answer skip the dense
+    search, so they cost no query embedding. Hits are ordered by the fused rank
+    but scored with their dense similarity, so scores stay comparable with plain
+    dense retrieval; hits without one (lexical-only) are scored with their BM25
+    score relative to the query's best, in (0, 1].
+    """
+
+    def __init__(self, dense: BaseRetriever, lexical: LexicalIndex, top_k: int = 5,
+                 candidates: int = 20, rrf_k: int = 60):
+        super().__init__()
+        self.dense = dense
+        self.lexical = lexical
+        self.top_k = top_k
+        self.candidates = max(candidates, top_k)
+        self.rrf_k = rrf_k
+        self.stats = {"hybrid": 0, "identifier_fast_path": 0}
+
+    def _lexical_node(self, node_id: str) -> Optional[TextNode]:
+        chunk = self.lexical.get_chunk(node_id)
+        if chunk is None:
+            return None
+        return TextNode(id_=node_id, text=chunk["text"], metadata=chunk["metadata"])
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        lexical_hits = self.lexical.search(query_bundle.query_str, self.candidates)
+
+        if lexical_hits and IDENTIFIER_QUERY_PATTERN.fullmatch(query_bundle.query_str.strip()):
+            self.stats["identifier_fast_path"] += 1
+            best = lexical_hits[0][1]
+            results = []
+            for node_id, score in lexical_hits:
+                node = self._lexical_node(node_id)
+                if node is not None:
+                    results.append(NodeWithScore(node=node, score=score / best))
+                if len(results) == self.top_k:
+                    break
+            return results
+
+        self.stats["hybrid"] += 1
+        dense_hits = self.dense.retrieve(query_bundle)
+
+        scores: Dict[str, float] = {}
+        nodes, similarities = {}, {}
+        for rank, hit in enumerate(dense_hits):
+            scores[hit.node.node_id] = scores.get(hit.node.node_id, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+            nodes[hit.node.node_id] = hit.node
+            similarities[hit.node.node_id] = hit.score
+        for rank, (node_id, score) in enumerate(lexical_hits):
+            scores[node_id] = scores.get(node_id, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+            if similarities.get(node_id) is None:
+                similarities[node_id] = score / lexical_hits[0][1]
+
+        results = []
+        for node_id, _ in sorted(scores.items(), key=lambda item: item[1], reverse=True):
+            node = nodes.get(node_id) or self._lexical_node(node_id)
+            if node is not None:
+                results.append(NodeWithScore(node=node, score=similarities.get(node_id)))
+            if len(results) == self.top_k:
+                break
+        return results
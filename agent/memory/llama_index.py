@@ -1,37 +1,127 @@
-import os
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
 from pathlib import Path
-from typing import List, Dict, Any
-from llama_index.core import SimpleDirectoryReader, VectorStoreIndex, Document
+from typing import List, Dict, Any, Tuple, Iterable, Optional
+from llama_index.core import VectorStoreIndex, Document, StorageContext, load_index_from_storage
 from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.query_engine import RetrieverQueryEngine
+from llama_index.core.prompts.default_prompts import DEFAULT_TEXT_QA_PROMPT_TMPL
+from llama_index.core.schema import BaseNode, MetadataMode, NodeWithScore, QueryBundle
+from llama_index.core.utils import get_tokenizer
 from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 from llama_index.llms.ollama import Ollama
+from llama_index.vector_stores.qdrant import QdrantVectorStore
+from ..config import settings
+from .embedding_cache import EmbeddingCache, CachedEmbedding
+from .quantized_embedding import QuantizedEmbedding
+from .code_splitter import CodeSplitter
+from .ingest import IngestionPipeline
+from .ingest_filter import FileFilter, ChunkDeduplicator
+from .lexical_index import LexicalIndex, HybridRetriever
+from .symbol_index import SymbolIndex, extract_symbols
+from .document_index import DocumentIndex, parse_line_range
+from .context_packer import ContextPacker
+from .llm_residency import ModelResidency
+from .manifest import FileManifest, scan_files, is_indexable, file_hash
+from .watcher import CodebaseWatcher, ReadWriteLock
+from .qdrant_client import QdrantMemory
 
 class LlamaIndexMemory:
     """Memory system using LlamaIndex for codebase understanding"""
     
-    def __init__(self):
+    def __init__(self, qdrant: Optional[QdrantMemory] = None):
         self.index = None
         self.query_engine = None
+        self.qdrant = qdrant
+        self.vector_store = None
         self.embed_model = None
+        self.embed_dim = None
+        self.embedding_cache = None
+        self.node_parser = None
+        self.chunker_id = None
+        self.embedding_id = None
         self.llm = None
-        self.documents = []
+        self.residency = None
+        self.context_packer = ContextPacker(
+            max_tokens=settings.CONTEXT_MAX_TOKENS,
+            max_chunks=settings.CONTEXT_MAX_CHUNKS,
+            span_lines=settings.CONTEXT_SPAN_LINES,
+            dedup_threshold=settings.CONTEXT_DEDUP_THRESHOLD
+        )
+        self.query_metrics = deque(maxlen=settings.QUERY_METRICS_HISTORY)
+        self.manifest = FileManifest(settings.INDEX_MANIFEST_PATH)
+        self.documents = DocumentIndex(settings.DOCUMENT_STORE_DIR)
+        self.lexical = LexicalIndex(settings.LEXICAL_INDEX_PATH, self.documents)
+        self.symbols = SymbolIndex(settings.SYMBOL_INDEX_PATH)
+        self.file_filter = None
+        self.deduplicator = ChunkDeduplicator(
+            settings.DEDUP_INDEX_PATH,
+            mode=settings.INGEST_DEDUP,
+            threshold=settings.INGEST_DEDUP_THRESHOLD,
+            min_chars=settings.INGEST_DEDUP_MIN_CHARS
+        )
+        self.dedup_id = f"{settings.INGEST_DEDUP}:{settings.INGEST_DEDUP_THRESHOLD}:{settings.INGEST_DEDUP_MIN_CHARS}"
+        self.last_load_report: Dict[str, Any] = {}
+        self.paths: Dict[str, Path] = {}
+        self.watcher = None
+        
+        # Queries share the index; applying changes takes it exclusively
+        self._index_lock = ReadWriteLock()
+        self._update_lock = threading.Lock()
         
     def setup(self):
         """Initialize LlamaIndex components"""
         try:
-            # Setup embedding model
-            self.embed_model = HuggingFaceEmbedding(
-                model_name="sentence-transformers/all-MiniLM-L6-v2"
+            # Setup node parser: source files split on declarations, everything else on sentences
+            self.node_parser = CodeSplitter(
+                max_chars=settings.CODE_CHUNK_MAX_CHARS,
+                min_chars=settings.CODE_CHUNK_MIN_CHARS,
+                fallback=SentenceSplitter(
+                    chunk_size=settings.CHUNK_SIZE,
+                    chunk_overlap=settings.CHUNK_OVERLAP
+                )
+            )
+            self.chunker_id = (
+                f"code:{settings.CODE_CHUNK_MAX_CHARS}:{settings.CODE_CHUNK_MIN_CHARS}"
+                f"|sentence:{settings.CHUNK_SIZE}:{settings.CHUNK_OVERLAP}"
+            )
+            
+            # Setup embedding model; chunk embeddings are reused across restarts
+            if settings.EMBEDDING_BACKEND == "int8":
+                base_embed_model = QuantizedEmbedding(
+                    model_name=settings.EMBEDDING_MODEL,
+                    embed_batch_size=settings.EMBEDDING_BATCH_SIZE,
+                    num_threads=settings.EMBEDDING_THREADS
+                )
+                self.embedding_id = f"{settings.EMBEDDING_MODEL}|int8"
+            else:
+                base_embed_model = HuggingFaceEmbedding(
+                    model_name=settings.EMBEDDING_MODEL,
+                    embed_batch_size=settings.EMBEDDING_BATCH_SIZE
+                )
+                self.embedding_id = settings.EMBEDDING_MODEL
+            self.embedding_cache = EmbeddingCache(
+                settings.EMBEDDING_CACHE_DIR,
+                namespace=f"{self.embedding_id}|{self.chunker_id}"
             )
+            self.embedding_cache.load()
+            self.embed_model = CachedEmbedding(base_embed_model, self.embedding_cache)
+            self.embed_dim = len(self.embed_model.get_query_embedding("embedding dimension probe"))
             
             # Setup LLM
-            self.llm = Ollama(model="deepseek-coder", request_timeout=120.0)
+            self.llm = Ollama(model=settings.LLM_MODEL, request_timeout=settings.LLM_REQUEST_TIMEOUT)
             
-            # Setup node parser
-            node_parser = SentenceSplitter(
-                chunk_size=1024,
-                chunk_overlap=20
+            # Preload the model, keep it resident while queries arrive and release it when idle
+            self.residency = ModelResidency(
+                self.llm,
+                keep_alive=settings.OLLAMA_KEEP_ALIVE,
+                idle_release_seconds=settings.OLLAMA_IDLE_RELEASE_SECONDS,
+                check_seconds=settings.OLLAMA_IDLE_CHECK_SECONDS
             )
+            self.residency.start(warm_up=settings.OLLAMA_WARMUP_ENABLED)
             
             print("✅ LlamaIndex components initialized")
             return True
@@ -40,72 +130,407 @@ class LlamaIndexMemory:
             print(f"❌ Failed to setup LlamaIndex: {e}")
             return False
     
-    def load_codebase(self, paths: Dict[str, Path]) -> bool:
-        """Load and index the codebase"""
+    def _open_index(self):
+        """Open the shared Qdrant-backed index, or the persisted local index when Qdrant is not in use"""
+        if self.index is not None:
+            return
+        
+        self.manifest.load()
+        self.lexical.load()
+        self.symbols.load()
+        self.documents.load()
+        self.deduplicator.load()
+        
+        if settings.MEMORY_VECTOR_STORE == "qdrant":
+            self.vector_store = self._open_vector_store()
+        
+        if self.vector_store is not None:
+            # Chunk text and vectors live in Qdrant, so the process keeps no copy of them
+            self.index = VectorStoreIndex.from_vector_store(self.vector_store, embed_model=self.embed_model)
+            print(f"✅ Using Qdrant collection {self.qdrant.collection_name} as the vector store")
+            return
+        
+        persist_dir = settings.INDEX_PERSIST_DIR
+        if self.manifest.files and (persist_dir / "docstore.json").exists():
+            try:
+                storage_context = StorageContext.from_defaults(persist_dir=str(persist_dir))
+                self.index = load_index_from_storage(storage_context, embed_model=self.embed_model)
+                return
+            except Exception as e:
+                print(f"⚠️  Failed to load persisted index, reindexing everything: {e}")
+        
+        self.manifest.reset()
+        self.index = VectorStoreIndex(nodes=[], embed_model=self.embed_model)
+    
+    def _open_vector_store(self) -> Optional[QdrantVectorStore]:
+        """Connect to the Qdrant collection if it is ready and matches the embedding model"""
+        if self.qdrant is None or not self.qdrant.collection_exists:
+            print("⚠️  Qdrant collection unavailable, keeping the index in process")
+            return None
+        
         try:
-            all_documents = []
-            
-            for name, path in paths.items():
-                if not path.exists():
-                    print(f"⚠️  Path {path} does not exist, skipping...")
-                    continue
-                
-                print(f"📖 Loading {name} codebase from {path}")
-                
-                # Use SimpleDirectoryReader with exclusions
-                reader = SimpleDirectoryReader(
-                    input_dir=str(path),
-                    recursive=True,
-                    exclude=[
-                        ".git", "node_modules", ".dart_tool", "build",
-                        "dist", "__pycache__", ".vscode", ".idea",
-                        "*.lock", "*.log", "*.tmp"
-                    ],
-                    required_exts=[
-                        ".py", ".js", ".ts", ".dart", ".jsx", ".tsx",
-                        ".java", ".cpp", ".c", ".h", ".cs", ".go", ".rs",
-                        ".json", ".yaml", ".yml", ".md"
-                    ]
-                )
-                
-                documents = reader.load_data()
-                
-                # Add metadata to documents
-                for doc in documents:
-                    doc.metadata.update({
-                        "project": name,
-                        "file_path": str(doc.metadata.get("file_path", "")),
-                        "file_type": Path(doc.metadata.get("file_path", "")).suffix
-                    })
-                
-                all_documents.extend(documents)
-                print(f"✅ Loaded {len(documents)} documents from {name}")
+            vector_size = self.qdrant.get_vector_size()
+            if vector_size != self.embed_dim:
+                print(f"⚠️  Qdrant collection stores {vector_size}-dim vectors but {settings.EMBEDDING_MODEL} "
+                      f"produces {self.embed_dim}-dim vectors, keeping the index in process")
+                return None
             
-            self.documents = all_documents
-            print(f"📚 Total documents loaded: {len(all_documents)}")
-            
-            # Create index
-            self.index = VectorStoreIndex.from_documents(
-                all_documents,
-                embed_model=self.embed_model,
-                transformations=[node_parser]
+            return QdrantVectorStore(
+                client=self.qdrant.client,
+                collection_name=self.qdrant.collection_name
             )
             
+        except Exception as e:
+            print(f"⚠️  Failed to open Qdrant vector store, keeping the index in process: {e}")
+            return None
+    
+    def _read_files(self, files: List[Tuple[str, Path]]) -> List[Document]:
+        """Read source files into documents whose ID is the file path"""
+        documents = []
+        for project, path in files:
+            documents.append(Document(
+                id_=str(path),
+                text=path.read_text(encoding="utf-8", errors="ignore"),
+                metadata={
+                    "project": project,
+                    "file_path": str(path),
+                    "file_name": path.name,
+                    "file_type": path.suffix
+                }
+            ))
+        return documents
+    
+    def _scan(self, paths: Dict[str, Path]) -> List[Tuple[str, Path]]:
+        return list(scan_files(
+            paths,
+            extensions=settings.INDEXED_EXTENSIONS,
+            ignored_dirs=settings.IGNORED_PATTERNS,
+            ignored_files=settings.IGNORED_FILE_PATTERNS,
+            excluded_paths=[settings.AGENT_DATA_DIR]
+        ))
+    
+    def _is_indexable(self, path: Path) -> bool:
+        return is_indexable(
+            path,
+            extensions=settings.INDEXED_EXTENSIONS,
+            ignored_dirs=settings.IGNORED_PATTERNS,
+            ignored_files=settings.IGNORED_FILE_PATTERNS,
+            excluded_paths=[settings.AGENT_DATA_DIR]
+        )
+    
+    def _file_filter(self, paths: Dict[str, Path]) -> FileFilter:
+        return FileFilter(
+            paths.values(),
+            max_file_bytes=settings.INGEST_MAX_FILE_BYTES,
+            skip_generated=settings.INGEST_SKIP_GENERATED,
+            generated_patterns=settings.GENERATED_FILE_PATTERNS,
+            skip_minified=settings.INGEST_SKIP_MINIFIED,
+            minified_line_chars=settings.INGEST_MINIFIED_LINE_CHARS,
+            respect_gitignore=settings.INGEST_RESPECT_GITIGNORE
+        )
+    
+    def _project_for(self, path: Path) -> str:
+        for name, root in self.paths.items():
+            if root in path.parents:
+                return name
+        return "unknown"
+    
+    def _apply_changes(self, to_index: List[Tuple[str, Path]], stale: List[str]) -> Tuple[int, int, Dict[str, Any]]:
+        """Re-index new/changed files and drop stale ones; returns (chunks inserted, chunks deleted, ingest stats)"""
+        # Files whose duplicate chunks were left out in favour of a changed or removed file need their own copies back
+        queued = {str(path) for _, path in to_index}
+        dependents = self.manifest.dependents(stale)
+        while dependents:
+            file_key = dependents.pop()
+            if file_key in queued or file_key in stale or not Path(file_key).is_file():
+                continue
+            queued.add(file_key)
+            to_index.append((self.manifest.files[file_key]["project"], Path(file_key)))
+            stale.append(file_key)
+            dependents.extend(self.manifest.dependents([file_key]))
+        
+        replaced = {str(path) for _, path in to_index}
+        deleted = {"chunks": 0}
+        duplicates_before = self.deduplicator.stats["duplicates"]
+        
+        with self._index_lock.write():
+            for file_key in stale:
+                if file_key not in replaced:
+                    deleted["chunks"] += len(self.manifest.remove(file_key))
+                    self.index.delete_ref_doc(file_key, delete_from_docstore=True)
+                    self.lexical.remove_file(file_key)
+                    self.symbols.remove_file(file_key)
+                    self.documents.remove_file(file_key)
+                    self.deduplicator.remove_file(file_key)
+        
+        # Symbols are extracted by the reader threads, which already hold the file text
+        extracted = {}
+        
+        def read(project: str, path: Path) -> List[BaseNode]:
+            documents = self._read_files([(project, path)])
+            nodes = self.node_parser.get_nodes_from_documents(documents)
+            # Chunks already indexed from another file (platform copies, vendored code) are not embedded again
+            self.deduplicator.remove_file(str(path))
+            nodes, originals = self.deduplicator.deduplicate(str(path), nodes)
+            extracted[str(path)] = (extract_symbols(str(path), documents[0].text, project), documents[0].text, originals)
+            return nodes
+        
+        def insert(batch):
+            # Each batch swaps whole files, so queries never see half of a file's chunks
+            with self._index_lock.write():
+                for project, path, nodes in batch:
+                    file_key = str(path)
+                    # Another worker may already have inserted this file; replacing keeps the collection free of duplicates
+                    if file_key in stale or self.vector_store is not None:
+                        deleted["chunks"] += len(self.manifest.remove(file_key))
+                        self.index.delete_ref_doc(file_key, delete_from_docstore=True)
+                    if nodes:
+                        self.index.insert_nodes(nodes)
+                    self.lexical.add_file(file_key, nodes)
+                    symbols, text, originals = extracted.pop(file_key, ([], "", []))
+                    self.symbols.add_file(file_key, symbols)
+                    self.documents.add_file(file_key, text, project)
+                    self.manifest.record(project, path, [node.node_id for node in nodes], duplicate_of=originals)
+        
+        pipeline = IngestionPipeline(
+            read=read,
+            embed=self.embed_model.get_text_embedding_batch,
+            insert=insert,
+            read_workers=settings.INGEST_READ_WORKERS,
+            embed_workers=settings.INGEST_EMBED_WORKERS,
+            batch_size=settings.INGEST_BATCH_SIZE,
+            queue_size=settings.INGEST_QUEUE_SIZE
+        )
+        try:
+            ingest_stats = pipeline.run(to_index)
+        finally:
+            # Keep what was inserted before a failure so the next load resumes from there
+            with self._index_lock.write():
+                if (to_index or stale) and self.vector_store is None:
+                    self.index.storage_context.persist(persist_dir=str(settings.INDEX_PERSIST_DIR))
+                self.lexical.save()
+                self.symbols.save()
+                self.documents.save()
+                self.deduplicator.save()
+                self.manifest.save()
+        
+        ingest_stats["duplicate_chunks"] = self.deduplicator.stats["duplicates"] - duplicates_before
+        return ingest_stats["chunks"], deleted["chunks"], ingest_stats
+    
+    def _retriever(self, top_k: int):
+        """Dense retriever, fused with BM25 over the same chunks when hybrid retrieval is enabled"""
+        if not settings.HYBRID_RETRIEVAL_ENABLED:
+            return self.index.as_retriever(similarity_top_k=top_k)
+        
+        return HybridRetriever(
+            dense=self.index.as_retriever(similarity_top_k=max(top_k, settings.HYBRID_CANDIDATES)),
+            lexical=self.lexical,
+            top_k=top_k,
+            candidates=settings.HYBRID_CANDIDATES,
+            rrf_k=settings.HYBRID_RRF_K
+        )
+    
+    def _query_engine(self) -> RetrieverQueryEngine:
+        """Query engine whose wider candidate set is packed into the context budget when enabled"""
+        if not settings.CONTEXT_PACKING_ENABLED:
+            return RetrieverQueryEngine.from_args(self._retriever(5), llm=self.llm)
+        
+        return RetrieverQueryEngine.from_args(
+            self._retriever(settings.CONTEXT_CANDIDATES),
+            llm=self.llm,
+            node_postprocessors=[self.context_packer]
+        )
+    
+    def _shared_update(self):
+        """Serialize index updates across workers sharing the Qdrant collection"""
+        if self.vector_store is None:
+            return nullcontext()
+        return self.manifest.lock()
+    
+    def _sync_manifest(self):
+        """Re-read the manifest other workers may have updated; an empty collection invalidates it"""
+        self.manifest.load()
+        self.lexical.load()
+        self.symbols.load()
+        self.documents.load()
+        self.deduplicator.load()
+        if not self.qdrant.count():
+            self.manifest.reset()
+    
+    def load_codebase(self, paths: Dict[str, Path]) -> bool:
+        """Load and index the codebase, only re-indexing files that changed since the last load"""
+        try:
+            with self._update_lock:
+                started = time.perf_counter()
+                self.paths = paths
+                self._open_index()
+                
+                with self._shared_update():
+                    if self.vector_store is not None:
+                        self._sync_manifest()
+                    
+                    # Oversized, generated, minified and git-ignored files are left out (and dropped if indexed before)
+                    self.file_filter = self._file_filter(paths)
+                    files, skipped = self.file_filter.filter(self._scan(paths))
+                    changes = self.manifest.diff(files)
+                    if (self.manifest.meta.get("chunker") != self.chunker_id
+                            or self.manifest.meta.get("embedding") != self.embedding_id
+                            or self.manifest.meta.get("dedup") != self.dedup_id
+                            or set(self.lexical.files) != set(self.manifest.files)
+                            or set(self.symbols.files) != set(self.manifest.files)
+                            or set(self.documents.files) != set(self.manifest.files)):
+                        # Chunking, embedding or dedup settings changed (or the lexical, symbol or document index is
+                        # out of step), so every indexed file has to be re-chunked; cached embeddings are reused
+                        changes["changed"] += changes["unchanged"]
+                        changes["unchanged"] = []
+                        self.deduplicator.reset()
+                        self.manifest.meta["chunker"] = self.chunker_id
+                        self.manifest.meta["embedding"] = self.embedding_id
+                        self.manifest.meta["dedup"] = self.dedup_id
+                    print(f"📖 {len(files)} files: {len(changes['added'])} new, {len(changes['changed'])} changed, "
+                          f"{len(changes['removed'])} removed, {len(changes['unchanged'])} unchanged")
+                    
+                    # Only new or changed files are read, chunked, embedded and inserted
+                    to_index = changes["added"] + changes["changed"]
+                    stale = changes["removed"] + [str(path) for _, path in changes["changed"]]
+                    chunks_inserted, chunks_deleted, ingest_stats = self._apply_changes(to_index, stale)
+                    
+                    elapsed = time.perf_counter() - started
+                    if to_index:
+                        self.manifest.meta["seconds_per_file"] = elapsed / len(to_index)
+                    if ingest_stats["chunks"]:
+                        self.manifest.meta["seconds_per_chunk"] = (
+                            ingest_stats["embed_seconds"] + ingest_stats["insert_seconds"]
+                        ) / ingest_stats["chunks"]
+                    if to_index:
+                        self.manifest.save()
+                    seconds_saved = len(changes["unchanged"]) * self.manifest.meta.get("seconds_per_file", 0.0)
+                    # What indexing the skipped files and duplicate chunks would have cost at this run's rates
+                    filter_seconds_saved = (
+                        skipped["files"] * self.manifest.meta.get("seconds_per_file", 0.0)
+                        + ingest_stats.get("duplicate_chunks", 0) * self.manifest.meta.get("seconds_per_chunk", 0.0)
+                    )
+            
             # Create query engine
-            self.query_engine = self.index.as_query_engine(
-                llm=self.llm,
-                similarity_top_k=5
-            )
+            self.query_engine = self._query_engine()
             
-            print("✅ Codebase indexed successfully")
+            cache_stats = self.embedding_cache.get_stats()
+            self.last_load_report = {
+                "files_total": len(files),
+                "files_added": len(changes["added"]),
+                "files_changed": len(changes["changed"]),
+                "files_removed": len(changes["removed"]),
+                "files_unchanged": len(changes["unchanged"]),
+                "chunks_inserted": chunks_inserted,
+                "chunks_deleted": chunks_deleted,
+                "ingest": ingest_stats,
+                "embeddings_cached": cache_stats["hits"],
+                "embeddings_computed": cache_stats["misses"],
+                "elapsed_seconds": round(elapsed, 3),
+                "estimated_seconds_saved": round(seconds_saved, 3),
+                "skipped": {
+                    **skipped,
+                    "duplicate_chunks": ingest_stats.get("duplicate_chunks", 0),
+                    "estimated_seconds_saved": round(filter_seconds_saved, 3)
+                }
+            }
+            if skipped["files"] or ingest_stats.get("duplicate_chunks"):
+                reasons = ", ".join(f"{count} {reason}" for reason, count in sorted(skipped["reasons"].items()))
+                print(f"🚫 Skipped {skipped['files']} files ({reasons or 'none'}) and "
+                      f"{ingest_stats.get('duplicate_chunks', 0)} duplicate chunks, ~{filter_seconds_saved:.1f}s saved")
+            print(f"✅ Codebase indexed successfully ({chunks_inserted} chunks inserted, "
+                  f"{chunks_deleted} deleted, ~{seconds_saved:.1f}s saved)")
             return True
             
         except Exception as e:
             print(f"❌ Failed to load codebase: {e}")
             return False
     
-    def query(self, question: str) -> Dict[str, Any]:
-        """Query the codebase for information"""
+    def update_files(self, file_paths: Iterable[str]) -> Dict[str, Any]:
+        """Incrementally re-index a batch of changed paths (used by the watcher)"""
+        try:
+            if self.index is None:
+                return {"success": False, "error": "Index not initialized"}
+            
+            with self._update_lock, self._shared_update():
+                started = time.perf_counter()
+                to_index, stale, removed, skipped = [], [], [], []
+                if self.vector_store is not None:
+                    self._sync_manifest()
+                
+                for file_path in file_paths:
+                    path = Path(file_path)
+                    entry = self.manifest.files.get(str(path))
+                    if path.is_file() and self.file_filter and self.file_filter.check(path):
+                        # The file now falls under an ingestion policy, so it is dropped like a deleted one
+                        skipped.append(str(path))
+                        if entry:
+                            stale.append(str(path))
+                            removed.append(str(path))
+                    elif path.is_file():
+                        if entry and entry["hash"] == file_hash(path):
+                            continue
+                        if entry:
+                            stale.append(str(path))
+                        to_index.append((self._project_for(path), path))
+                    elif entry:
+                        stale.append(str(path))
+                        removed.append(str(path))
+                
+                chunks_inserted, chunks_deleted, ingest_stats = self._apply_changes(to_index, stale)
+            
+            report = {
+                "success": True,
+                "files_indexed": len(to_index),
+                "files_removed": len(removed),
+                "files_skipped": len(skipped),
+                "chunks_inserted": chunks_inserted,
+                "chunks_deleted": chunks_deleted,
+                "ingest": ingest_stats,
+                "elapsed_seconds": round(time.perf_counter() - started, 3)
+            }
+            if to_index or stale:
+                print(f"🔄 Re-indexed {len(to_index)} changed files ({chunks_inserted} chunks)")
+            return report
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def start_watcher(self) -> bool:
+        """Keep the index up to date with edits in the background"""
+        if self.watcher or not self.paths:
+            return False
+        
+        self.watcher = CodebaseWatcher(
+            self.paths,
+            on_batch=self.update_files,
+            is_indexable=self._is_indexable,
+            list_files=lambda: [path for _, path in self._scan(self.paths)],
+            debounce_seconds=settings.MEMORY_WATCH_DEBOUNCE_SECONDS,
+            poll_seconds=settings.MEMORY_WATCH_POLL_SECONDS
+        )
+        self.watcher.start()
+        return True
+    
+    def stop_watcher(self):
+        """Stop the background watcher"""
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
+    
+    def get_llm_stats(self) -> Dict[str, Any]:
+        """Get model residency and cold/warm LLM call latency"""
+        if not self.residency:
+            return {"success": False, "error": "LLM not initialized"}
+        return self.residency.get_stats()
+    
+    def query(self, question: str, generate: Optional[bool] = None) -> Dict[str, Any]:
+        """Query the codebase for information
+        
+        generate=True always asks the LLM, generate=False returns the retrieved
+        snippets only (for callers that just need grounding), and the default
+        skips the LLM when the best retrieval score clears the configured threshold.
+        """
         try:
             if not self.query_engine:
                 return {
@@ -113,14 +538,51 @@ class LlamaIndexMemory:
                     "error": "Query engine not initialized"
                 }
             
-            response = self.query_engine.query(question)
+            started = time.perf_counter()
+            query_bundle = QueryBundle(question)
+            with self._index_lock.read():
+                nodes = self.query_engine.retrieve(query_bundle)
+                top_score = max((node.score for node in nodes if node.score is not None), default=None)
+                if generate is None:
+                    generate = not (
+                        settings.RETRIEVAL_ONLY_ENABLED and top_score is not None
+                        and top_score >= settings.RETRIEVAL_ONLY_SCORE_THRESHOLD
+                    )
+                if generate:
+                    with self.residency.call():
+                        answer = str(self.query_engine.synthesize(query_bundle, nodes))
+                else:
+                    snippets = self._snippets(nodes, question)
+                    answer = "\n\n".join(f"{snippet['location']}\n{snippet['text']}" for snippet in snippets)
+            latency = time.perf_counter() - started
             
-            return {
+            # Size of what was (or would have been) sent: the chunks that survived packing plus the QA template
+            context = "\n\n".join(node.node.get_content(metadata_mode=MetadataMode.LLM) for node in nodes)
+            context_tokens = self.context_packer.count_tokens(context)
+            metrics = {
+                **(self.context_packer.last_stats if settings.CONTEXT_PACKING_ENABLED else {}),
+                "chunks": len(nodes),
+                "context_tokens": context_tokens,
+                "prompt_tokens": context_tokens + self.context_packer.count_tokens(
+                    DEFAULT_TEXT_QA_PROMPT_TMPL.format(context_str="", query_str=question)
+                ) if generate else 0,
+                "top_score": round(top_score, 4) if top_score is not None else None,
+                "generated": generate,
+                "latency_seconds": round(latency, 3)
+            }
+            self.query_metrics.append(metrics)
+            
+            result = {
                 "success": True,
-                "answer": str(response),
-                "sources": [node.metadata for node in response.source_nodes],
-                "question": question
+                "answer": answer,
+                "sources": [node.metadata for node in nodes],
+                "question": question,
+                "generated": generate,
+                "context": metrics
             }
+            if not generate:
+                result["snippets"] = snippets
+            return result
             
         except Exception as e:
             return {
@@ -129,6 +591,54 @@ class LlamaIndexMemory:
                 "question": question
             }
     
+    def _snippets(self, nodes: List[NodeWithScore], question: str) -> List[Dict[str, Any]]:
+        """Retrieved chunks as located snippets, standing in for a generated answer"""
+        snippets = []
+        for node in nodes[:settings.RETRIEVAL_ONLY_MAX_SNIPPETS]:
+            metadata = node.node.metadata
+            location = metadata.get("file_path", node.node.node_id)
+            if metadata.get("start_line"):
+                location += f":{metadata['start_line']}-{metadata.get('end_line', metadata['start_line'])}"
+            snippets.append({
+                "location": location,
+                "score": node.score,
+                "text": self.context_packer.snippet(node.node.get_content(), question)
+            })
+        return snippets
+    
+    def get_query_stats(self) -> Dict[str, Any]:
+        """Get prompt size and latency over the recent queries"""
+        metrics = list(self.query_metrics)
+        if not metrics:
+            return {"success": True, "queries": 0}
+        
+        def summary(key: str, rows: List[Dict[str, Any]]) -> Dict[str, float]:
+            values = sorted(row[key] for row in rows)
+            if not values:
+                return {}
+            return {
+                "mean": round(statistics.mean(values), 3),
+                "p50": values[len(values) // 2],
+                "p95": values[int(0.95 * (len(values) - 1))]
+            }
+        
+        llm_avoided = sum(1 for metric in metrics if not metric["generated"])
+        return {
+            "success": True,
+            "queries": len(metrics),
+            "llm_avoided": llm_avoided,
+            "llm_avoided_rate": round(llm_avoided / len(metrics), 4),
+            "chunks": summary("chunks", metrics),
+            "prompt_tokens": summary("prompt_tokens", [metric for metric in metrics if metric["generated"]]),
+            "latency_seconds": summary("latency_seconds", metrics)
+        }
+    
+    def query_structure(self, question: str) -> Optional[Dict[str, Any]]:
+        """Answer structural questions (routes, model fields, screens, ...) from the symbol index; None otherwise"""
+        if not settings.SYMBOL_INDEX_ENABLED or not self.symbols.files:
+            return None
+        return self.symbols.answer(question)
+    
     def search_similar_code(self, code_snippet: str, limit: int = 5) -> Dict[str, Any]:
         """Search for similar code patterns"""
         try:
@@ -142,8 +652,9 @@ class LlamaIndexMemory:
             doc = Document(text=code_snippet, metadata={"query_type": "similarity_search"})
             
             # Query for similar documents
-            retriever = self.index.as_retriever(similarity_top_k=limit)
-            nodes = retriever.retrieve(code_snippet)
+            retriever = self._retriever(limit)
+            with self._index_lock.read():
+                nodes = retriever.retrieve(code_snippet)
             
             results = []
             for node in nodes:
@@ -168,51 +679,97 @@ class LlamaIndexMemory:
     
     def get_project_summary(self) -> Dict[str, Any]:
         """Get a summary of the loaded project"""
-        if not self.documents:
+        if not self.documents.files:
             return {"success": False, "error": "No documents loaded"}
         
-        # Analyze documents
-        file_types = {}
-        projects = {}
-        
-        for doc in self.documents:
-            file_type = doc.metadata.get("file_type", "unknown")
-            project = doc.metadata.get("project", "unknown")
-            
-            file_types[file_type] = file_types.get(file_type, 0) + 1
-            projects[project] = projects.get(project, 0) + 1
-        
+        # Counts are kept up to date by the document store as files are indexed
+        stats = self.documents.get_stats()
         return {
             "success": True,
-            "total_documents": len(self.documents),
-            "file_types": file_types,
-            "projects": projects,
-            "indexed": self.index is not None
+            "total_documents": stats["files"],
+            "total_bytes": stats["bytes"],
+            "total_lines": stats["lines"],
+            "file_types": stats["file_types"],
+            "projects": stats["projects"],
+            "indexed": self.index is not None,
+            "last_load": self.last_load_report
         }
     
+    def _average_chunk_chars(self) -> float:
+        spans = [chunk["end"] - chunk["start"] for chunk in self.lexical.chunks.values()
+                 if chunk["start"] is not None and chunk["end"] is not None]
+        return sum(spans) / len(spans) if spans else float(settings.CODE_CHUNK_MAX_CHARS)
+    
     def explain_code(self, file_path: str, line_range: str = None) -> Dict[str, Any]:
-        """Explain code from a specific file"""
+        """Explain code from a specific file, sending exactly that file or line range to the LLM
+
+        Retrieval is skipped; the report compares the prompt with the retrieval path's top-5 chunks.
+        """
         try:
-            # Find documents for the specific file
-            file_docs = [
-                doc for doc in self.documents 
-                if file_path in doc.metadata.get("file_path", "")
-            ]
+            file_paths = self.documents.resolve(file_path)
             
-            if not file_docs:
+            if not file_paths:
                 return {
                     "success": False,
                     "error": f"No documents found for file: {file_path}"
                 }
             
-            # Create context from file documents
-            context = "\n".join([doc.text for doc in file_docs])
+            start_line, end_line = parse_line_range(line_range)
+            sections = [
+                self.documents.read(path, start_line, end_line)
+                for path in file_paths[:settings.EXPLAIN_MAX_FILES]
+            ]
+            
+            # Keep the context within the model's budget, cutting whole lines off the end
+            tokenizer = get_tokenizer()
+            context_tokens = len(tokenizer("".join(section["text"] for section in sections)))
+            truncated = context_tokens > settings.EXPLAIN_CONTEXT_MAX_TOKENS
+            if truncated:
+                budget = int(sum(len(section["text"]) for section in sections)
+                             * settings.EXPLAIN_CONTEXT_MAX_TOKENS / context_tokens)
+                for section in sections:
+                    text = section["text"][:max(budget, 0)]
+                    if len(text) < len(section["text"]):
+                        text = text[:text.rfind("\n") + 1]
+                        section["end_line"] = section["start_line"] + text.count("\n") - 1
+                    section["text"] = text
+                    budget -= len(text)
+                sections = [section for section in sections if section["text"]]
+            context = "\n\n".join(
+                f"File: {section['file_path']} (lines {section['start_line']}-{section['end_line']} "
+                f"of {section['total_lines']})\n{section['text']}"
+                for section in sections
+            )
             
             question = f"Explain the code in {file_path}"
             if line_range:
-                question += f", specifically around lines {line_range}"
+                question += f", specifically lines {line_range}"
+            prompt = (
+                f"{question}. Describe what it does, how it fits into the Axiom platform "
+                f"and anything notable about it.\n\n{context}"
+            )
+            with self.residency.call():
+                response = self.llm.complete(prompt)
+            
+            # What the generic query path would have sent: the top-5 retrieved chunks
+            prompt_tokens = len(tokenizer(prompt))
+            chars_per_token = len(prompt) / prompt_tokens if prompt_tokens else 4.0
+            retrieval_prompt_tokens = int(5 * self._average_chunk_chars() / chars_per_token)
             
-            return self.query(question)
+            return {
+                "success": True,
+                "answer": str(response),
+                "sources": [
+                    {"file_path": section["file_path"], "start_line": section["start_line"], "end_line": section["end_line"]}
+                    for section in sections
+                ],
+                "question": question,
+                "file_path": file_path,
+                "truncated": truncated,
+                "prompt_tokens": prompt_tokens,
+                "retrieval_prompt_tokens_estimate": retrieval_prompt_tokens,
+                "prompt_tokens_saved": retrieval_prompt_tokens - prompt_tokens
+            }
             
         except Exception as e:
             return {
@@ -0,0 +1,161 @@
+import re
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Union
+from llama_index.llms.ollama import Ollama
+
+KEEP_ALIVE_PATTERN = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*$")
+KEEP_ALIVE_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}
+
+def keep_alive_seconds(keep_alive: Union[str, float, None]) -> Optional[float]:
+    """Ollama keep_alive ('30m', '1h', 300, -1) in seconds; None when the model never expires"""
+    if keep_alive is None:
+        return 300.0  # Ollama's own default
+    match = KEEP_ALIVE_PATTERN.match(str(keep_alive))
+    if not match:
+        raise ValueError(f"Unsupported keep_alive value: {keep_alive!r}")
+    seconds = float(match.group(1)) * KEEP_ALIVE_UNITS[match.group(2)]
+    return None if seconds < 0 else seconds
+
+class ModelResidency:
+    """Keeps the Ollama model loaded while the agent is busy and releases it when quiet
+
+    Every request carries the keep_alive hint, so Ollama holds the model that long
+    after the last call even if this process goes away. warm_up() loads it before
+    the first query, and the idle policy unloads it (keep_alive=0) once no call
+    has been made for idle_release_seconds. Calls are timed as cold or warm
+    depending on whether the model was expected to be resident.
+    """
+
+    def __init__(self, llm: Ollama, keep_alive: Union[str, float] = "30m", idle_release_seconds: float = 0,
+                 check_seconds: float = 30.0, history: int = 200):
+        self.llm = llm
+        self.llm.keep_alive = keep_alive
+        self.keep_alive_seconds = keep_alive_seconds(keep_alive)
+        self.idle_release_seconds = idle_release_seconds
+        self.check_seconds = check_seconds
+
+        self._resident = False
+        self._active = 0
+        self._last_used = time.monotonic()
+        self._latencies = {"cold": deque(maxlen=history), "warm": deque(maxlen=history)}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.stats = {"warmups": 0, "warmup_failures": 0, "releases": 0, "warmup_seconds": None}
+
+    def _is_resident(self, now: float) -> bool:
+        if not self._resident:
+            return False
+        return self.keep_alive_seconds is None or now - self._last_used < self.keep_alive_seconds
+
+    def _load(self, keep_alive: Union[str, float]):
+        # An empty prompt makes Ollama load (or, with keep_alive=0, unload) the model without generating
+        self.llm.client.generate(model=self.llm.model, prompt="", keep_alive=keep_alive)
+
+    def warm_up(self) -> bool:
+        """Load the model ahead of the first call"""
+        started = time.perf_counter()
+        try:
+            self._load(self.llm.keep_alive)
+        except Exception as e:
+            self.stats["warmup_failures"] += 1
+            print(f"⚠️  Failed to preload {self.llm.model}: {e}")
+            return False
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._resident = True
+            self._last_used = time.monotonic()
+            self.stats["warmups"] += 1
+            self.stats["warmup_seconds"] = round(elapsed, 3)
+        print(f"🔥 {self.llm.model} loaded in {elapsed:.1f}s (keep_alive={self.llm.keep_alive})")
+        return True
+
+    def release(self) -> bool:
+        """Unload the model from Ollama"""
+        try:
+            self._load(0)
+        except Exception as e:
+            print(f"⚠️  Failed to release {self.llm.model}: {e}")
+            return False
+
+        with self._lock:
+            self._resident = False
+            self.stats["releases"] += 1
+        print(f"💤 Released {self.llm.model} after {self.idle_release_seconds:.0f}s idle")
+        return True
+
+    @contextmanager
+    def call(self):
+        """Time an LLM call as cold or warm; failed calls are not recorded"""
+        with self._lock:
+            kind = "warm" if self._is_resident(time.monotonic()) else "cold"
+            self._active += 1
+
+        started = time.perf_counter()
+        try:
+            yield kind
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._latencies[kind].append(elapsed)
+                self._resident = True
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._last_used = time.monotonic()
+
+    def start(self, warm_up: bool = True):
+        """Preload the model and enforce the idle policy in a background thread"""
+        if self._thread or (not warm_up and self.idle_release_seconds <= 0):
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, args=(warm_up,), name="llm-residency", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread"""
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, warm_up: bool):
+        if warm_up:
+            self.warm_up()
+        if self.idle_release_seconds <= 0:
+            return
+
+        while not self._stopped.wait(self.check_seconds):
+            with self._lock:
+                idle = not self._active and self._resident and \
+                    time.monotonic() - self._last_used >= self.idle_release_seconds
+            if idle:
+                self.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get residency state and cold/warm call latency"""
+        with self._lock:
+            now = time.monotonic()
+            latencies = {kind: sorted(values) for kind, values in self._latencies.items()}
+            stats = {
+                "success": True,
+                "model": self.llm.model,
+                "keep_alive": self.llm.keep_alive,
+                "idle_release_seconds": self.idle_release_seconds,
+                "resident": self._is_resident(now),
+                "idle_seconds": round(now - self._last_used, 1),
+                **self.stats
+            }
+
+        for kind, values in latencies.items():
+            stats[f"{kind}_calls"] = len(values)
+            stats[f"{kind}_latency_seconds"] = {
+                "mean": round(statistics.mean(values), 3),
+                "p50": round(values[len(values) // 2], 3),
+                "p95": round(values[int(0.95 * (len(values) - 1))], 3)
+            } if values else {}
+        return stats
@@ -0,0 +1,524 @@
+import json
+import os
+import shutil
+import threading
+import time
+from itertools import islice
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator, Union
+
+import numpy as np
+
+from .qdrant_client import INDEXED_PAYLOAD_FIELDS, merge_filter, point_id
+
+class LocalVectorMemory:
+    """In-process drop-in for QdrantMemory, for single-node and offline deployments
+
+    Vectors are kept L2-normalized in one contiguous float32 matrix (optionally
+    memory-mapped from disk), so cosine search is a single matrix-vector product.
+    Collections larger than approximate_threshold also get an inverted-file index
+    (spherical k-means lists) and only the nprobe closest lists are scored.
+    On disk, an upsert writes its vectors in place or at the end of vectors.bin
+    and appends its points to points.jsonl; in memory, the matrix, payload
+    columns and list assignments grow geometrically. Either way an upsert costs
+    time proportional to its own size, not to the collection.
+    """
+
+    def __init__(self, data_dir: Path, collection_name: str = "axiom_codebase", vector_size: int = 384,
+                 mmap: bool = False, approximate_threshold: int = 20000, nprobe: int = 16):
+        self.collection_dir = Path(data_dir) / collection_name
+        self.collection_name = collection_name
+        self.vector_size = vector_size
+        self.mmap = mmap
+        self.approximate_threshold = approximate_threshold
+        self.nprobe = nprobe
+        self.collection_exists = False
+
+        self._vectors = np.zeros((0, vector_size), dtype=np.float32)
+        self._matrix = self._vectors
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._payloads: List[Dict[str, Any]] = []
+        # Column per indexed payload field, so filters are vectorized like Qdrant's payload indexes
+        self._fields: Dict[str, np.ndarray] = {}
+        self._columns: Dict[str, np.ndarray] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._trained_points = 0
+        self._assignment: Optional[np.ndarray] = None
+        self._order: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._log_records = 0
+        self._lock = threading.RLock()
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.collection_dir / "vectors.bin"
+
+    @property
+    def _points_path(self) -> Path:
+        return self.collection_dir / "points.jsonl"
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.collection_dir / "collection.json"
+
+    def setup(self) -> bool:
+        """Load the collection from disk, creating it if needed"""
+        try:
+            with self._lock:
+                if self._meta_path.exists():
+                    vector_size = json.loads(self._meta_path.read_text())["vector_size"]
+                    if vector_size != self.vector_size:
+                        print(f"❌ Local collection {self.collection_name} stores {vector_size}-dim vectors, "
+                              f"but the embedding model produces {self.vector_size}-dim vectors")
+                        return False
+
+                    self._read()
+                    print(f"✅ Local collection loaded: {self.collection_name} ({len(self._ids)} points)")
+                else:
+                    self._create()
+                    self._load(np.zeros((0, self.vector_size), dtype=np.float32), [], [])
+                    print(f"✅ Created local collection: {self.collection_name}")
+
+                self.collection_exists = True
+                return True
+
+        except Exception as e:
+            print(f"❌ Failed to setup local vector store: {e}")
+            return False
+
+    def _create(self):
+        self.collection_dir.mkdir(parents=True, exist_ok=True)
+        self._vectors_path.write_bytes(b"")
+        self._points_path.write_bytes(b"")
+        self._meta_path.write_text(json.dumps({"vector_size": self.vector_size}))
+        self._log_records = 0
+
+    def _read(self):
+        ids, payloads, records, valid_bytes = [], [], 0, 0
+        with open(self._points_path, "rb") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line) if line.endswith(b"\n") else None
+                except ValueError:
+                    record = None
+                if record is None:
+                    break
+                if record["row"] == len(ids):
+                    ids.append(record["id"])
+                    payloads.append(record["payload"])
+                else:
+                    payloads[record["row"]] = record["payload"]
+                records += 1
+                valid_bytes += len(line)
+
+        # A torn last record (interrupted write) is dropped so later appends start on a clean line
+        if valid_bytes < self._points_path.stat().st_size:
+            os.truncate(self._points_path, valid_bytes)
+        self._log_records = records
+        self._load(self._map_vectors(len(ids)), ids, payloads)
+
+    def _map_vectors(self, rows: int) -> np.ndarray:
+        # Rows past the points log are left over from an interrupted write and are ignored
+        if not rows:
+            return np.zeros((0, self.vector_size), dtype=np.float32)
+        if self.mmap:
+            return np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(rows, self.vector_size))
+        return np.fromfile(self._vectors_path, dtype=np.float32, count=rows * self.vector_size).reshape(rows, self.vector_size)
+
+    def _load(self, vectors: np.ndarray, ids: List[str], payloads: List[Dict[str, Any]]):
+        self._vectors = self._matrix = vectors
+        self._ids = ids
+        self._rows = {point: row for row, point in enumerate(ids)}
+        self._payloads = payloads
+        self._columns = {
+            field: np.array([payload.get(field, "") for payload in payloads], dtype=object)
+            for field in INDEXED_PAYLOAD_FIELDS
+        }
+        self._fields = dict(self._columns)
+        self._centroids = self._assignment = self._order = self._offsets = None
+        self._update_approximate_index()
+
+    @staticmethod
+    def _reserve(array: np.ndarray, rows: int) -> np.ndarray:
+        """array with room for at least rows rows, doubling its capacity when it has to grow"""
+        if len(array) >= rows:
+            return array
+        grown = np.empty((max(rows, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    def _apply(self, rows: np.ndarray, vectors: np.ndarray, ids: List[str], payloads: List[Dict[str, Any]]):
+        """Bring the in-memory collection in step with rows that _persist has written"""
+        for row, point, payload in zip(rows, ids, payloads):
+            if row == len(self._ids):
+                self._rows[point] = len(self._ids)
+                self._ids.append(point)
+                self._payloads.append(payload)
+            else:
+                self._payloads[row] = payload
+        points = len(self._ids)
+
+        if self.mmap:
+            # The file already holds the rows; remapping only changes the mapped length
+            self._vectors = self._map_vectors(points)
+        else:
+            self._matrix = self._reserve(self._matrix, points)
+            self._matrix[rows] = vectors
+            self._vectors = self._matrix[:points]
+
+        for field in INDEXED_PAYLOAD_FIELDS:
+            column = self._columns[field] = self._reserve(self._columns[field], points)
+            column[rows] = [payload.get(field, "") for payload in payloads]
+            self._fields[field] = column[:points]
+
+        self._update_approximate_index(rows)
+
+    def _persist(self, rows: np.ndarray, vectors: np.ndarray, ids: List[str], payloads: List[Dict[str, Any]]):
+        """Write only the changed rows: vectors in place or appended, points appended to the log
+
+        Vectors go first, so the log never names a row whose vector is missing.
+        """
+        row_bytes = self.vector_size * 4
+        appended = rows >= len(self._ids)
+        with open(self._vectors_path, "r+b") as handle:
+            for row, vector in zip(rows[~appended], vectors[~appended]):
+                handle.seek(int(row) * row_bytes)
+                handle.write(vector.tobytes())
+            # New rows are numbered from the end of the collection, so they form one contiguous block
+            order = np.argsort(rows[appended])
+            handle.seek(len(self._ids) * row_bytes)
+            handle.write(np.ascontiguousarray(vectors[appended][order]).tobytes())
+
+        with open(self._points_path, "ab") as handle:
+            handle.write("".join(
+                json.dumps({"row": int(row), "id": point, "payload": payload}) + "\n"
+                for row, point, payload in zip(rows, ids, payloads)
+            ).encode("utf-8"))
+        self._log_records += len(rows)
+
+    def _compact_log(self):
+        """Rewrite the points log with one record per point once re-upserts dominate it"""
+        tmp_points = self._points_path.with_suffix(".tmp")
+        tmp_points.write_text("".join(
+            json.dumps({"row": row, "id": point, "payload": payload}) + "\n"
+            for row, (point, payload) in enumerate(zip(self._ids, self._payloads))
+        ))
+        os.replace(tmp_points, self._points_path)
+        self._log_records = len(self._ids)
+
+    def add_embeddings(self, embeddings: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Upsert embeddings; point IDs derive from file path and text, so repeated adds are idempotent"""
+        try:
+            started = time.perf_counter()
+            points = {}
+            for item in embeddings:
+                file_path = item.get("file_path", "")
+                points[point_id(file_path, item["text"])] = (item["embedding"], {
+                    "text": item["text"],
+                    "file_path": file_path,
+                    "project": item.get("project", ""),
+                    "file_type": item.get("file_type", ""),
+                    "metadata": item.get("metadata", {})
+                })
+
+            with self._lock:
+                vectors = np.asarray([vector for vector, _ in points.values()], dtype=np.float32).reshape(-1, self.vector_size)
+                norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                vectors /= np.where(norms == 0, 1, norms)
+
+                # New points are numbered from the end of the collection
+                rows, next_row = [], len(self._ids)
+                for point in points:
+                    if point in self._rows:
+                        rows.append(self._rows[point])
+                    else:
+                        rows.append(next_row)
+                        next_row += 1
+                rows = np.array(rows, dtype=np.int64)
+                payloads = [payload for _, payload in points.values()]
+
+                self._persist(rows, vectors, list(points), payloads)
+                self._apply(rows, vectors, list(points), payloads)
+                if self._log_records > 2 * len(self._ids):
+                    self._compact_log()
+
+            elapsed = time.perf_counter() - started
+            return {
+                "success": True,
+                "points_added": len(points),
+                "duplicates_skipped": len(embeddings) - len(points),
+                "batches": 1,
+                "elapsed_seconds": round(elapsed, 3),
+                "points_per_second": round(len(points) / elapsed, 1) if elapsed else 0.0,
+                "message": f"Upserted {len(points)} embeddings to collection"
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def _update_approximate_index(self, changed_rows: Optional[np.ndarray] = None):
+        """Keep the inverted lists in step with the matrix
+
+        Lists are trained with spherical k-means when the collection first passes
+        the threshold and again whenever it has doubled since; in between, changed
+        rows are assigned to the nearest existing list.
+        """
+        points = len(self._ids)
+        if points < self.approximate_threshold:
+            self._centroids = self._assignment = self._order = self._offsets = None
+            return
+
+        if self._centroids is None or changed_rows is None or points >= 2 * self._trained_points:
+            self._centroids = self._train_centroids()
+            self._trained_points = points
+            changed_rows = np.arange(points)
+            self._assignment = np.zeros(points, dtype=np.int32)
+        else:
+            self._assignment = self._reserve(self._assignment, points)
+
+        # Assign in blocks so the score matrix stays small
+        for start in range(0, len(changed_rows), 65536):
+            rows = changed_rows[start:start + 65536]
+            self._assignment[rows] = np.argmax(self._vectors[rows] @ self._centroids.T, axis=1)
+        # The lists are sorted again by the next search rather than after every upsert
+        self._order = self._offsets = None
+
+    def _inverted_lists(self):
+        if self._order is None:
+            assignment = self._assignment[:len(self._ids)]
+            self._order = np.argsort(assignment, kind="stable")
+            self._offsets = np.searchsorted(assignment[self._order], np.arange(len(self._centroids) + 1))
+
+    def _train_centroids(self, iterations: int = 10, max_sample: int = 100000) -> np.ndarray:
+        points = len(self._ids)
+        lists = max(1, int(np.sqrt(points)))
+        rng = np.random.default_rng(0)
+        sample = np.asarray(self._vectors[np.sort(rng.choice(points, min(points, lists * 32, max_sample), replace=False))])
+        centroids = sample[rng.choice(len(sample), lists, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty lists keep their previous centroid
+            centroids = np.where(norms > 0, sums / np.where(norms == 0, 1, norms), centroids)
+        return centroids.astype(np.float32)
+
+    def _filter_mask(self, metadata_filter: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Rows matching {field: value or [values]}; None values are ignored, None result means no filter"""
+        mask = None
+        for key, value in (metadata_filter or {}).items():
+            if value is None:
+                continue
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            if key in self._fields:
+                matches = np.isin(self._fields[key], values)
+            else:
+                matches = np.array([payload.get(key) in values for payload in self._payloads], dtype=bool)
+            mask = matches if mask is None else mask & matches
+        return mask
+
+    def _project(self, payload: Dict[str, Any], with_payload: Union[bool, List[str]]) -> Optional[Dict[str, Any]]:
+        if with_payload is True:
+            return payload
+        if not with_payload:
+            return None
+        return {field: payload[field] for field in with_payload if field in payload}
+
+    def _top_hits(self, scores: np.ndarray, candidates: Optional[np.ndarray], limit: int,
+                  score_threshold: Optional[float], with_payload: Union[bool, List[str]]) -> List[Dict[str, Any]]:
+        top = min(limit, len(scores))
+        best = np.argpartition(-scores, top - 1)[:top] if top else np.array([], dtype=int)
+        best = best[np.argsort(-scores[best])]
+
+        hits = []
+        for position in best:
+            score = float(scores[position])
+            if score_threshold is not None and score < score_threshold:
+                break
+            row = int(position if candidates is None else candidates[position])
+            hits.append({
+                "id": self._ids[row],
+                "score": score,
+                "payload": self._project(self._payloads[row], with_payload)
+            })
+        return hits
+
+    def _search_many(self, queries: np.ndarray, limit: int, score_threshold: Optional[float],
+                     metadata_filter: Dict[str, Any], ef: Optional[int],
+                     with_payload: Union[bool, List[str]]) -> List[List[Dict[str, Any]]]:
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1, norms)
+
+        with self._lock:
+            mask = self._filter_mask(metadata_filter)
+
+            if self._centroids is None or (mask is not None and mask.sum() < self.approximate_threshold):
+                # Small or narrowly filtered collections are scored exactly, all queries in one product
+                candidates = np.flatnonzero(mask) if mask is not None else None
+                vectors = self._vectors if candidates is None else self._vectors[candidates]
+                scores = queries @ vectors.T
+                return [self._top_hits(row, candidates, limit, score_threshold, with_payload) for row in scores]
+
+            results = []
+            self._inverted_lists()
+            nprobe = min(ef or self.nprobe, len(self._centroids))
+            for query, list_scores in zip(queries, queries @ self._centroids.T):
+                probed = np.argpartition(-list_scores, nprobe - 1)[:nprobe]
+                candidates = np.concatenate([self._order[self._offsets[i]:self._offsets[i + 1]] for i in probed])
+                if mask is not None:
+                    candidates = candidates[mask[candidates]]
+                results.append(self._top_hits(self._vectors[candidates] @ query, candidates, limit,
+                                              score_threshold, with_payload))
+            return results
+
+    def search(self, query_embedding: List[float], limit: int = 5,
+               score_threshold: float = 0.7, project: Optional[str] = None,
+               file_type: Optional[str] = None, metadata_filter: Optional[Dict[str, Any]] = None,
+               ef: Optional[int] = None, with_payload: Union[bool, List[str]] = True) -> Dict[str, Any]:
+        """Search for similar embeddings, optionally restricted to a project, file type or other payload fields
+
+        ef overrides how many inverted lists an approximate search probes (higher is slower and more accurate).
+        with_payload selects the payload fields returned, or none (see search_batch).
+        """
+        try:
+            results = self._search_many(
+                np.asarray([query_embedding], dtype=np.float32), limit, score_threshold,
+                merge_filter(metadata_filter, project=project, file_type=file_type), ef, with_payload
+            )[0]
+
+            return {
+                "success": True,
+                "results": results,
+                "count": len(results)
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def search_batch(self, query_embeddings: List[List[float]], limit: int = 5,
+                     score_threshold: float = 0.7, project: Optional[str] = None,
+                     file_type: Optional[str] = None, metadata_filter: Optional[Dict[str, Any]] = None,
+                     ef: Optional[int] = None, with_payload: Union[bool, List[str]] = True) -> Dict[str, Any]:
+        """Run several searches at once; results[i] holds the hits for query_embeddings[i]
+
+        with_payload=["file_path", "project"] returns only those fields; False returns ids and scores
+        only, and get_payloads fetches the payloads of the hits that are actually used.
+        """
+        try:
+            results = self._search_many(
+                np.asarray(query_embeddings, dtype=np.float32).reshape(-1, self.vector_size), limit,
+                score_threshold, merge_filter(metadata_filter, project=project, file_type=file_type),
+                ef, with_payload
+            )
+
+            return {
+                "success": True,
+                "results": results,
+                "count": sum(len(hits) for hits in results)
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def get_payloads(self, ids: List[Any], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Fetch the payloads (or just the given fields) of points by id"""
+        with self._lock:
+            payloads = {
+                point: self._project(self._payloads[self._rows[point]], fields or True)
+                for point in ids if point in self._rows
+            }
+
+        return {
+            "success": True,
+            "payloads": payloads,
+            "count": len(payloads)
+        }
+
+    def get_vector_size(self) -> Optional[int]:
+        """Get the vector size the collection was created with"""
+        return self.vector_size
+
+    def count(self) -> int:
+        """Number of points stored in the collection"""
+        return len(self._ids)
+
+    def get_collection_info(self) -> Dict[str, Any]:
+        """Get information about the collection"""
+        with self._lock:
+            points = len(self._ids)
+            centroid_bytes = self._centroids.nbytes + self._assignment.nbytes if self._centroids is not None else 0
+            return {
+                "success": True,
+                "vectors_count": points,
+                "indexed_vectors_count": points if self._centroids is not None else 0,
+                "points_count": points,
+                "status": "green",
+                "approximate": self._centroids is not None,
+                "inverted_lists": len(self._centroids) if self._centroids is not None else 0,
+                "mmap": self.mmap,
+                # A memory-mapped matrix is paged in on demand rather than held resident
+                "estimated_ram_bytes": (0 if self.mmap else points * self.vector_size * 4) + centroid_bytes
+            }
+
+    def delete_collection(self) -> Dict[str, Any]:
+        """Delete the entire collection"""
+        try:
+            with self._lock:
+                shutil.rmtree(self.collection_dir, ignore_errors=True)
+                self._load(np.zeros((0, self.vector_size), dtype=np.float32), [], [])
+                self.collection_exists = False
+
+            return {
+                "success": True,
+                "message": f"Collection {self.collection_name} deleted"
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def scroll(self, metadata_filter: Optional[Dict[str, Any]] = None, page_size: int = 256,
+               with_vectors: bool = False) -> Iterator[Dict[str, Any]]:
+        """Walk every point matching the filter, one page at a time"""
+        with self._lock:
+            mask = self._filter_mask(metadata_filter)
+            rows = np.flatnonzero(mask) if mask is not None else np.arange(len(self._ids))
+            ids, payloads, vectors = self._ids, self._payloads, self._vectors
+
+        for start in range(0, len(rows), page_size):
+            for row in rows[start:start + page_size]:
+                item = {"id": ids[row], "payload": payloads[row]}
+                if with_vectors:
+                    item["vector"] = vectors[row].tolist()
+                yield item
+
+    def search_by_metadata(self, metadata_filter: Dict[str, Any],
+                          limit: int = 10) -> Dict[str, Any]:
+        """Search documents by metadata filters"""
+        try:
+            results = list(islice(self.scroll(metadata_filter, page_size=min(limit, 256)), limit))
+
+            return {
+                "success": True,
+                "results": results,
+                "count": len(results)
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
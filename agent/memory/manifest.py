@@ -0,0 +1,152 @@
+import fnmatch
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Iterable, Iterator, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def is_indexable(path: Path, extensions: set, ignored_dirs: set, ignored_files: set,
+                 excluded_paths: List[Path] = ()) -> bool:
+    """Whether a single path would be picked up by scan_files"""
+    if path.suffix not in extensions:
+        return False
+    if any(fnmatch.fnmatch(path.name, pattern) for pattern in ignored_files):
+        return False
+    if any(part in ignored_dirs for part in path.parts[:-1]):
+        return False
+    resolved = path.resolve()
+    return not any(Path(excluded).resolve() in resolved.parents for excluded in excluded_paths)
+
+def scan_files(paths: Dict[str, Path], extensions: set, ignored_dirs: set,
+               ignored_files: set, excluded_paths: List[Path] = ()) -> Iterator[Tuple[str, Path]]:
+    """Yield (project, file path) for every indexable file, each path once"""
+    seen = set()
+    excluded = {str(Path(path).resolve()) for path in excluded_paths}
+    for name, root in paths.items():
+        if not root.exists():
+            print(f"⚠️  Path {root} does not exist, skipping...")
+            continue
+
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [
+                d for d in dirnames
+                if d not in ignored_dirs and str((Path(dirpath) / d).resolve()) not in excluded
+            ]
+            for filename in filenames:
+                if Path(filename).suffix not in extensions:
+                    continue
+                if any(fnmatch.fnmatch(filename, pattern) for pattern in ignored_files):
+                    continue
+
+                path = Path(dirpath) / filename
+                key = str(path.resolve())
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield name, path
+
+class FileManifest:
+    """Record of indexed files (size, mtime, content hash, node ids) for incremental indexing"""
+
+    def __init__(self, manifest_path: Path):
+        self.manifest_path = Path(manifest_path)
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.meta: Dict[str, Any] = {}
+
+    def load(self) -> bool:
+        try:
+            if self.manifest_path.exists():
+                data = json.loads(self.manifest_path.read_text())
+                self.files = data.get("files", {})
+                self.meta = data.get("meta", {})
+            return True
+        except Exception as e:
+            print(f"⚠️  Failed to read index manifest, reindexing everything: {e}")
+            self.reset()
+            return False
+
+    def reset(self):
+        self.files = {}
+        self.meta = {}
+
+    @contextmanager
+    def lock(self):
+        """Hold an exclusive lock on the manifest across processes (no-op where flock is unavailable)"""
+        if fcntl is None:
+            yield
+            return
+        
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path.with_suffix(".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def save(self):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"meta": self.meta, "files": self.files}))
+        os.replace(tmp_path, self.manifest_path)
+
+    def diff(self, files: List[Tuple[str, Path]]) -> Dict[str, Any]:
+        """Split scanned files into added, changed, unchanged and removed
+
+        Size and mtime are compared first; a file is only hashed when they differ,
+        and a touched file whose content hash is unchanged counts as unchanged.
+        """
+        added, changed, unchanged = [], [], []
+        current = set()
+
+        for project, path in files:
+            key = str(path)
+            current.add(key)
+            stat = path.stat()
+            entry = self.files.get(key)
+
+            if entry is None:
+                added.append((project, path))
+            elif entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+                unchanged.append((project, path))
+            elif entry["hash"] == file_hash(path):
+                entry["mtime"] = stat.st_mtime
+                unchanged.append((project, path))
+            else:
+                changed.append((project, path))
+
+        removed = [key for key in self.files if key not in current]
+        return {"added": added, "changed": changed, "unchanged": unchanged, "removed": removed}
+
+    def record(self, project: str, path: Path, node_ids: List[str], duplicate_of: List[str] = ()):
+        stat = path.stat()
+        self.files[str(path)] = {
+            "project": project,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "hash": file_hash(path),
+            "node_ids": node_ids,
+            "duplicate_of": list(duplicate_of)
+        }
+
+    def dependents(self, paths: Iterable[str]) -> List[str]:
+        """Files with chunks left out as duplicates of chunks in any of these files"""
+        paths = set(paths)
+        return [key for key, entry in self.files.items() if paths & set(entry.get("duplicate_of", ()))]
+
+    def remove(self, path: str) -> List[str]:
+        entry = self.files.pop(path, None)
+        return entry["node_ids"] if entry else []
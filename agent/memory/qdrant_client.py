@@ -1,15 +1,57 @@
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
+from qdrant_client.models import (
+    Distance, VectorParams, VectorParamsDiff, PointStruct, PayloadSchemaType,
+    Filter, FieldCondition, MatchValue, MatchAny, HnswConfigDiff, SearchParams,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType, QuantizationSearchParams, Disabled,
+    QueryRequest
+)
 import numpy as np
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Dict, Any, Optional, Iterator, Union
+import time
 import uuid
 
+# Namespace for content-derived point IDs; changing it re-keys every point
+POINT_ID_NAMESPACE = uuid.UUID("8f4b6a2e-3c1d-4e5f-9a7b-0d2c6e8f1a3b")
+
+# Payload fields searches filter on; keyword indexes keep filtered queries fast on large collections
+INDEXED_PAYLOAD_FIELDS = ("project", "file_type", "file_path")
+
+def merge_filter(metadata_filter: Optional[Dict[str, Any]], **fields: Any) -> Dict[str, Any]:
+    """metadata_filter plus the given fields that are set; a None field keeps the caller's condition"""
+    merged = dict(metadata_filter or {})
+    merged.update({key: value for key, value in fields.items() if value is not None})
+    return merged
+
+# Collection layout used when no profile is given: full-precision vectors in RAM, Qdrant's HNSW defaults
+DEFAULT_PROFILE = {
+    "on_disk": False,
+    "quantization": None,
+    "always_ram": True,
+    "hnsw_m": 16,
+    "hnsw_ef_construct": 100,
+    "search_ef": None,
+    "rescore": True,
+    "oversampling": 1.0
+}
+
+def point_id(file_path: str, text: str) -> str:
+    """Deterministic point ID for a chunk, so re-adding the same content overwrites it"""
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{file_path}\0{text}"))
+
 class QdrantMemory:
     """Long-term memory using Qdrant vector database"""
     
-    def __init__(self, url: str = "http://localhost:6333", collection_name: str = "axiom_codebase"):
+    def __init__(self, url: str = "http://localhost:6333", collection_name: str = "axiom_codebase",
+                 vector_size: int = 384, batch_size: int = 100, parallel: int = 4,
+                 profile: Optional[Dict[str, Any]] = None):
         self.client = QdrantClient(url=url)
         self.collection_name = collection_name
+        self.vector_size = vector_size  # Size for sentence-transformers embeddings
+        self.batch_size = batch_size
+        self.parallel = parallel
+        self.profile = {**DEFAULT_PROFILE, **(profile or {})}
         self.collection_exists = False
         
     def setup(self) -> bool:
@@ -24,14 +66,27 @@ class QdrantMemory:
                 self.client.create_collection(
                     collection_name=self.collection_name,
                     vectors_config=VectorParams(
-                        size=384,  # Size for sentence-transformers embeddings
-                        distance=Distance.COSINE
-                    )
+                        size=self.vector_size,
+                        distance=Distance.COSINE,
+                        on_disk=self.profile["on_disk"]
+                    ),
+                    hnsw_config=self._hnsw_config(),
+                    quantization_config=self._quantization_config()
                 )
                 print(f"✅ Created Qdrant collection: {self.collection_name}")
             else:
+                existing_size = self.get_vector_size()
+                if existing_size != self.vector_size:
+                    print(f"❌ Qdrant collection {self.collection_name} stores {existing_size}-dim vectors, "
+                          f"but the embedding model produces {self.vector_size}-dim vectors")
+                    return False
                 print(f"✅ Qdrant collection exists: {self.collection_name}")
+                
+                # Existing collections are migrated in place; Qdrant rebuilds segments in the background
+                if self.profile_differences():
+                    self.apply_profile()
             
+            self.ensure_payload_indexes()
             self.collection_exists = True
             return True
             
@@ -40,37 +95,113 @@ class QdrantMemory:
             return False
     
     def add_embeddings(self, embeddings: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Add embeddings to the collection"""
+        """Upsert embeddings; point IDs derive from file path and text, so repeated adds are idempotent"""
         try:
-            points = []
+            started = time.perf_counter()
+            points = {}
             
             for item in embeddings:
+                file_path = item.get("file_path", "")
                 point = PointStruct(
-                    id=str(uuid.uuid4()),
+                    id=point_id(file_path, item["text"]),
                     vector=item["embedding"],
                     payload={
                         "text": item["text"],
-                        "file_path": item.get("file_path", ""),
+                        "file_path": file_path,
                         "project": item.get("project", ""),
                         "file_type": item.get("file_type", ""),
                         "metadata": item.get("metadata", {})
                     }
                 )
-                points.append(point)
+                points[point.id] = point
             
-            # Upload points in batches
-            batch_size = 100
-            for i in range(0, len(points), batch_size):
-                batch = points[i:i + batch_size]
-                self.client.upsert(
-                    collection_name=self.collection_name,
-                    points=batch
-                )
+            # Upload batches concurrently without waiting for each one to be applied
+            points = list(points.values())
+            batches = [points[i:i + self.batch_size] for i in range(0, len(points), self.batch_size)]
+            with ThreadPoolExecutor(max_workers=max(1, min(self.parallel, len(batches) or 1))) as executor:
+                list(executor.map(
+                    lambda batch: self.client.upsert(collection_name=self.collection_name, points=batch, wait=False),
+                    batches
+                ))
             
+            elapsed = time.perf_counter() - started
             return {
                 "success": True,
                 "points_added": len(points),
-                "message": f"Added {len(points)} embeddings to collection"
+                "duplicates_skipped": len(embeddings) - len(points),
+                "batches": len(batches),
+                "elapsed_seconds": round(elapsed, 3),
+                "points_per_second": round(len(points) / elapsed, 1) if elapsed else 0.0,
+                "message": f"Upserted {len(points)} embeddings to collection"
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def _hnsw_config(self) -> HnswConfigDiff:
+        return HnswConfigDiff(m=self.profile["hnsw_m"], ef_construct=self.profile["hnsw_ef_construct"])
+    
+    def _quantization_config(self) -> Optional[ScalarQuantization]:
+        if self.profile["quantization"] != "int8":
+            return None
+        # Quantized vectors stay in RAM for the HNSW walk; originals are only read to rescore
+        return ScalarQuantization(scalar=ScalarQuantizationConfig(
+            type=ScalarType.INT8,
+            quantile=0.99,
+            always_ram=self.profile["always_ram"]
+        ))
+    
+    def _search_params(self, ef: Optional[int] = None) -> Optional[SearchParams]:
+        ef = ef or self.profile["search_ef"]
+        quantization = None
+        if self.profile["quantization"]:
+            quantization = QuantizationSearchParams(
+                rescore=self.profile["rescore"],
+                oversampling=self.profile["oversampling"]
+            )
+        if not ef and not quantization:
+            return None
+        return SearchParams(hnsw_ef=ef, quantization=quantization)
+    
+    def profile_differences(self) -> List[str]:
+        """Settings where the existing collection differs from the configured profile"""
+        config = self.client.get_collection(self.collection_name).config
+        vectors = config.params.vectors
+        if isinstance(vectors, dict):
+            vectors = next(iter(vectors.values()), None)
+        
+        quantization = config.quantization_config
+        current = {
+            "on_disk": bool(vectors and vectors.on_disk),
+            "quantization": "int8" if isinstance(quantization, ScalarQuantization) else None,
+            "hnsw_m": config.hnsw_config.m,
+            "hnsw_ef_construct": config.hnsw_config.ef_construct
+        }
+        return [key for key, value in current.items() if value != self.profile[key]]
+    
+    def apply_profile(self) -> Dict[str, Any]:
+        """Migrate the existing collection to the configured profile without re-uploading points"""
+        try:
+            changed = self.profile_differences()
+            if not changed:
+                return {"success": True, "changed": []}
+            
+            quantization = self._quantization_config()
+            self.client.update_collection(
+                collection_name=self.collection_name,
+                vectors_config={"": VectorParamsDiff(on_disk=self.profile["on_disk"])},
+                hnsw_config=self._hnsw_config(),
+                quantization_config=quantization if quantization else Disabled.DISABLED
+            )
+            print(f"🔄 Migrating Qdrant collection {self.collection_name}: {', '.join(changed)}")
+            
+            return {
+                "success": True,
+                "changed": changed,
+                "message": "Collection updated; Qdrant re-optimizes segments in the background"
             }
             
         except Exception as e:
@@ -79,16 +210,49 @@ class QdrantMemory:
                 "error": str(e)
             }
     
+    def ensure_payload_indexes(self):
+        """Create keyword indexes on the filterable payload fields (no-op if they exist)"""
+        existing = self.client.get_collection(self.collection_name).payload_schema or {}
+        for field in INDEXED_PAYLOAD_FIELDS:
+            if field not in existing:
+                self.client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field,
+                    field_schema=PayloadSchemaType.KEYWORD
+                )
+    
+    def _build_filter(self, metadata_filter: Optional[Dict[str, Any]]) -> Optional[Filter]:
+        """Turn {field: value or [values]} into a Qdrant filter; None values are ignored"""
+        conditions = []
+        for key, value in (metadata_filter or {}).items():
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                conditions.append(FieldCondition(key=key, match=MatchAny(any=list(value))))
+            else:
+                conditions.append(FieldCondition(key=key, match=MatchValue(value=value)))
+        return Filter(must=conditions) if conditions else None
+    
     def search(self, query_embedding: List[float], limit: int = 5, 
-               score_threshold: float = 0.7) -> Dict[str, Any]:
-        """Search for similar embeddings"""
+               score_threshold: float = 0.7, project: Optional[str] = None,
+               file_type: Optional[str] = None, metadata_filter: Optional[Dict[str, Any]] = None,
+               ef: Optional[int] = None, with_payload: Union[bool, List[str]] = True) -> Dict[str, Any]:
+        """Search for similar embeddings, optionally restricted to a project, file type or other payload fields
+
+        ef overrides the profile's HNSW search breadth for this query (higher is slower and more accurate).
+        with_payload selects the payload fields returned, or none (see search_batch).
+        """
         try:
-            search_result = self.client.search(
+            query_filter = self._build_filter(merge_filter(metadata_filter, project=project, file_type=file_type))
+            search_result = self.client.query_points(
                 collection_name=self.collection_name,
-                query_vector=query_embedding,
+                query=query_embedding,
+                query_filter=query_filter,
                 limit=limit,
-                score_threshold=score_threshold
-            )
+                score_threshold=score_threshold,
+                search_params=self._search_params(ef),
+                with_payload=with_payload
+            ).points
             
             results = []
             for hit in search_result:
@@ -110,17 +274,103 @@ class QdrantMemory:
                 "error": str(e)
             }
     
+    def search_batch(self, query_embeddings: List[List[float]], limit: int = 5,
+                     score_threshold: float = 0.7, project: Optional[str] = None,
+                     file_type: Optional[str] = None, metadata_filter: Optional[Dict[str, Any]] = None,
+                     ef: Optional[int] = None, with_payload: Union[bool, List[str]] = True) -> Dict[str, Any]:
+        """Run several searches in one request; results[i] holds the hits for query_embeddings[i]
+
+        with_payload=["file_path", "project"] returns only those fields; False returns ids and scores
+        only, and get_payloads fetches the payloads of the hits that are actually used.
+        """
+        try:
+            query_filter = self._build_filter(merge_filter(metadata_filter, project=project, file_type=file_type))
+            search_params = self._search_params(ef)
+            responses = self.client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=[
+                    QueryRequest(
+                        query=query_embedding,
+                        filter=query_filter,
+                        limit=limit,
+                        score_threshold=score_threshold,
+                        params=search_params,
+                        with_payload=with_payload
+                    )
+                    for query_embedding in query_embeddings
+                ]
+            )
+            
+            results = [
+                [{"id": hit.id, "score": hit.score, "payload": hit.payload} for hit in response.points]
+                for response in responses
+            ]
+            
+            return {
+                "success": True,
+                "results": results,
+                "count": sum(len(hits) for hits in results)
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def get_payloads(self, ids: List[Any], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Fetch the payloads (or just the given fields) of points by id"""
+        try:
+            points = self.client.retrieve(
+                collection_name=self.collection_name,
+                ids=list(ids),
+                with_payload=fields if fields else True
+            )
+            
+            return {
+                "success": True,
+                "payloads": {point.id: point.payload for point in points},
+                "count": len(points)
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def get_vector_size(self) -> Optional[int]:
+        """Get the vector size the collection was created with"""
+        vectors = self.client.get_collection(self.collection_name).config.params.vectors
+        if isinstance(vectors, dict):
+            vectors = next(iter(vectors.values()), None)
+        return vectors.size if vectors else None
+    
+    def count(self) -> int:
+        """Number of points stored in the collection"""
+        return self.client.count(self.collection_name, exact=True).count
+    
     def get_collection_info(self) -> Dict[str, Any]:
         """Get information about the collection"""
         try:
             info = self.client.get_collection(self.collection_name)
+            points = info.points_count or 0
+            
+            # Rough resident size: vectors kept in RAM plus HNSW links (m * 2 neighbours of 4 bytes on layer 0)
+            vector_bytes = 0 if self.profile["on_disk"] else points * self.vector_size * 4
+            if self.profile["quantization"] == "int8" and self.profile["always_ram"]:
+                vector_bytes += points * self.vector_size
+            graph_bytes = points * self.profile["hnsw_m"] * 2 * 4
             
             return {
                 "success": True,
-                "vectors_count": info.vectors_count,
+                "vectors_count": getattr(info, "vectors_count", points),
                 "indexed_vectors_count": info.indexed_vectors_count,
                 "points_count": info.points_count,
-                "status": info.status
+                "status": info.status,
+                "profile": self.profile,
+                "profile_differences": self.profile_differences(),
+                "estimated_ram_bytes": vector_bytes + graph_bytes
             }
             
         except Exception as e:
@@ -146,35 +396,32 @@ class QdrantMemory:
                 "error": str(e)
             }
     
+    def scroll(self, metadata_filter: Optional[Dict[str, Any]] = None, page_size: int = 256,
+               with_vectors: bool = False) -> Iterator[Dict[str, Any]]:
+        """Walk every point matching the filter, one page at a time"""
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=self._build_filter(metadata_filter),
+                limit=page_size,
+                offset=offset,
+                with_vectors=with_vectors
+            )
+            for point in points:
+                item = {"id": point.id, "payload": point.payload}
+                if with_vectors:
+                    item["vector"] = point.vector
+                yield item
+            
+            if offset is None:
+                return
+    
     def search_by_metadata(self, metadata_filter: Dict[str, Any], 
                           limit: int = 10) -> Dict[str, Any]:
         """Search documents by metadata filters"""
         try:
-            # Build filter from metadata
-            filter_conditions = []
-            
-            for key, value in metadata_filter.items():
-                filter_conditions.append({
-                    "key": key,
-                    "match": {"value": value}
-                })
-            
-            search_result = self.client.scroll(
-                collection_name=self.collection_name,
-                scroll_filter={
-                    "must": filter_conditions
-                },
-                limit=limit
-            )
-            
-            points = search_result[0]  # First element contains points
-            
-            results = []
-            for point in points:
-                results.append({
-                    "id": point.id,
-                    "payload": point.payload
-                })
+            results = list(islice(self.scroll(metadata_filter, page_size=min(limit, 256)), limit))
             
             return {
                 "success": True,
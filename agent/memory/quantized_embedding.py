@@ -0,0 +1,53 @@
+from typing import Any, List, Optional
+from llama_index.core.embeddings import BaseEmbedding
+from llama_index.core.bridge.pydantic import PrivateAttr
+
+class QuantizedEmbedding(BaseEmbedding):
+    """Sentence-transformers model with int8 dynamically quantized linear layers for CPU-only hosts
+
+    Weights are quantized once at load time; activations are quantized per batch.
+    num_threads sets torch's intra-op thread count, which is process-wide.
+    """
+
+    _model: Any = PrivateAttr()
+    _normalize: bool = PrivateAttr()
+
+    def __init__(self, model_name: str, embed_batch_size: int = 32, num_threads: Optional[int] = None,
+                 normalize: bool = True, **kwargs: Any):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        super().__init__(model_name=model_name, embed_batch_size=embed_batch_size, **kwargs)
+        if num_threads:
+            torch.set_num_threads(num_threads)
+
+        model = SentenceTransformer(model_name, device="cpu")
+        model.eval()
+        self._model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self._normalize = normalize
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "QuantizedEmbedding"
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        embeddings = self._model.encode(
+            texts,
+            batch_size=self.embed_batch_size,
+            normalize_embeddings=self._normalize,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return embeddings.tolist()
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._encode([query])[0]
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._get_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._encode([text])[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._encode(texts)
@@ -0,0 +1,207 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Optional
+from ..models import AgentState
+
+class SessionStore:
+    """SQLite-backed checkpoints of AgentState, keyed by conversation ID"""
+
+    def __init__(self, db_path: Path, max_age_seconds: int = 24 * 60 * 60,
+                 max_sessions: int = 500, max_bytes: int = 50 * 1024 * 1024):
+        self.db_path = Path(db_path)
+        self.max_age_seconds = max_age_seconds
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.ready = False
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @contextmanager
+    def _connect(self):
+        """Use the store's connection in a transaction that commits on success"""
+        if self._conn is None:
+            # One connection per store, shared by threads under the store lock
+            self._conn = sqlite3.connect(str(self.db_path), timeout=10, check_same_thread=False)
+        with self._conn:
+            yield self._conn
+
+    def close(self):
+        """Close the store's connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        self.ready = False
+
+    def setup(self) -> bool:
+        """Create the sessions table if needed"""
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS sessions (
+                        conversation_id TEXT PRIMARY KEY,
+                        state TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        updated_at REAL NOT NULL
+                    )
+                    """
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions (updated_at)"
+                )
+
+            self.ready = True
+            print(f"✅ Session store ready: {self.db_path}")
+            return True
+
+        except Exception as e:
+            print(f"❌ Failed to setup session store: {e}")
+            return False
+
+    def load(self, conversation_id: str) -> Optional[AgentState]:
+        """Load the last checkpointed state of a conversation"""
+        if not self.ready or not conversation_id:
+            return None
+
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT state, updated_at FROM sessions WHERE conversation_id = ?",
+                    (conversation_id,)
+                ).fetchone()
+
+            if not row:
+                return None
+
+            state_json, updated_at = row
+            if time.time() - updated_at > self.max_age_seconds:
+                self.delete(conversation_id)
+                return None
+
+            return AgentState.model_validate_json(state_json)
+
+        except Exception as e:
+            print(f"⚠️  Failed to load session {conversation_id}: {e}")
+            return None
+
+    def resume(self, user_request: str, project_id: str = None,
+               conversation_id: str = None) -> AgentState:
+        """Build the initial state for a turn, resuming the conversation's project if one is checkpointed"""
+        previous = self.load(conversation_id) if conversation_id else None
+        if not previous or (project_id and previous.project_id and project_id != previous.project_id):
+            return AgentState(
+                user_request=user_request,
+                project_id=project_id,
+                conversation_id=conversation_id
+            )
+
+        # Only the project being worked on carries over; loaded context and memory hits belong to their own turn
+        project_id = previous.project_id or project_id
+        context = {
+            key: previous.context[key]
+            for key in ("project_id", "project_name", "screen_id")
+            if key in previous.context
+        }
+        if project_id:
+            context["project_id"] = project_id
+
+        return AgentState(
+            user_request=user_request,
+            conversation_id=conversation_id,
+            project_id=project_id,
+            current_screen=previous.current_screen,
+            context=context
+        )
+
+    def save(self, state: AgentState) -> bool:
+        """Checkpoint a state under its conversation ID and evict old sessions"""
+        if not self.ready or not state.conversation_id:
+            return False
+
+        try:
+            state_json = state.model_dump_json()
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO sessions (conversation_id, state, size, updated_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(conversation_id) DO UPDATE SET
+                        state = excluded.state,
+                        size = excluded.size,
+                        updated_at = excluded.updated_at
+                    """,
+                    (state.conversation_id, state_json, len(state_json), time.time())
+                )
+
+            self.evict()
+            return True
+
+        except Exception as e:
+            print(f"⚠️  Failed to save session {state.conversation_id}: {e}")
+            return False
+
+    def delete(self, conversation_id: str) -> bool:
+        """Drop a conversation checkpoint"""
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("DELETE FROM sessions WHERE conversation_id = ?", (conversation_id,))
+            return True
+        except Exception as e:
+            print(f"⚠️  Failed to delete session {conversation_id}: {e}")
+            return False
+
+    def evict(self) -> int:
+        """Remove sessions older than max age, then the oldest ones beyond the count and size limits"""
+        removed = 0
+
+        with self._lock, self._connect() as conn:
+            cutoff = time.time() - self.max_age_seconds
+            removed += conn.execute("DELETE FROM sessions WHERE updated_at < ?", (cutoff,)).rowcount
+
+            rows = conn.execute(
+                "SELECT conversation_id, size FROM sessions ORDER BY updated_at DESC"
+            ).fetchall()
+
+            kept_count = 0
+            kept_bytes = 0
+            stale_ids = []
+            for conversation_id, size in rows:
+                if kept_count >= self.max_sessions or kept_bytes + size > self.max_bytes:
+                    stale_ids.append((conversation_id,))
+                    continue
+                kept_count += 1
+                kept_bytes += size
+
+            if stale_ids:
+                conn.executemany("DELETE FROM sessions WHERE conversation_id = ?", stale_ids)
+                removed += len(stale_ids)
+
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get session count and total checkpoint size"""
+        try:
+            with self._lock, self._connect() as conn:
+                count, total_bytes = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM sessions"
+                ).fetchone()
+
+            return {
+                "success": True,
+                "sessions": count,
+                "total_bytes": total_bytes,
+                "max_sessions": self.max_sessions,
+                "max_bytes": self.max_bytes,
+                "max_age_seconds": self.max_age_seconds
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
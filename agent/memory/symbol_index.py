@@ -0,0 +1,392 @@
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+# Express
+JS_IMPORT = re.compile(r"^import\s+(?:\{\s*(\w+)\s*\}|(\w+))\s+from\s+['\"](\.[^'\"]+)['\"]", re.MULTILINE)
+JS_MOUNT = re.compile(r"^\s*app\.use\(\s*['\"]([^'\"]+)['\"]\s*,\s*(?:[\w.]+\s*,\s*)*(\w+)\s*\)", re.MULTILINE)
+JS_ROUTE = re.compile(r"^\s*(?:router|app)\.(get|post|put|patch|delete)\(\s*['\"`]([^'\"`]+)['\"`]\s*,([^\n]*)", re.MULTILINE)
+JS_SCHEMA = re.compile(r"(?:const|let|var)\s+(\w+)\s*=\s*new\s+mongoose\.Schema\(\s*(?=\{)", re.MULTILINE)
+JS_MODEL = re.compile(r"mongoose\.model\(\s*['\"](\w+)['\"]\s*,\s*(\w+)")
+JS_CLASS = re.compile(r"^(?:export\s+(?:default\s+)?)?class\s+(\w+)[^{]*\{", re.MULTILINE)
+JS_METHOD = re.compile(r"^  (?:static\s+)?(?:async\s+)?(\w+)\s*\([^)]*\)\s*\{", re.MULTILINE)
+
+# Flutter
+DART_CLASS = re.compile(
+    r"^(?:abstract\s+)?class\s+(\w+)(?:<[^>{]*>)?(?:\s+extends\s+(\w+)(?:<[^>{]*>)?)?"
+    r"(?:\s+with\s+([\w\s,<>]+?))?(?:\s+implements\s+[\w\s,<>]+?)?\s*\{",
+    re.MULTILINE
+)
+DART_METHOD = re.compile(r"^  (?:static\s+)?(?:Future<[^\n(]*>|[\w<>?,]+)\s+(\w+)\s*\(", re.MULTILINE)
+DART_FIELD = re.compile(r"^  (?:final\s+|late\s+)*([\w<>?, ]+?)\s+(\w+)(?:\s*=[^;]*)?;", re.MULTILINE)
+DART_APP_ROUTE = re.compile(r"['\"](/[\w/-]*)['\"]\s*:\s*\(\w*\)\s*=>\s*(?:const\s+)?(\w+)\(")
+DART_WIDGET_BASES = ("StatelessWidget", "StatefulWidget")
+
+KEYWORDS = {"if", "for", "while", "switch", "catch", "return", "super", "constructor"}
+
+# Words that select what a structural question lists
+KIND_KEYWORDS = {
+    "api_route": ("route", "routes", "endpoint", "endpoints"),
+    "app_route": ("navigation",),
+    "model": ("model", "models", "schema", "schemas", "fields"),
+    "service": ("service", "services"),
+    "provider": ("provider", "providers"),
+    "screen": ("screen", "screens", "page", "pages"),
+    "widget": ("widget", "widgets", "component", "components")
+}
+STRUCTURAL_QUESTION = re.compile(r"^\s*(which|what|list|show|where|how many|are there|is there)\b", re.IGNORECASE)
+STOP_WORDS = {
+    "which", "what", "list", "show", "where", "how", "many", "are", "there", "is", "the", "a", "an", "all",
+    "does", "do", "have", "has", "exist", "exists", "defined", "in", "of", "for", "me", "app", "api", "and"
+}
+
+def _line(text: str, position: int) -> int:
+    return text.count("\n", 0, position) + 1
+
+def _block_end(text: str, open_index: int) -> int:
+    """Index just past the bracket matching text[open_index], skipping strings and comments"""
+    pairs = {"{": "}", "[": "]", "(": ")"}
+    stack = []
+    i = open_index
+    while i < len(text):
+        char = text[i]
+        if char in "'\"`":
+            i += 1
+            while i < len(text) and text[i] != char:
+                i += 2 if text[i] == "\\" else 1
+        elif text.startswith("//", i):
+            i = text.find("\n", i)
+            if i == -1:
+                return len(text)
+        elif text.startswith("/*", i):
+            i = text.find("*/", i)
+            if i == -1:
+                return len(text)
+            i += 1
+        elif char in pairs:
+            stack.append(pairs[char])
+        elif stack and char == stack[-1]:
+            stack.pop()
+            if not stack:
+                return i + 1
+        i += 1
+    return len(text)
+
+def _split_top_level(body: str) -> List[str]:
+    """Split an object/array body on commas that are not nested in brackets"""
+    entries, depth, start = [], 0, 0
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char in "'\"`":
+            i += 1
+            while i < len(body) and body[i] != char:
+                i += 2 if body[i] == "\\" else 1
+        elif char in "{[(":
+            depth += 1
+        elif char in "}])":
+            depth -= 1
+        elif char == "," and depth == 0:
+            entries.append(body[start:i])
+            start = i + 1
+        i += 1
+    entries.append(body[start:])
+    return [entry.strip() for entry in entries if entry.strip()]
+
+def _value_type(value: str) -> str:
+    """Short type for a Mongoose field definition: String, [widgetSchema], ObjectId -> User, ..."""
+    value = re.sub(r"//[^\n]*|/\*.*?\*/", "", value, flags=re.DOTALL).strip()
+    if value.startswith("["):
+        inner = _split_top_level(value[1:_block_end(value, 0) - 1])
+        return f"[{_value_type(inner[0]) if inner else ''}]"
+    if value.startswith("{"):
+        entries = dict(
+            (entry.split(":", 1)[0].strip().strip("'\""), entry.split(":", 1)[1].strip())
+            for entry in _split_top_level(value[1:_block_end(value, 0) - 1]) if ":" in entry
+        )
+        if "type" not in entries:
+            return "Object"
+        kind = _value_type(entries["type"])
+        ref = entries.get("ref", "").strip("'\"")
+        return f"{kind} -> {ref}" if ref else kind
+    return value.split(".")[-1].split()[0] if value else ""
+
+def _js_symbols(text: str, file_path: str) -> List[Dict[str, Any]]:
+    symbols = []
+    directory = os.path.dirname(file_path)
+
+    imports = {}
+    for match in JS_IMPORT.finditer(text):
+        imports[match.group(1) or match.group(2)] = os.path.normpath(os.path.join(directory, match.group(3)))
+    for match in JS_MOUNT.finditer(text):
+        if match.group(2) in imports:
+            symbols.append({
+                "kind": "mount",
+                "name": match.group(2),
+                "prefix": match.group(1),
+                "target": imports[match.group(2)],
+                "line": _line(text, match.start())
+            })
+
+    for match in JS_ROUTE.finditer(text):
+        handler_args = re.split(r"async\b|\(\s*req\b|function\b", match.group(3))[0]
+        middleware = [name for name in re.findall(r"\w+", handler_args) if name not in ("req", "res", "next")]
+        symbols.append({
+            "kind": "api_route",
+            "name": f"{match.group(1).upper()} {match.group(2)}",
+            "method": match.group(1).upper(),
+            "path": match.group(2),
+            "middleware": middleware,
+            "line": _line(text, match.start())
+        })
+
+    schemas = {}
+    for match in JS_SCHEMA.finditer(text):
+        open_index = match.end()
+        body = text[open_index + 1:_block_end(text, open_index) - 1]
+        fields = []
+        for entry in _split_top_level(body):
+            entry = re.sub(r"^(?://[^\n]*\n\s*)+", "", entry)
+            if ":" in entry:
+                name, value = entry.split(":", 1)
+                fields.append({"name": name.strip().strip("'\""), "type": _value_type(value)})
+        schemas[match.group(1)] = fields
+        symbols.append({"kind": "schema", "name": match.group(1), "fields": fields, "line": _line(text, match.start())})
+
+    for match in JS_MODEL.finditer(text):
+        symbols.append({
+            "kind": "model",
+            "framework": "mongoose",
+            "name": match.group(1),
+            "schema": match.group(2),
+            "fields": schemas.get(match.group(2), []),
+            "line": _line(text, match.start())
+        })
+
+    for match in JS_CLASS.finditer(text):
+        if "/services/" not in file_path.replace(os.sep, "/") and not match.group(1).endswith("Service"):
+            continue
+        body = text[match.end() - 1:_block_end(text, match.end() - 1)]
+        methods = [name for name in JS_METHOD.findall(body) if name not in KEYWORDS]
+        symbols.append({"kind": "service", "name": match.group(1), "methods": methods, "line": _line(text, match.start())})
+
+    return symbols
+
+def _dart_symbols(text: str, file_path: str) -> List[Dict[str, Any]]:
+    symbols = []
+    normalized = file_path.replace(os.sep, "/")
+
+    for match in DART_CLASS.finditer(text):
+        name, base, mixins = match.group(1), match.group(2) or "", match.group(3) or ""
+        if name.startswith("_"):
+            continue
+        body = text[match.end() - 1:_block_end(text, match.end() - 1)]
+        symbol = {"name": name, "line": _line(text, match.start())}
+
+        if base == "ChangeNotifier" or "ChangeNotifier" in mixins:
+            symbol.update(kind="provider", methods=[m for m in DART_METHOD.findall(body) if m not in KEYWORDS])
+        elif base in DART_WIDGET_BASES:
+            is_screen = (name.endswith(("Screen", "Page"))
+                         or ("/screens/" in normalized and "/widgets/" not in normalized))
+            symbol.update(kind="screen" if is_screen else "widget", stateful=base == "StatefulWidget")
+        elif name.endswith("Service"):
+            symbol.update(kind="service", methods=[m for m in DART_METHOD.findall(body) if m not in KEYWORDS])
+        elif "/models/" in normalized:
+            fields = [{"name": field, "type": kind.strip()} for kind, field in DART_FIELD.findall(body)
+                      if kind.strip() not in ("return", "static")]
+            symbol.update(kind="model", framework="dart", fields=fields)
+        else:
+            continue
+        symbols.append(symbol)
+
+    for match in DART_APP_ROUTE.finditer(text):
+        symbols.append({
+            "kind": "app_route",
+            "name": match.group(1),
+            "path": match.group(1),
+            "widget": match.group(2),
+            "line": _line(text, match.start())
+        })
+
+    return symbols
+
+def extract_symbols(file_path: str, text: str, project: str = "") -> List[Dict[str, Any]]:
+    """Routes, models, services, providers, screens and widgets declared in a source file"""
+    suffix = Path(file_path).suffix
+    if suffix == ".js":
+        symbols = _js_symbols(text, file_path)
+    elif suffix == ".dart":
+        symbols = _dart_symbols(text, file_path)
+    else:
+        return []
+
+    for symbol in symbols:
+        symbol["file_path"] = file_path
+        symbol["project"] = project
+    return symbols
+
+class SymbolIndex:
+    """Structural index of the codebase, answering "which routes / what fields / which screens" directly
+
+    Symbols are extracted per file at ingest time and persisted next to the
+    manifest; lookups are dictionary reads, no retrieval or LLM call.
+    """
+
+    def __init__(self, index_path: Path):
+        self.index_path = Path(index_path)
+        self.files: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_kind: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_name: Dict[str, List[Dict[str, Any]]] = {}
+        self._prefixes: Dict[str, str] = {}
+        self._dirty = True
+        self._lock = threading.Lock()
+        self.stats = {"answered": 0, "not_structural": 0}
+
+    def load(self) -> bool:
+        with self._lock:
+            self.files, self._dirty = {}, True
+            try:
+                if self.index_path.exists():
+                    self.files = json.loads(self.index_path.read_text())["files"]
+                return True
+            except Exception as e:
+                print(f"⚠️  Failed to read symbol index, rebuilding it: {e}")
+                return False
+
+    def save(self):
+        with self._lock:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps({"files": self.files}))
+            os.replace(tmp_path, self.index_path)
+
+    def add_file(self, file_key: str, symbols: List[Dict[str, Any]]):
+        """Record a file's symbols, replacing any previous version of the file"""
+        with self._lock:
+            self.files[file_key] = symbols
+            self._dirty = True
+
+    def remove_file(self, file_key: str):
+        with self._lock:
+            if self.files.pop(file_key, None) is not None:
+                self._dirty = True
+
+    def _refresh(self):
+        if not self._dirty:
+            return
+        by_kind, by_name, prefixes = {}, {}, {}
+        for symbols in self.files.values():
+            for symbol in symbols:
+                by_kind.setdefault(symbol["kind"], []).append(symbol)
+                by_name.setdefault(symbol["name"].lower(), []).append(symbol)
+                if symbol["kind"] == "mount":
+                    prefixes[symbol["target"]] = symbol["prefix"]
+        for symbols in by_kind.values():
+            symbols.sort(key=lambda symbol: (symbol["file_path"], symbol["line"]))
+        self._by_kind, self._by_name, self._prefixes = by_kind, by_name, prefixes
+        self._dirty = False
+
+    def _with_full_path(self, symbol: Dict[str, Any]) -> Dict[str, Any]:
+        if symbol["kind"] != "api_route":
+            return symbol
+        prefix = self._prefixes.get(os.path.normpath(symbol["file_path"]), "")
+        full_path = (prefix.rstrip("/") + "/" + symbol["path"].lstrip("/")).rstrip("/") or "/"
+        return {**symbol, "full_path": full_path}
+
+    def lookup(self, kind: Optional[str] = None, name: Optional[str] = None,
+               project: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Symbols of a kind and/or exact name (case-insensitive); API routes carry their mounted full_path"""
+        with self._lock:
+            self._refresh()
+            if name is not None:
+                symbols = self._by_name.get(name.lower(), [])
+                if kind is not None:
+                    symbols = [symbol for symbol in symbols if symbol["kind"] == kind]
+            else:
+                symbols = self._by_kind.get(kind, []) if kind else [s for group in self._by_kind.values() for s in group]
+            if project is not None:
+                symbols = [symbol for symbol in symbols if symbol["project"] == project]
+            return [self._with_full_path(symbol) for symbol in symbols]
+
+    def answer(self, question: str) -> Optional[Dict[str, Any]]:
+        """Answer a structural question from the index, or None if it needs retrieval"""
+        started = time.perf_counter()
+        if not STRUCTURAL_QUESTION.match(question):
+            self.stats["not_structural"] += 1
+            return None
+
+        words = re.findall(r"[A-Za-z_]\w*", question.lower())
+        kinds = [kind for kind, keywords in KIND_KEYWORDS.items() if any(word in keywords for word in words)]
+        if "api_route" in kinds and ("flutter" in words or "navigation" in words):
+            kinds = ["app_route"]
+
+        # Names in the question, also as adjacent pairs ("project model" -> ProjectModel)
+        candidates = words + [a + b for a, b in zip(words, words[1:])]
+        named = [symbol for word in dict.fromkeys(candidates) if word not in STOP_WORDS
+                 for symbol in self.lookup(name=word) if symbol["kind"] not in ("mount", "schema")]
+        if named and kinds:
+            named = [symbol for symbol in named if symbol["kind"] in kinds] or named
+
+        if named:
+            symbols = named
+        elif kinds:
+            symbols = [symbol for kind in kinds for symbol in self.lookup(kind=kind)]
+            if kinds == ["api_route"]:
+                # "which routes exist for projects" keeps the routes under a matching path segment
+                terms = [word for word in words if word not in STOP_WORDS and word not in KIND_KEYWORDS["api_route"]]
+                matching = [symbol for symbol in symbols
+                            if any(term.rstrip("s") == segment.rstrip("s") for term in terms
+                                   for segment in symbol["full_path"].lower().split("/"))]
+                symbols = matching or symbols
+        else:
+            self.stats["not_structural"] += 1
+            return None
+
+        if not symbols:
+            return None
+
+        lines = [self.describe(symbol) for symbol in symbols]
+        if not named:
+            lines.insert(0, f"{len(symbols)} found:")
+        self.stats["answered"] += 1
+        return {
+            "success": True,
+            "answer": "\n".join(lines),
+            "symbols": symbols,
+            "sources": [{"file_path": symbol["file_path"], "line": symbol["line"]} for symbol in symbols],
+            "question": question,
+            "source": "symbol_index",
+            "lookup_microseconds": round((time.perf_counter() - started) * 1e6, 1)
+        }
+
+    @staticmethod
+    def describe(symbol: Dict[str, Any]) -> str:
+        """One line per symbol, with fields or methods where the symbol has them"""
+        location = f"{Path(symbol['file_path']).name}:{symbol['line']}"
+        kind = symbol["kind"]
+        if kind == "api_route":
+            middleware = f" [{', '.join(symbol['middleware'])}]" if symbol.get("middleware") else ""
+            return f"{symbol['method']} {symbol.get('full_path', symbol['path'])}{middleware} ({location})"
+        if kind == "app_route":
+            return f"route {symbol['path']} -> {symbol['widget']} ({location})"
+        if kind == "model":
+            fields = ", ".join(f"{field['name']}: {field['type']}" for field in symbol["fields"])
+            return f"{symbol['framework']} model {symbol['name']} ({location}): {fields}"
+        if symbol.get("methods"):
+            return f"{kind} {symbol['name']} ({location}): {', '.join(symbol['methods'])}"
+        return f"{kind} {symbol['name']} ({location})"
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get symbol counts by kind and question counts"""
+        with self._lock:
+            self._refresh()
+            return {
+                "success": True,
+                "files": len(self.files),
+                "symbols": {kind: len(symbols) for kind, symbols in self._by_kind.items()},
+                **self.stats
+            }
@@ -0,0 +1,187 @@
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Callable, Iterable, Set
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+class ReadWriteLock:
+    """Lock that lets many readers in at once and gives waiting writers priority"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    def acquire_read(self):
+        with self._cond:
+            while self._writing or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+
+    def release_write(self):
+        with self._cond:
+            self._writing = False
+            self._cond.notify_all()
+
+    def read(self):
+        return _Guard(self.acquire_read, self.release_read)
+
+    def write(self):
+        return _Guard(self.acquire_write, self.release_write)
+
+class _Guard:
+    def __init__(self, acquire, release):
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self):
+        self._acquire()
+
+    def __exit__(self, *exc):
+        self._release()
+
+class CodebaseWatcher:
+    """Watches project paths and hands debounced batches of changed files to a callback
+
+    Uses watchdog when it is installed and falls back to polling file stats.
+    """
+
+    def __init__(self, paths: Dict[str, Path], on_batch: Callable[[Set[str]], None],
+                 is_indexable: Callable[[Path], bool], list_files: Callable[[], Iterable[Path]],
+                 debounce_seconds: float = 2.0, poll_seconds: float = 5.0):
+        self.paths = paths
+        self.on_batch = on_batch
+        self.is_indexable = is_indexable
+        self.list_files = list_files
+        self.debounce_seconds = debounce_seconds
+        self.poll_seconds = poll_seconds
+
+        self._pending: Set[str] = set()
+        self._last_event = 0.0
+        self._cond = threading.Condition()
+        self._stopped = threading.Event()
+        self._threads = []
+        self._observer = None
+        self.stats = {"events": 0, "batches": 0, "files": 0}
+
+    def start(self):
+        """Start watching in background threads"""
+        self._stopped.clear()
+
+        if WATCHDOG_AVAILABLE:
+            handler = _ChangeHandler(self.notify)
+            self._observer = Observer()
+            for root in self.paths.values():
+                if root.exists():
+                    self._observer.schedule(handler, str(root), recursive=True)
+            self._observer.start()
+        else:
+            self._threads.append(threading.Thread(target=self._poll, name="memory-watch-poll", daemon=True))
+
+        self._threads.append(threading.Thread(target=self._worker, name="memory-watch-worker", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+        mode = "watchdog" if WATCHDOG_AVAILABLE else f"polling every {self.poll_seconds}s"
+        print(f"👀 Watching codebase for changes ({mode})")
+
+    def stop(self):
+        """Stop watching and wait for the background threads"""
+        self._stopped.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._observer:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def notify(self, path: str):
+        """Record a changed path; bursts are collected until the tree is quiet"""
+        if not self.is_indexable(Path(path)):
+            return
+
+        with self._cond:
+            self._pending.add(str(path))
+            self._last_event = time.monotonic()
+            self.stats["events"] += 1
+            self._cond.notify_all()
+
+    def _worker(self):
+        while not self._stopped.is_set():
+            with self._cond:
+                while not self._pending and not self._stopped.is_set():
+                    self._cond.wait()
+
+                # Debounce: wait until no event arrived for debounce_seconds
+                while not self._stopped.is_set():
+                    quiet_for = time.monotonic() - self._last_event
+                    if quiet_for >= self.debounce_seconds:
+                        break
+                    self._cond.wait(self.debounce_seconds - quiet_for)
+
+                batch, self._pending = self._pending, set()
+
+            if batch and not self._stopped.is_set():
+                self.stats["batches"] += 1
+                self.stats["files"] += len(batch)
+                try:
+                    self.on_batch(batch)
+                except Exception as e:
+                    print(f"⚠️  Failed to apply watched changes: {e}")
+
+    def _snapshot(self) -> Dict[str, tuple]:
+        snapshot = {}
+        for path in self.list_files():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[str(path)] = (stat.st_size, stat.st_mtime)
+        return snapshot
+
+    def _poll(self):
+        previous = self._snapshot()
+        while not self._stopped.wait(self.poll_seconds):
+            current = self._snapshot()
+            for path in set(previous) | set(current):
+                if previous.get(path) != current.get(path):
+                    self.notify(path)
+            previous = current
+
+if WATCHDOG_AVAILABLE:
+    class _ChangeHandler(FileSystemEventHandler):
+        def __init__(self, notify: Callable[[str], None]):
+            super().__init__()
+            self._notify = notify
+
+        def on_any_event(self, event):
+            if event.is_directory:
+                return
+            self._notify(event.src_path)
+            dest_path = getattr(event, "dest_path", None)
+            if dest_path:
+                self._notify(dest_path)
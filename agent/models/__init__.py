@@ -1,3 +1,4 @@
 from .state import AgentState, ProjectContext, ApiConfig, WidgetConfig
+from .plan import ToolStep, step_output
 
-__all__ = ["AgentState", "ProjectContext", "ApiConfig", "WidgetConfig"]
+__all__ = ["AgentState", "ProjectContext", "ApiConfig", "WidgetConfig", "ToolStep", "step_output"]
@@ -0,0 +1,14 @@
+from typing import List, Dict, Any
+from pydantic import BaseModel, Field
+
+class ToolStep(BaseModel):
+    """A single tool call in an execution plan"""
+    
+    id: str
+    tool: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+    depends_on: List[str] = Field(default_factory=list)
+
+def step_output(step_id: str, key: str) -> Dict[str, str]:
+    """Reference to a value in the result of an earlier step"""
+    return {"$step": step_id, "key": key}
@@ -1,6 +1,16 @@
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field
 
+class ProjectContext(BaseModel):
+    """Context for project-specific operations"""
+    
+    project_id: str
+    project_name: str
+    screens: List[Dict[str, Any]] = Field(default_factory=list)
+    apis: List[Dict[str, Any]] = Field(default_factory=list)
+    widgets: Dict[str, List[Dict[str, Any]]] = Field(default_factory=dict)
+    collections: List[str] = Field(default_factory=list)
+
 class AgentState(BaseModel):
     """Core state for the LangGraph agent"""
     
@@ -8,9 +18,14 @@ class AgentState(BaseModel):
     user_request: str = Field(description="Original user request")
     operation_type: Optional[str] = Field(default=None, description="Type of operation: project, api, widget, layout")
     
+    # Conversation
+    conversation_id: Optional[str] = Field(default=None, description="Conversation ID used for session checkpoints")
+    run_id: Optional[str] = Field(default=None, description="Artifact store namespace for this run")
+    
     # Project context
     project_id: Optional[str] = Field(default=None, description="Current project ID")
     current_screen: Optional[str] = Field(default=None, description="Current screen ID")
+    project_context: Optional[ProjectContext] = Field(default=None, description="Loaded context of the current project")
     
     # Operation context
     context: Dict[str, Any] = Field(default_factory=dict, description="Operation context and parameters")
@@ -29,16 +44,6 @@ class AgentState(BaseModel):
     memory_results: List[Dict[str, Any]] = Field(default_factory=list, description="Results from memory searches")
     learned_patterns: List[str] = Field(default_factory=list, description="Patterns learned from this operation")
 
-class ProjectContext(BaseModel):
-    """Context for project-specific operations"""
-    
-    project_id: str
-    project_name: str
-    screens: List[Dict[str, Any]] = Field(default_factory=list)
-    apis: List[Dict[str, Any]] = Field(default_factory=list)
-    widgets: Dict[str, List[Dict[str, Any]]] = Field(default_factory=dict)
-    collections: List[str] = Field(default_factory=list)
-
 class ApiConfig(BaseModel):
     """Configuration for API generation"""
     
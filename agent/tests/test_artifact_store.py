@@ -0,0 +1,35 @@
+import os
+import sys
+from types import SimpleNamespace
+
+# Import the agent packages from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from agent.graph.agent_graph import AxiomAgent
+from agent.memory.artifact_store import ArtifactStore, ARTIFACT_KEY
+from agent.models import AgentState
+
+def test_eviction_forgets_handles_and_empty_runs():
+    store = ArtifactStore(max_total_bytes=100)
+    first, second = store.new_run(), store.new_run()
+    evicted = store.put(first, "a", size=60)[ARTIFACT_KEY]
+    store.put(second, "b", size=60)
+
+    assert store.get(evicted) is None
+    assert first not in store._runs
+    assert store.get_stats()["runs"] == 1
+    assert store.release(first) == 0
+    assert store.release(second) == 1
+
+def test_state_budget_estimate_tracks_the_trimmed_state():
+    artifacts = ArtifactStore()
+    agent = SimpleNamespace(artifacts=artifacts, state_budget=2000)
+    state = AgentState(user_request="list projects", run_id=artifacts.new_run())
+    state.results = [{"success": True, "projects": ["x" * 100] * 50}]
+    state.memory_results = [{"success": True, "answer": "y" * 500} for _ in range(4)]
+
+    size = AxiomAgent.enforce_state_budget(agent, state)
+    assert size <= agent.state_budget
+    assert 1 <= len(state.memory_results) < 4
+    assert abs(size - len(state.model_dump_json())) < 100
+    assert artifacts.resolve(state.results)[0]["projects"] == ["x" * 100] * 50
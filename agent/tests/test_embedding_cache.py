@@ -0,0 +1,34 @@
+import os
+import sys
+
+# Import the agent packages from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from agent.memory.embedding_cache import EmbeddingCache
+
+def make_cache(tmp_path) -> EmbeddingCache:
+    cache = EmbeddingCache(tmp_path, "model")
+    assert cache.load()
+    return cache
+
+def test_caches_sharing_files_do_not_reuse_rows(tmp_path):
+    first, second = make_cache(tmp_path), make_cache(tmp_path)
+    first.put_many(["a"], [[1.0, 0.0]])
+    second.put_many(["b"], [[0.0, 1.0]])
+    first.put_many(["c"], [[1.0, 1.0]])
+
+    # Each instance sees the rows the other appended
+    assert second.get_many(["a", "b", "c"]) == [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]
+    assert first.get_many(["a", "b", "c"]) == [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]
+    assert make_cache(tmp_path).get_many(["a", "b", "c"]) == [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]
+
+def test_interrupted_append_is_overwritten(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put_many(["a"], [[1.0, 0.0]])
+    # A vector row whose key line was never written
+    with open(cache.vectors_path, "ab") as f:
+        f.write(b"\0" * 8)
+
+    reloaded = make_cache(tmp_path)
+    reloaded.put_many(["b"], [[0.0, 1.0]])
+    assert make_cache(tmp_path).get_many(["a", "b"]) == [[1.0, 0.0], [0.0, 1.0]]
@@ -0,0 +1,57 @@
+import os
+import sys
+
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
+
+# Import the agent packages from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from agent.memory.document_index import DocumentIndex
+from agent.memory.lexical_index import LexicalIndex, HybridRetriever
+
+SOURCE = "function createCrudApi() {\n  return api;\n}\n\nfunction listProjects() {\n  return projects;\n}\n"
+
+class DenseRetriever(BaseRetriever):
+    def __init__(self, hits):
+        super().__init__()
+        self.hits = hits
+
+    def _retrieve(self, query_bundle: QueryBundle):
+        return self.hits
+
+def index_source(tmp_path, documents=None):
+    path = tmp_path / "api.js"
+    path.write_text(SOURCE)
+    start = SOURCE.index("function listProjects")
+    nodes = [
+        TextNode(id_="create", text=SOURCE[:start], start_char_idx=0, end_char_idx=start, metadata={"file_name": "api.js"}),
+        TextNode(id_="list", text=SOURCE[start:], start_char_idx=start, end_char_idx=len(SOURCE), metadata={"file_name": "api.js"})
+    ]
+    lexical = LexicalIndex(tmp_path / "lexical.json", documents)
+    lexical.add_file(str(path), nodes)
+    if documents is not None:
+        documents.add_file(str(path), SOURCE)
+    return path, lexical
+
+def test_chunks_of_an_edited_file_come_from_the_document_store(tmp_path):
+    path, lexical = index_source(tmp_path, DocumentIndex(tmp_path / "documents"))
+    path.write_text("// header\n" + SOURCE)
+    assert lexical.get_chunk("list")["text"].startswith("function listProjects")
+
+def test_chunks_of_an_edited_file_are_not_sliced_from_the_new_text(tmp_path):
+    path, lexical = index_source(tmp_path)
+    assert lexical.get_chunk("list")["text"].startswith("function listProjects")
+    path.write_text("// header\n" + SOURCE)
+    assert lexical.get_chunk("list") is None
+
+def test_lexical_hits_have_numeric_scores(tmp_path):
+    _, lexical = index_source(tmp_path)
+    dense_hit = NodeWithScore(node=TextNode(id_="dense", text="other"), score=0.4)
+
+    fast = HybridRetriever(DenseRetriever([dense_hit]), lexical, top_k=2).retrieve("createCrudApi")
+    assert fast[0].node.node_id == "create" and fast[0].score == 1.0
+    assert all(0 < hit.score <= 1 for hit in fast)
+
+    fused = HybridRetriever(DenseRetriever([dense_hit]), lexical, top_k=3).retrieve("list the projects")
+    assert {hit.node.node_id: hit.score for hit in fused} == {"list": 1.0, "dense": 0.4}
@@ -0,0 +1,76 @@
+import os
+import sys
+
+import numpy as np
+
+# Import the agent packages from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from agent.memory.local_vector_store import LocalVectorMemory
+
+ITEMS = [
+    {"text": "a", "embedding": [1.0, 0.0, 0.0, 0.0], "project": "p1", "file_type": ".js", "file_path": "a.js"},
+    {"text": "b", "embedding": [0.9, 0.1, 0.0, 0.0], "project": "p2", "file_type": ".js", "file_path": "b.js"},
+    {"text": "c", "embedding": [0.8, 0.2, 0.0, 0.0], "project": "p1", "file_type": ".dart", "file_path": "c.dart"}
+]
+
+def make_memory(tmp_path, **kwargs) -> LocalVectorMemory:
+    memory = LocalVectorMemory(tmp_path, "test", vector_size=4, **kwargs)
+    assert memory.setup()
+    return memory
+
+def file_paths(hits):
+    return sorted(hit["payload"]["file_path"] for hit in hits)
+
+def test_search_filters_through_metadata_filter_alone(tmp_path):
+    memory = make_memory(tmp_path)
+    memory.add_embeddings(ITEMS)
+    result = memory.search([1.0, 0.0, 0.0, 0.0], limit=10, score_threshold=0.0, metadata_filter={"project": "p1"})
+    assert file_paths(result["results"]) == ["a.js", "c.dart"]
+
+    result = memory.search_batch([[1.0, 0.0, 0.0, 0.0]], limit=10, score_threshold=0.0,
+                                 metadata_filter={"file_type": ".dart"})
+    assert [file_paths(hits) for hits in result["results"]] == [["c.dart"]]
+
+def test_upserts_are_appended_and_reload(tmp_path):
+    memory = make_memory(tmp_path)
+    for item in ITEMS:
+        assert memory.add_embeddings([item])["success"]
+    # Re-adding a point updates its row in place
+    memory.add_embeddings([{**ITEMS[0], "embedding": [0.0, 0.0, 0.0, 1.0]}])
+    assert os.path.getsize(memory._vectors_path) == 3 * 4 * 4
+
+    reloaded = make_memory(tmp_path, mmap=True)
+    assert reloaded.count() == 3
+    hits = reloaded.search([0.0, 0.0, 0.0, 1.0], limit=1, score_threshold=0.0)["results"]
+    assert file_paths(hits) == ["a.js"]
+
+def test_torn_log_record_is_dropped(tmp_path):
+    memory = make_memory(tmp_path)
+    memory.add_embeddings(ITEMS[:2])
+    with open(memory._points_path, "ab") as handle:
+        handle.write(b'{"row": 2, "id"')
+
+    reloaded = make_memory(tmp_path)
+    assert reloaded.count() == 2
+    reloaded.add_embeddings(ITEMS[2:])
+    assert make_memory(tmp_path).count() == 3
+
+def test_incremental_upserts_keep_indexes_in_step(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((200, 4)).astype(np.float32)
+    memory = make_memory(tmp_path, approximate_threshold=50)
+    for start in range(0, 200, 10):
+        memory.add_embeddings([
+            {"text": str(i), "embedding": vectors[i].tolist(), "project": f"p{i % 2}", "file_path": f"{i}.js"}
+            for i in range(start, start + 10)
+        ])
+
+    query = vectors[7]
+    exact = make_memory(tmp_path, approximate_threshold=10 ** 6)
+    for store in (memory, make_memory(tmp_path, mmap=True, approximate_threshold=50)):
+        # Probing every list makes the approximate search exact
+        hits = store.search(query.tolist(), limit=5, score_threshold=0.0, project="p1", ef=10 ** 6)["results"]
+        expected = exact.search(query.tolist(), limit=5, score_threshold=0.0, project="p1")["results"]
+        assert [hit["id"] for hit in hits] == [hit["id"] for hit in expected]
+        assert all(hit["payload"]["project"] == "p1" for hit in hits)
@@ -0,0 +1,27 @@
+import os
+import sys
+from types import SimpleNamespace
+
+# Import the agent packages from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from agent.graph.agent_graph import AxiomAgent
+from agent.graph.plan_cache import PlanCache
+from agent.models import AgentState
+
+def make_agent() -> SimpleNamespace:
+    agent = SimpleNamespace(plan_cache=PlanCache())
+    agent.parse_fields = lambda text: AxiomAgent.parse_fields(agent, text)
+    agent.extract_entities = lambda text: AxiomAgent.extract_entities(agent, text)
+    return agent
+
+def test_hit_uses_the_entities_of_the_incoming_request():
+    agent = make_agent()
+    recorded = "create a new project called Text Editor"
+    assert agent.plan_cache.record(recorded, "create_project", agent.extract_entities(recorded), requires_project=False)
+
+    state = AgentState(user_request="create a new project called Tasks")
+    assert AxiomAgent.apply_cached_plan(agent, state)
+    assert state.operation_type == "create_project"
+    assert {key: value for key, value in state.context.items() if key != "plan_cache"} == \
+        agent.extract_entities(state.user_request) == {"project_name": "Tasks"}
@@ -0,0 +1,70 @@
+import os
+import sys
+import threading
+import time
+
+# Import the agent packages from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from agent.graph.planner import PlanExecutor
+from agent.models import ToolStep, step_output
+
+class Recorder:
+    """Tool that records how many calls overlap"""
+
+    def __init__(self):
+        self.active = {}
+        self.max_active = 0
+        self.max_per_project = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, project_id=None):
+        with self._lock:
+            self.active[project_id] = self.active.get(project_id, 0) + 1
+            self.max_active = max(self.max_active, sum(self.active.values()))
+            self.max_per_project = max(self.max_per_project, self.active[project_id])
+        time.sleep(0.05)
+        with self._lock:
+            self.active[project_id] -= 1
+        return {"success": True, "project_id": project_id}
+
+def test_steps_on_different_projects_overlap():
+    tool = Recorder()
+    results = PlanExecutor({"tool": tool}).execute([
+        ToolStep(id=name, tool="tool", params={"project_id": name}) for name in ("p1", "p2", "p3")
+    ])
+    assert all(result["success"] for result in results)
+    assert tool.max_active == 3
+
+def test_steps_on_the_same_project_run_one_at_a_time():
+    tool = Recorder()
+    results = PlanExecutor({"tool": tool}).execute([
+        ToolStep(id="create", tool="tool", params={"project_id": "p1"}),
+        ToolStep(id="api", tool="tool", params={"project_id": step_output("create", "project_id")}, depends_on=["create"]),
+        ToolStep(id="screen", tool="tool", params={"project_id": "p1"}, depends_on=["create"]),
+        ToolStep(id="other", tool="tool", params={"project_id": "p2"})
+    ])
+    assert [result["project_id"] for result in results] == ["p1", "p1", "p1", "p2"]
+    assert tool.max_active == 2
+    assert tool.max_per_project == 1
+
+def test_failed_and_unresolved_dependencies_are_skipped():
+    results = PlanExecutor({"fail": lambda: {"success": False, "error": "boom"}}).execute([
+        ToolStep(id="late", tool="fail", depends_on=["skipped"]),
+        ToolStep(id="skipped", tool="fail", depends_on=["failed"]),
+        ToolStep(id="failed", tool="fail"),
+        ToolStep(id="orphan", tool="fail", depends_on=["missing"])
+    ])
+    assert [result["error"] for result in results] == [
+        "Skipped: dependency skipped failed",
+        "Skipped: dependency failed failed",
+        "boom",
+        "Unresolved dependencies: missing"
+    ]
+
+def test_a_lone_ready_step_runs_on_the_calling_thread():
+    results = PlanExecutor({"where": lambda: {"success": True, "thread": threading.get_ident()}}).execute([
+        ToolStep(id="first", tool="where"),
+        ToolStep(id="second", tool="where", depends_on=["first"])
+    ])
+    assert [result["thread"] for result in results] == [threading.get_ident()] * 2
@@ -0,0 +1,48 @@
+import os
+import sys
+from contextvars import copy_context
+
+# Import the agent packages from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from agent.graph.planner import PlanExecutor
+from agent.models import ToolStep
+from agent.tools.prefetch import ProjectPrefetcher
+
+def make_prefetcher(monkeypatch) -> ProjectPrefetcher:
+    prefetcher = ProjectPrefetcher()
+    monkeypatch.setattr(prefetcher, "_fetch", lambda project_id: {"_id": project_id})
+    return prefetcher
+
+def test_discarding_a_run_keeps_concurrent_runs(monkeypatch):
+    prefetcher = make_prefetcher(monkeypatch)
+    first, second = copy_context(), copy_context()
+    first.run(prefetcher.start, "p1", "run-1")
+    second.run(prefetcher.start, "p1", "run-2")
+
+    first.run(prefetcher.discard, "run-1")
+    assert first.run(prefetcher.get, "p1") is None
+    assert second.run(prefetcher.get, "p1") == {"_id": "p1"}
+    assert prefetcher.stats["prefetches"] == 2
+
+def test_write_invalidates_every_run(monkeypatch):
+    prefetcher = make_prefetcher(monkeypatch)
+    first, second = copy_context(), copy_context()
+    first.run(prefetcher.start, "p1", "run-1")
+    second.run(prefetcher.start, "p1", "run-2")
+
+    first.run(prefetcher.invalidate, "p1")
+    assert first.run(prefetcher.get, "p1") is None
+    assert second.run(prefetcher.get, "p1") is None
+
+def test_plan_executor_tools_read_the_run_prefetch(monkeypatch):
+    prefetcher = make_prefetcher(monkeypatch)
+    executor = PlanExecutor({"load": lambda project_id: {"success": True, "project": prefetcher.get(project_id)}})
+
+    def run():
+        prefetcher.start("p1", "run-1")
+        return executor.execute([ToolStep(id="load", tool="load", params={"project_id": "p1"})])
+
+    results = copy_context().run(run)
+    assert results[0]["project"] == {"_id": "p1"}
+    assert prefetcher.stats["hits"] == 1 and prefetcher.stats["misses"] == 0
@@ -0,0 +1,47 @@
+import os
+import sys
+
+from qdrant_client import QdrantClient
+
+# Import the agent packages from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import agent.memory.qdrant_client as qdrant_module
+from agent.memory.qdrant_client import QdrantMemory
+
+def make_memory(monkeypatch) -> QdrantMemory:
+    monkeypatch.setattr(qdrant_module, "QdrantClient", lambda url: QdrantClient(":memory:"))
+    memory = QdrantMemory(vector_size=4, parallel=1)
+    assert memory.setup()
+    memory.add_embeddings([
+        {"text": "a", "embedding": [1.0, 0.0, 0.0, 0.0], "project": "p1", "file_type": ".js", "file_path": "a.js"},
+        {"text": "b", "embedding": [0.9, 0.1, 0.0, 0.0], "project": "p2", "file_type": ".js", "file_path": "b.js"},
+        {"text": "c", "embedding": [0.8, 0.2, 0.0, 0.0], "project": "p1", "file_type": ".dart", "file_path": "c.dart"}
+    ])
+    return memory
+
+def projects(hits):
+    return {hit["payload"]["project"] for hit in hits}
+
+def test_search_filters_through_metadata_filter_alone(monkeypatch):
+    memory = make_memory(monkeypatch)
+    result = memory.search([1.0, 0.0, 0.0, 0.0], limit=10, score_threshold=0.0, metadata_filter={"project": "p1"})
+    assert result["success"]
+    assert result["count"] == 2
+    assert projects(result["results"]) == {"p1"}
+
+    result = memory.search([1.0, 0.0, 0.0, 0.0], limit=10, score_threshold=0.0, metadata_filter={"file_type": ".dart"})
+    assert [hit["payload"]["file_path"] for hit in result["results"]] == ["c.dart"]
+
+def test_search_batch_filters_through_metadata_filter_alone(monkeypatch):
+    memory = make_memory(monkeypatch)
+    result = memory.search_batch([[1.0, 0.0, 0.0, 0.0]] * 2, limit=10, score_threshold=0.0,
+                                 metadata_filter={"project": "p2"})
+    assert result["success"]
+    assert [projects(hits) for hits in result["results"]] == [{"p2"}, {"p2"}]
+
+def test_explicit_arguments_override_metadata_filter(monkeypatch):
+    memory = make_memory(monkeypatch)
+    result = memory.search([1.0, 0.0, 0.0, 0.0], limit=10, score_threshold=0.0,
+                           project="p2", metadata_filter={"project": "p1"})
+    assert projects(result["results"]) == {"p2"}
@@ -0,0 +1,44 @@
+import os
+import sys
+
+# Import the agent packages from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from agent.memory.session_store import SessionStore
+from agent.models import AgentState
+
+def make_store(tmp_path) -> SessionStore:
+    store = SessionStore(tmp_path / "sessions.db")
+    assert store.setup()
+    return store
+
+def test_resume_keeps_the_project_but_not_turn_results(tmp_path):
+    store = make_store(tmp_path)
+    state = store.resume("create a project called Tasks", conversation_id="c1")
+    state.project_id = "p1"
+    state.context.update({"project_id": "p1", "project_name": "Tasks", "widget_types": ["button"]})
+    state.memory_results.append({"success": True, "question": "How to create_project in Axiom platform"})
+    state.results.append({"success": True})
+    assert store.save(state)
+
+    resumed = store.resume("add a button", conversation_id="c1")
+    assert resumed.project_id == "p1"
+    assert resumed.context == {"project_id": "p1", "project_name": "Tasks"}
+    assert resumed.memory_results == [] and resumed.results == [] and resumed.project_context is None
+
+def test_switching_projects_starts_a_fresh_state(tmp_path):
+    store = make_store(tmp_path)
+    store.save(AgentState(user_request="open Tasks", conversation_id="c1", project_id="p1",
+                          context={"project_id": "p1", "screen_id": "s1"}))
+
+    resumed = store.resume("add a button", project_id="p2", conversation_id="c1")
+    assert resumed.project_id == "p2" and resumed.context == {}
+
+def test_store_reuses_one_connection(tmp_path):
+    store = make_store(tmp_path)
+    conn = store._conn
+    store.save(AgentState(user_request="hi", conversation_id="c1"))
+    assert store.load("c1").user_request == "hi"
+    assert store._conn is conn
+    store.close()
+    assert store.load("c1") is None
@@ -1,5 +1,6 @@
 from .project_tools import ProjectTools
 from .api_tools import ApiTools
 from .widget_tools import WidgetTools
+from .prefetch import ProjectPrefetcher
 
-__all__ = ["ProjectTools", "ApiTools", "WidgetTools"]
+__all__ = ["ProjectTools", "ApiTools", "WidgetTools", "ProjectPrefetcher"]
@@ -10,6 +10,7 @@ class ApiTools:
     def __init__(self):
         self.api_base = settings.BACKEND_API_BASE
         self.auth_token = None
+        self.prefetcher = None
     
     def set_auth_token(self, token: str):
         """Set authentication token for API calls"""
@@ -22,21 +23,35 @@ class ApiTools:
             headers["Authorization"] = f"Bearer {self.auth_token}"
         return headers
     
+    def _load_project(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """Load a project document, preferring the prefetched copy"""
+        if self.prefetcher:
+            project = self.prefetcher.get(project_id)
+            if project is not None:
+                return project
+        
+        response = requests.get(f"{self.api_base}/projects/{project_id}", headers=self._get_headers())
+        return response.json() if response.status_code == 200 else None
+    
+    def _put_project(self, project_id: str, project: Dict[str, Any]) -> requests.Response:
+        """Save a project document and drop any prefetched copy of it"""
+        response = requests.put(f"{self.api_base}/projects/{project_id}", json=project, headers=self._get_headers())
+        if self.prefetcher:
+            self.prefetcher.invalidate(project_id)
+        return response
+    
     def create_crud_api(self, project_id: str, entity_name: str, fields: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Create complete CRUD API for an entity"""
         try:
             # Load current project
-            project_url = f"{self.api_base}/projects/{project_id}"
-            project_response = requests.get(project_url, headers=self._get_headers())
+            project = self._load_project(project_id)
             
-            if project_response.status_code != 200:
+            if project is None:
                 return {
                     "success": False,
                     "error": "Failed to load project"
                 }
             
-            project = project_response.json()
-            
             # Generate collection name
             collection_name = entity_name.lower().replace(' ', '_')
             
@@ -94,8 +109,7 @@ class ApiTools:
                 project["collections"].append(collection_name)
             
             # Update project
-            update_url = f"{self.api_base}/projects/{project_id}"
-            update_response = requests.put(update_url, json=project, headers=self._get_headers())
+            update_response = self._put_project(project_id, project)
             
             if update_response.status_code == 200:
                 return {
@@ -120,17 +134,14 @@ class ApiTools:
         """Create a custom API with specific configuration"""
         try:
             # Load current project
-            project_url = f"{self.api_base}/projects/{project_id}"
-            project_response = requests.get(project_url, headers=self._get_headers())
+            project = self._load_project(project_id)
             
-            if project_response.status_code != 200:
+            if project is None:
                 return {
                     "success": False,
                     "error": "Failed to load project"
                 }
             
-            project = project_response.json()
-            
             # Add API to project
             if "apis" not in project:
                 project["apis"] = []
@@ -158,8 +169,7 @@ class ApiTools:
                 project["collections"].append(api_config.collection_name)
             
             # Update project
-            update_url = f"{self.api_base}/projects/{project_id}"
-            update_response = requests.put(update_url, json=project, headers=self._get_headers())
+            update_response = self._put_project(project_id, project)
             
             if update_response.status_code == 200:
                 return {
@@ -183,17 +193,14 @@ class ApiTools:
         """Create authentication APIs (register, login)"""
         try:
             # Load current project
-            project_url = f"{self.api_base}/projects/{project_id}"
-            project_response = requests.get(project_url, headers=self._get_headers())
+            project = self._load_project(project_id)
             
-            if project_response.status_code != 200:
+            if project is None:
                 return {
                     "success": False,
                     "error": "Failed to load project"
                 }
             
-            project = project_response.json()
-            
             # User fields for auth
             user_fields = [
                 {"name": "email", "type": "email", "required": True},
@@ -237,8 +244,7 @@ class ApiTools:
                 project["collections"].append(collection_name)
             
             # Update project
-            update_url = f"{self.api_base}/projects/{project_id}"
-            update_response = requests.put(update_url, json=project, headers=self._get_headers())
+            update_response = self._put_project(project_id, project)
             
             if update_response.status_code == 200:
                 return {
@@ -295,11 +301,9 @@ class ApiTools:
     def get_api_list(self, project_id: str) -> Dict[str, Any]:
         """Get list of all APIs in a project"""
         try:
-            project_url = f"{self.api_base}/projects/{project_id}"
-            response = requests.get(project_url, headers=self._get_headers())
+            project = self._load_project(project_id)
             
-            if response.status_code == 200:
-                project = response.json()
+            if project is not None:
                 apis = project.get("apis", [])
                 
                 return {
@@ -323,17 +327,14 @@ class ApiTools:
         """Add validation rules to an existing API"""
         try:
             # Load project
-            project_url = f"{self.api_base}/projects/{project_id}"
-            project_response = requests.get(project_url, headers=self._get_headers())
+            project = self._load_project(project_id)
             
-            if project_response.status_code != 200:
+            if project is None:
                 return {
                     "success": False,
                     "error": "Failed to load project"
                 }
             
-            project = project_response.json()
-            
             # Find and update the API
             api_found = False
             for api in project.get("apis", []):
@@ -349,8 +350,7 @@ class ApiTools:
                 }
             
             # Update project
-            update_url = f"{self.api_base}/projects/{project_id}"
-            update_response = requests.put(update_url, json=project, headers=self._get_headers())
+            update_response = self._put_project(project_id, project)
             
             if update_response.status_code == 200:
                 return {
@@ -0,0 +1,111 @@
+import copy
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, Tuple
+from ..config import settings
+
+class ProjectPrefetcher:
+    """Fetches project documents in the background so tools can skip their initial GET
+
+    Fetches belong to the run that started them: tools read the copy of the run
+    they are called from, and discarding a run leaves concurrent runs alone.
+    """
+
+    def __init__(self, max_workers: int = 2, timeout: float = 10.0):
+        self.api_base = settings.BACKEND_API_BASE
+        self.auth_token = None
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="project-prefetch")
+        self._pending: Dict[Tuple[Optional[str], str], Future] = {}
+        self._used = set()
+        self._run: ContextVar[Optional[str]] = ContextVar("prefetch_run", default=None)
+        self._lock = threading.Lock()
+        self.stats = {"prefetches": 0, "hits": 0, "misses": 0, "wasted": 0}
+
+    def set_auth_token(self, token: str):
+        """Set authentication token for API calls"""
+        self.auth_token = token
+
+    def _get_headers(self) -> Dict[str, str]:
+        """Get headers for API requests"""
+        headers = {"Content-Type": "application/json"}
+        if self.auth_token:
+            headers["Authorization"] = f"Bearer {self.auth_token}"
+        return headers
+
+    def _fetch(self, project_id: str) -> Optional[Dict[str, Any]]:
+        # The project document carries its screens and API list, so one GET covers both
+        url = f"{self.api_base}/projects/{project_id}"
+        response = requests.get(url, headers=self._get_headers(), timeout=self.timeout)
+        return response.json() if response.status_code == 200 else None
+
+    def start(self, project_id: str, run_id: Optional[str] = None):
+        """Begin fetching a project document for a run unless a fetch is already in flight
+
+        The run becomes the current one in this context, so tools called from it read its copy.
+        """
+        self._run.set(run_id)
+        if not project_id:
+            return
+
+        with self._lock:
+            if (run_id, project_id) in self._pending:
+                return
+            self._pending[(run_id, project_id)] = self._executor.submit(self._fetch, project_id)
+            self.stats["prefetches"] += 1
+
+    def get(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """Return a private copy of the current run's prefetched project, or None if the caller must load it"""
+        key = (self._run.get(), project_id)
+        with self._lock:
+            future = self._pending.get(key)
+
+        project = None
+        if future is not None:
+            try:
+                project = future.result(timeout=self.timeout)
+            except Exception:
+                project = None
+
+        with self._lock:
+            if project is None or self._pending.get(key) is not future:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            self._used.add(key)
+
+        # Tools edit the document in place before saving it
+        return copy.deepcopy(project)
+
+    def invalidate(self, project_id: str):
+        """Forget every run's prefetched copy after the project has been written"""
+        with self._lock:
+            for key in [key for key in self._pending if key[1] == project_id]:
+                self._drop_locked(key)
+
+    def discard(self, run_id: Optional[str] = None):
+        """Drop the projects prefetched for a run, e.g. at its end"""
+        with self._lock:
+            for key in [key for key in self._pending if key[0] == run_id]:
+                self._drop_locked(key)
+
+    def _drop_locked(self, key: Tuple[Optional[str], str]):
+        future = self._pending.pop(key, None)
+        if future is None:
+            return
+        if key not in self._used:
+            future.cancel()
+            self.stats["wasted"] += 1
+        self._used.discard(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get prefetch hit rate and wasted prefetch count"""
+        with self._lock:
+            reads = self.stats["hits"] + self.stats["misses"]
+            return {
+                "success": True,
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / reads, 4) if reads else 0.0
+            }
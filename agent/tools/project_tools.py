@@ -10,6 +10,7 @@ class ProjectTools:
     def __init__(self):
         self.api_base = settings.BACKEND_API_BASE
         self.auth_token = None
+        self.prefetcher = None
     
     def set_auth_token(self, token: str):
         """Set authentication token for API calls"""
@@ -56,6 +57,15 @@ class ProjectTools:
     def load_project(self, project_id: str) -> Dict[str, Any]:
         """Load an existing project"""
         try:
+            if self.prefetcher:
+                project = self.prefetcher.get(project_id)
+                if project is not None:
+                    return {
+                        "success": True,
+                        "project": project,
+                        "project_context": self._create_project_context(project)
+                    }
+            
             url = f"{self.api_base}/projects/{project_id}"
             response = requests.get(url, headers=self._get_headers())
             
@@ -83,6 +93,8 @@ class ProjectTools:
         try:
             url = f"{self.api_base}/projects/{project_id}"
             response = requests.put(url, json=updates, headers=self._get_headers())
+            if self.prefetcher:
+                self.prefetcher.invalidate(project_id)
             
             if response.status_code == 200:
                 project = response.json()
@@ -132,7 +144,10 @@ class ProjectTools:
             project["screens"].append(new_screen)
             
             # Update project
-            return self.update_project(project_id, project)
+            result = self.update_project(project_id, project)
+            if result["success"]:
+                result["screen_id"] = screen_id
+            return result
         
         except Exception as e:
             return {
@@ -212,6 +227,8 @@ class ProjectTools:
         try:
             url = f"{self.api_base}/projects/{project_id}"
             response = requests.delete(url, headers=self._get_headers())
+            if self.prefetcher:
+                self.prefetcher.invalidate(project_id)
             
             if response.status_code == 200:
                 return {
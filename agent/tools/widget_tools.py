@@ -10,6 +10,7 @@ class WidgetTools:
     def __init__(self):
         self.api_base = settings.BACKEND_API_BASE
         self.auth_token = None
+        self.prefetcher = None
     
     def set_auth_token(self, token: str):
         """Set authentication token for API calls"""
@@ -22,6 +23,23 @@ class WidgetTools:
             headers["Authorization"] = f"Bearer {self.auth_token}"
         return headers
     
+    def _load_project(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """Load a project document, preferring the prefetched copy"""
+        if self.prefetcher:
+            project = self.prefetcher.get(project_id)
+            if project is not None:
+                return project
+        
+        response = requests.get(f"{self.api_base}/projects/{project_id}", headers=self._get_headers())
+        return response.json() if response.status_code == 200 else None
+    
+    def _put_project(self, project_id: str, project: Dict[str, Any]) -> requests.Response:
+        """Save a project document and drop any prefetched copy of it"""
+        response = requests.put(f"{self.api_base}/projects/{project_id}", json=project, headers=self._get_headers())
+        if self.prefetcher:
+            self.prefetcher.invalidate(project_id)
+        return response
+    
     def _get_default_properties(self, widget_type: str) -> Dict[str, Any]:
         """Get default properties for widget type"""
         defaults = {
@@ -35,45 +53,59 @@ class WidgetTools:
     
     def add_widget(self, project_id: str, screen_id: str, widget_type: str, properties: Dict[str, Any] = None) -> Dict[str, Any]:
         """Add a widget to a screen"""
+        result = self.add_widgets(project_id, screen_id, [{"type": widget_type, "properties": properties}])
+        if not result["success"]:
+            return result
+        
+        widget = result["widgets"][0]
+        return {
+            "success": True,
+            "widget": widget,
+            "widget_id": widget["id"],
+            "message": f"{widget_type} widget added"
+        }
+    
+    def add_widgets(self, project_id: str, screen_id: str, widgets: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add several widgets to a screen with a single load and update of the project"""
         try:
-            project_url = f"{self.api_base}/projects/{project_id}"
-            project_response = requests.get(project_url, headers=self._get_headers())
+            project = self._load_project(project_id)
             
-            if project_response.status_code != 200:
+            if project is None:
                 return {"success": False, "error": "Failed to load project"}
             
-            project = project_response.json()
-            
             # Find screen
             screen = next((s for s in project.get("screens", []) if s["id"] == screen_id), None)
             if not screen:
                 return {"success": False, "error": f"Screen {screen_id} not found"}
             
-            # Create widget
-            widget_id = f"widget_{uuid.uuid4().hex[:8]}"
-            widget = {
-                "id": widget_id,
-                "type": widget_type.lower(),
-                "properties": properties or self._get_default_properties(widget_type),
-                "children": [],
-                "position": {"x": 0, "y": 0},
-                "parent": None
-            }
+            # Create widgets
+            created = []
+            for spec in widgets:
+                widget_type = spec["type"]
+                widget = {
+                    "id": f"widget_{uuid.uuid4().hex[:8]}",
+                    "type": widget_type.lower(),
+                    "properties": spec.get("properties") or self._get_default_properties(widget_type),
+                    "children": [],
+                    "position": spec.get("position") or {"x": 0, "y": 0},
+                    "parent": None
+                }
+                created.append(widget)
             
-            screen.setdefault("widgets", []).append(widget)
+            screen.setdefault("widgets", []).extend(created)
             
             # Update project
-            update_response = requests.put(project_url, json=project, headers=self._get_headers())
+            update_response = self._put_project(project_id, project)
             
             if update_response.status_code == 200:
                 return {
                     "success": True,
-                    "widget": widget,
-                    "widget_id": widget_id,
-                    "message": f"{widget_type} widget added"
+                    "widgets": created,
+                    "widget_ids": [w["id"] for w in created],
+                    "message": f"{len(created)} widgets added"
                 }
             else:
-                return {"success": False, "error": "Failed to add widget"}
+                return {"success": False, "error": "Failed to add widgets"}
                 
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -85,14 +117,11 @@ class WidgetTools:
     def update_widget(self, project_id: str, screen_id: str, widget_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update widget properties"""
         try:
-            project_url = f"{self.api_base}/projects/{project_id}"
-            project_response = requests.get(project_url, headers=self._get_headers())
+            project = self._load_project(project_id)
             
-            if project_response.status_code != 200:
+            if project is None:
                 return {"success": False, "error": "Failed to load project"}
             
-            project = project_response.json()
-            
             # Find widget
             widget = None
             for screen in project.get("screens", []):
@@ -108,7 +137,7 @@ class WidgetTools:
             
             widget.update(updates)
             
-            update_response = requests.put(project_url, json=project, headers=self._get_headers())
+            update_response = self._put_project(project_id, project)
             
             if update_response.status_code == 200:
                 return {"success": True, "widget": widget, "message": "Widget updated"}
@@ -121,14 +150,11 @@ class WidgetTools:
     def bind_widget_to_api(self, project_id: str, screen_id: str, widget_id: str, api_endpoint_id: str) -> Dict[str, Any]:
         """Bind widget to API endpoint"""
         try:
-            project_url = f"{self.api_base}/projects/{project_id}"
-            project_response = requests.get(project_url, headers=self._get_headers())
+            project = self._load_project(project_id)
             
-            if project_response.status_code != 200:
+            if project is None:
                 return {"success": False, "error": "Failed to load project"}
             
-            project = project_response.json()
-            
             # Find API
             api_config = next((api for api in project.get("apis", []) 
                              if api.get("id") == api_endpoint_id or api.get("name") == api_endpoint_id), None)
@@ -159,34 +185,41 @@ class WidgetTools:
     def create_form(self, project_id: str, screen_id: str, fields: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Create form with multiple fields"""
         try:
-            results = []
+            specs = []
             current_y = 50
             
-            for field in fields:
-                field_name = field.get("name", f"field_{len(results)}")
+            for index, field in enumerate(fields):
+                field_name = field.get("name", f"field_{index}")
                 field_label = field.get("label", field_name.title())
                 
-                widget_result = self.add_widget(project_id, screen_id, "textfield", {
-                    "label": field_label,
-                    "placeholder": f"Enter {field_label}",
-                    "name": field_name,
-                    "required": field.get("required", False)
+                specs.append({
+                    "type": "textfield",
+                    "properties": {
+                        "label": field_label,
+                        "placeholder": f"Enter {field_label}",
+                        "name": field_name,
+                        "required": field.get("required", False)
+                    },
+                    "position": {"x": 50, "y": current_y}
                 })
-                
-                if widget_result["success"]:
-                    self.position_widget(project_id, screen_id, widget_result["widget_id"], 50, current_y)
-                    results.append(widget_result)
-                    current_y += 80
+                current_y += 80
             
             # Add submit button
-            button_result = self.add_widget(project_id, screen_id, "button", {"text": "Submit"})
-            if button_result["success"]:
-                self.position_widget(project_id, screen_id, button_result["widget_id"], 50, current_y)
-                results.append(button_result)
+            specs.append({"type": "button", "properties": {"text": "Submit"}, "position": {"x": 50, "y": current_y}})
+            
+            result = self.add_widgets(project_id, screen_id, specs)
+            if not result["success"]:
+                return result
+            
+            results = [
+                {"success": True, "widget": widget, "widget_id": widget["id"]}
+                for widget in result["widgets"]
+            ]
             
             return {
                 "success": True,
                 "widgets": results,
+                "submit_widget_id": result["widget_ids"][-1],
                 "message": f"Form with {len(fields)} fields created"
             }
             